@@ -1,5 +1,6 @@
 """Easier access to glider data."""
 
+import numpy as np
 import pandas as pd
 from pandas_flavor import register_dataframe_method
 
@@ -8,46 +9,85 @@ try:
 except ImportError:
     __version__ = "unknown"
 
+from .async_fetchers import AsyncGliderDataFetcher
+from .derived import ts_variables
+from .federation import FederatedFetcher
 from .fetchers import GliderDataFetcher
+from .lake import read_lake
+from .parallel import Pipeline, map_deployments
 from .plotting import plot_cast, plot_track, plot_transect, plot_ts
+from .profiles import grid_chunks, profile_index, to_grid
 
 __all__ = [
+    "AsyncGliderDataFetcher",
+    "FederatedFetcher",
     "GliderDataFetcher",
+    "Pipeline",
+    "grid_chunks",
+    "map_deployments",
     "plot_cast",
     "plot_track",
     "plot_transect",
     "plot_ts",
+    "profile_index",
+    "read_lake",
+    "summary_table",
+    "to_grid",
+    "ts_variables",
 ]
 
 
-def _num_profiles(df: pd.DataFrame) -> int:
-    """Compute the number of unique glider pofiles."""
-    return len(df[["latitude", "longitude"]].value_counts())
+def _first_last_valid(df: pd.DataFrame) -> tuple[int | None, int | None]:
+    """Return the first and last rows with a valid position."""
+    valid = (df["latitude"].notna() & df["longitude"].notna()).to_numpy()
+    if not valid.any():
+        return None, None
+    return valid.argmax(), len(valid) - 1 - valid[::-1].argmax()
 
 
-def _days(df: pd.DataFrame) -> pd.Timedelta:
-    """Compute the glider days."""
-    return df.index.dropna()[-1].ceil("D") - df.index.dropna()[0].floor("D")
-
-
-def _deployment_lat(df: pd.DataFrame) -> dict:
-    """Return the glider deployment latitude."""
-    return df["latitude"].to_list()[0]
-
-
-def _deployment_lon(df: pd.DataFrame) -> dict:
-    """Return the glider deployment longitude."""
-    return df["longitude"].to_list()[0]
+def _summary(df: pd.DataFrame) -> dict:
+    """Compute the summary statistics of a single glider deployment."""
+    # The time is the last level of consolidated frames.
+    time = df.index.get_level_values(-1)
+    start, end = time.min(), time.max()
+    first, last = _first_last_valid(df)
+    lat, lon = df["latitude"].to_numpy(), df["longitude"].to_numpy()
+    pressure = df["pressure"] if "pressure" in df else pd.Series(dtype=float)
+    return {
+        "num_profiles": len(profile_index(df)),
+        "days": end.ceil("D") - start.floor("D"),
+        "deployment_lat": np.nan if first is None else lat[first],
+        "deployment_lon": np.nan if first is None else lon[first],
+        "end_lat": np.nan if last is None else lat[last],
+        "end_lon": np.nan if last is None else lon[last],
+        "start_time": start,
+        "end_time": end,
+        "min_pressure": pressure.min(),
+        "max_pressure": pressure.max(),
+        "num_samples": len(df),
+    }
 
 
 @register_dataframe_method
 def summary(df: pd.DataFrame) -> pd.DataFrame:
     """Return the summary for a set of gliders."""
-    summ = {
-        "num_profiles": _num_profiles(df),
-        "days": _days(df),
-        "deployment_lat": _deployment_lat(df),
-        "deployment_lon": _deployment_lon(df),
-    }
+    return pd.Series(_summary(df))
+
+
+def summary_table(data: dict | pd.DataFrame) -> pd.DataFrame:
+    """Return the summary of many glider deployments, one per row.
 
-    return pd.Series(summ)
+    :param data: dictionary of dataframes returned by `to_pandas` or a
+                 consolidated dataframe with a `dataset_id` index level
+    :return: dataframe indexed by dataset_id
+    """
+    if isinstance(data, pd.DataFrame):
+        data = dict(
+            iter(data.groupby(level="dataset_id", observed=True, sort=False)),
+        )
+    table = pd.DataFrame.from_dict(
+        {dataset_id: _summary(df) for dataset_id, df in data.items()},
+        orient="index",
+    )
+    table.index.name = "dataset_id"
+    return table
@@ -0,0 +1,436 @@
+"""Fetch glider data from ERDDAP servers with asyncio."""
+
+import asyncio
+import io
+import time
+from collections.abc import AsyncIterator, Callable, Generator, Iterable
+from typing import TYPE_CHECKING, BinaryIO, Self
+
+import pandas as pd
+from erddapy import ERDDAP
+from erddapy.core.url import quote_url
+from requests.exceptions import (
+    ConnectionError,  # noqa: A004
+    HTTPError,
+    RequestException,
+    Timeout,
+)
+
+from gliderpy.cache import DiskCache
+from gliderpy.fetchers import (
+    OptionalBool,
+    OptionalDateTime,
+    OptionalDict,
+    OptionalList,
+    OptionalNum,
+    OptionalStr,
+    _before_request,
+    _cached,
+    _coverage,
+    _dataset_request,
+    _decoded,
+    _download,
+    _failed,
+    _query,
+    _received,
+    _request,
+    _request_failed,
+    _requested_dataset_ids,
+    _results,
+    _Retries,
+    _server,
+    _standardised,
+    _window_constraints,
+    circuit_breakers,
+)
+from gliderpy.instrumentation import Event, Instrumented
+from gliderpy.resilience import CircuitBreaker, RateLimiter
+from gliderpy.servers import server_vars
+
+if TYPE_CHECKING:
+    import httpx
+
+    from gliderpy.catalog import GliderCatalog
+
+
+async def _arun(steps: Generator, transport: Callable) -> object:
+    """Run the request `steps` with an asynchronous `transport`.
+
+    See `gliderpy.fetchers._run`.
+    """
+    send, value = steps.send, None
+    while True:
+        try:
+            request = send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            send, value = steps.send, await transport(request)
+        except Exception as err:  # noqa: BLE001
+            send, value = steps.throw, err
+
+
+def make_client(
+    pool_size: int = 100,
+    *,
+    http2: bool = False,
+) -> "httpx.AsyncClient":
+    """Return an asynchronous HTTP client that keeps connections alive.
+
+    Up to `pool_size` requests are sent at once, the others wait for a
+    free connection. Retries are left to `stamina`. Requires `httpx`, and
+    `h2` for HTTP/2.
+    """
+    import httpx  # noqa: PLC0415
+
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=http2,
+        headers={"Accept-Encoding": "gzip, deflate"},
+    )
+
+
+def _timeout(timeout: float | tuple[float, float]) -> "httpx.Timeout":
+    """Return the `httpx` timeout of a `requests` style timeout."""
+    import httpx  # noqa: PLC0415
+
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout,) * 2
+    # Queued requests wait for a free connection without a timeout.
+    return httpx.Timeout(read, connect=connect, pool=None)
+
+
+def _requests_error(err: Exception) -> RequestException:
+    """Return the `requests` exception equivalent to an `httpx` one.
+
+    The failures are then retried, recorded and raised like the ones of
+    `GliderDataFetcher`.
+    """
+    import httpx  # noqa: PLC0415
+
+    if isinstance(err, httpx.HTTPStatusError):
+        return HTTPError(str(err), response=err.response)
+    if isinstance(err, httpx.TimeoutException):
+        return Timeout(str(err))
+    if isinstance(err, httpx.TransportError):
+        return ConnectionError(str(err))
+    return RequestException(str(err))
+
+
+class AsyncGliderDataFetcher(Instrumented):
+    """Instantiate the asyncio glider fetcher.
+
+    The asyncio counterpart of `gliderpy.fetchers.GliderDataFetcher`, with
+    awaitable `query` and `to_pandas` and an asynchronous `iter_chunks`.
+    All the datasets are downloaded concurrently on the event loop, the
+    responses are decoded and standardised in worker threads. Caches,
+    retries and circuit breakers are shared with `GliderDataFetcher`.
+    Requires `httpx`.
+
+    >>> async with AsyncGliderDataFetcher() as glider_grab:  # doctest: +SKIP
+    ...     await glider_grab.query(min_lat=38, max_lat=41)
+    ...     glider_dfs = await glider_grab.to_pandas()
+
+    Attributes
+    ----------
+    dataset_ids : list
+        Datasets to download, defaults to the ones found by `query`.
+    cache : gliderpy.cache.DiskCache
+        Optional on-disk cache for the downloaded datasets.
+    response : str
+        ERDDAP response format used for downloads, defaults to csvp.
+    catalog : gliderpy.catalog.GliderCatalog
+        Optional local catalog used by `query` instead of an ERDDAP search.
+    client : httpx.AsyncClient
+        HTTP client used for all requests, defaults to a new client from
+        `make_client`, closed by `aclose`.
+    timeout : float or tuple
+        Seconds to wait for the server, or a (connect, read) tuple,
+        defaults to 60.
+    filters : list
+        ERDDAP server-side operations appended to the download URLs.
+    rate_limiter : gliderpy.resilience.RateLimiter
+        Optional limit of the requests per second.
+    circuit_breaker : gliderpy.resilience.CircuitBreaker
+        Stops requests to a failing server, defaults to the one shared by
+        all the fetchers of the server.
+    attempts : int
+        Download attempts before giving up on a dataset, defaults to 3.
+    failures : dict
+        Error of each dataset that failed in the last download.
+    hooks : list
+        Callables called with each `gliderpy.instrumentation.Event`.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: "AsyncGliderDataFetcher",
+        server: OptionalStr = _server,
+        *,
+        max_concurrency: int = 100,
+        cache: DiskCache | None = None,
+        response: str = "csvp",
+        catalog: "GliderCatalog | None" = None,
+        client: "httpx.AsyncClient | None" = None,
+        http2: bool = False,
+        timeout: float | tuple[float, float] = 60,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        attempts: int = 3,
+        hooks: Iterable[Callable[[Event], None]] = (),
+    ) -> None:
+        """Instantiate main class attributes.
+
+        :param max_concurrency: requests sent at once by the default client
+        :param http2: use HTTP/2 in the default client, requires `h2`
+        """
+        self.server = server
+        self.cache = cache
+        self.response = response
+        self.catalog = catalog
+        self._owns_client = client is None
+        if client is None:
+            client = make_client(max_concurrency, http2=http2)
+        self.client = client
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        if circuit_breaker is None:
+            circuit_breaker = circuit_breakers.setdefault(
+                server,
+                CircuitBreaker(),
+            )
+        self.circuit_breaker = circuit_breaker
+        self.attempts = attempts
+        self.failures: dict[str, Exception] = {}
+        self.hooks = list(hooks)
+        self.fetcher = ERDDAP(
+            server=server,
+            protocol="tabledap",
+        )
+        self.fetcher.variables = server_vars[server]
+        self.filters: list[str] = []
+        self.dataset_ids: OptionalList = None
+        self.datasets: pd.DataFrame | None = None
+
+    async def __aenter__(self: Self) -> Self:
+        """Return the fetcher, its client is closed when leaving."""
+        return self
+
+    async def __aexit__(self: "AsyncGliderDataFetcher", *_exc: object) -> None:
+        """Close the client."""
+        await self.aclose()
+
+    async def aclose(self: "AsyncGliderDataFetcher") -> None:
+        """Close the default client, a client passed in is left open."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def urlopen(
+        self: "AsyncGliderDataFetcher",
+        url: str,
+        *,
+        phase: str = "request",
+        dataset_id: OptionalStr = None,
+    ) -> BinaryIO:
+        """Return the content of `url`, see `GliderDataFetcher.urlopen`.
+
+        `httpx` errors are raised as the equivalent `requests` exceptions.
+        """
+        import httpx  # noqa: PLC0415
+
+        waited = _before_request(self, dataset_id)
+        if waited:
+            await asyncio.sleep(waited)
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(
+                quote_url(url),
+                follow_redirects=True,
+                timeout=_timeout(self.timeout),
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            error = _requests_error(err)
+            _request_failed(self, error)
+            raise error from err
+        return _received(
+            self,
+            io.BytesIO(response.content),
+            phase=phase,
+            dataset_id=dataset_id,
+            start=start,
+        )
+
+    async def _decode(
+        self: "AsyncGliderDataFetcher",
+        request: tuple[str, str],
+    ) -> pd.DataFrame:
+        """Download the `(response, url)` request, decode it in a thread."""
+        response, url = request
+        data = await self.urlopen(
+            url,
+            phase="download",
+            dataset_id=self.fetcher.dataset_id,
+        )
+        return await asyncio.to_thread(_decoded, self, response, data)
+
+    async def _call_erddapy(self: "AsyncGliderDataFetcher") -> pd.DataFrame:
+        """Download a dataset, see `gliderpy.fetchers._call_erddapy`."""
+        async for attempt in _Retries(self):
+            with attempt:
+                return await _arun(_download(self), self._decode)
+        return pd.DataFrame()
+
+    async def _fetch_dataset(
+        self: "AsyncGliderDataFetcher",
+        dataset_id: str,
+        constraints: OptionalDict = None,
+        *,
+        memory: bool = True,
+    ) -> pd.DataFrame:
+        """Download and standardise a single dataset.
+
+        :param memory: keep the dataset in `memory_cache`
+        """
+        glider_grab, key = _dataset_request(self, dataset_id, constraints)
+        if self.cache is None:
+            glider_df = _cached(glider_grab, key, memory=memory)
+        else:
+            glider_df = await asyncio.to_thread(
+                _cached,
+                glider_grab,
+                key,
+                memory=memory,
+            )
+        if glider_df is not None:
+            return glider_df
+        glider_df = await glider_grab._call_erddapy()  # noqa: SLF001
+        return await asyncio.to_thread(
+            _standardised,
+            glider_grab,
+            key,
+            glider_df,
+            memory=memory,
+        )
+
+    async def _fetch(
+        self: "AsyncGliderDataFetcher",
+        dataset_id: str,
+    ) -> pd.DataFrame:
+        """Download a dataset, recording its failure in `failures`."""
+        try:
+            return await self._fetch_dataset(dataset_id)
+        except RequestException as err:
+            return _failed(self, dataset_id, err)
+
+    async def to_pandas(
+        self: "AsyncGliderDataFetcher",
+        *,
+        consolidated: bool = False,
+        variables: OptionalList = None,
+        constraints: OptionalDict = None,
+        filters: OptionalList = None,
+        errors: str = "record",
+    ) -> dict | pd.DataFrame:
+        """Return data from the server, see `GliderDataFetcher.to_pandas`.
+
+        All the datasets are downloaded concurrently.
+
+        :return: dictionary of dataframes with datetime UTC as index
+        """
+        if variables or constraints or filters:
+            glider_grab = _request(self, variables, constraints, filters)
+            try:
+                return await glider_grab.to_pandas(
+                    consolidated=consolidated,
+                    errors=errors,
+                )
+            finally:
+                self.failures = glider_grab.failures
+
+        dataset_ids = _requested_dataset_ids(self)
+        self.failures = {}
+        glider_dfs = await asyncio.gather(
+            *(self._fetch(dataset_id) for dataset_id in dataset_ids),
+        )
+        return _results(
+            self,
+            dict(zip(dataset_ids, glider_dfs, strict=True)),
+            consolidated=consolidated,
+            errors=errors,
+        )
+
+    async def iter_chunks(
+        self: "AsyncGliderDataFetcher",
+        freq: str = "7D",
+        **request: dict,
+    ) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+        """Yield data one time window at a time, see `GliderDataFetcher`.
+
+        >>> async for dataset_id, df in glider_grab.iter_chunks():  # doctest: +SKIP
+        ...     print(dataset_id, len(df))
+
+        :return: asynchronous iterator of (dataset_id, dataframe) tuples
+        """  # noqa: E501
+        if request:
+            async for chunk in _request(self, **request).iter_chunks(freq):
+                yield chunk
+            return
+
+        for dataset_id in _requested_dataset_ids(self):
+            coverage = await self._time_coverage(dataset_id)
+            for constraint in _window_constraints(
+                self.fetcher.constraints,
+                coverage,
+                freq,
+            ):
+                glider_df = await self._fetch_dataset(
+                    dataset_id,
+                    constraint,
+                    memory=False,
+                )
+                if not glider_df.empty:
+                    yield dataset_id, glider_df
+
+    async def _time_coverage(
+        self: "AsyncGliderDataFetcher",
+        dataset_id: str,
+    ) -> tuple[pd.Timestamp, pd.Timestamp]:
+        """Return the time coverage start and end of a dataset."""
+        url = self.fetcher.get_info_url(dataset_id=dataset_id, response="csv")
+        return _coverage(
+            await self.urlopen(url, phase="info", dataset_id=dataset_id),
+        )
+
+    async def query(  # noqa: PLR0913
+        self: "AsyncGliderDataFetcher",
+        *,
+        min_lat: OptionalNum = None,
+        max_lat: OptionalNum = None,
+        min_lon: OptionalNum = None,
+        max_lon: OptionalNum = None,
+        min_time: OptionalDateTime = None,
+        max_time: OptionalDateTime = None,
+        delayed: OptionalBool = False,
+    ) -> pd.DataFrame:
+        """Search the server, see `GliderDataFetcher.query`.
+
+        :return: search query with argument constraints applied
+        """
+        steps = _query(
+            self,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lon=min_lon,
+            max_lon=max_lon,
+            min_time=min_time,
+            max_time=max_time,
+            delayed=delayed,
+        )
+        return await _arun(
+            steps,
+            lambda url: self.urlopen(url, phase="search"),
+        )
@@ -0,0 +1,435 @@
+"""Caches for downloaded glider datasets."""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+OptionalNum = float | int | None
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, similar to `functools.lru_cache` ones."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int | None
+    currsize: int
+
+
+# pandas >= 3 always uses copy-on-write, older versions must opt-in.
+_COPY_ON_WRITE = (
+    int(pd.__version__.split(".")[0]) >= 3  # noqa: PLR2004
+    or pd.options.mode.copy_on_write is True
+)
+
+
+def cache_key(
+    server: str,
+    dataset_id: str,
+    variables: list[str] | tuple[str] | None,
+    constraints: dict | None,
+    filters: list[str] | None = None,
+) -> str:
+    """Return a stable key for a dataset request.
+
+    The key is a hash of everything that changes the downloaded data:
+    the server, the dataset id, the variables, the constraints and the
+    server-side filters.
+    """
+    request = {
+        "server": server,
+        "dataset_id": dataset_id,
+        "variables": list(variables or []),
+        "constraints": sorted((constraints or {}).items()),
+    }
+    if filters:
+        # Only added when used to keep the keys of older cache entries.
+        request["filters"] = list(filters)
+    # `default=str` takes care of datetime constraints.
+    payload = json.dumps(request, default=str, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def readonly_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a copy of `df` whose changes never reach the cached frame."""
+    # With copy-on-write a shallow copy shares the data until written to.
+    return df.copy(deep=not _COPY_ON_WRITE)
+
+
+def write_arrow(df: pd.DataFrame, fname: str | os.PathLike) -> None:
+    """Write `df` as an uncompressed Arrow IPC file, see `map_arrow`."""
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.compute as pc  # noqa: PLC0415
+
+    table = pa.Table.from_pandas(df)
+    # Arrow turns NaN into nulls, which are converted back to NaN in a
+    # copy of the column. Keep the NaN values instead.
+    for num, field in enumerate(table.schema):
+        column = table.column(num)
+        if pa.types.is_floating(field.type) and column.null_count:
+            table = table.set_column(
+                num,
+                field,
+                pc.fill_null(column, float("nan")),
+            )
+    with (
+        pa.OSFile(str(fname), "wb") as sink,
+        pa.ipc.new_file(sink, table.schema) as writer,
+    ):
+        writer.write_table(table)
+
+
+def _mapped_column(mapped: np.memmap, column: pd.Series) -> object:
+    """Return a writable view of `column` if its data is in `mapped`."""
+    if not isinstance(column.dtype, np.dtype):
+        return column
+    values = column.to_numpy()
+    if not np.shares_memory(values, mapped):
+        return column  # Converted, e.g. booleans or integers with nulls.
+    return np.ndarray(
+        values.shape,
+        values.dtype,
+        buffer=mapped,
+        offset=values.ctypes.data - mapped.ctypes.data,
+    )
+
+
+def map_arrow(fname: str | os.PathLike) -> pd.DataFrame:
+    """Return a dataframe backed by a memory-mapped Arrow IPC file.
+
+    The numeric and datetime columns are not copied. The file is mapped
+    copy-on-write, edits only copy the pages written to and never reach
+    the file, other processes or other dataframes mapping it.
+    """
+    import pyarrow as pa  # noqa: PLC0415
+
+    # The mapping stays valid after closing the file, until the
+    # dataframe is garbage collected.
+    mapped = np.memmap(fname, mode="c")
+    table = pa.ipc.open_file(pa.py_buffer(mapped)).read_all()
+    # Without splitting, columns of the same type are copied together
+    # into a single 2D block.
+    df = table.to_pandas(split_blocks=True)
+    # Arrow data is read-only, pandas writes to it in place, and fails,
+    # once no other dataframe shares it. The same data in the private
+    # mapping is writable.
+    glider_df = pd.DataFrame(
+        {name: _mapped_column(mapped, df[name]) for name in df.columns},
+        index=df.index,
+        copy=False,
+    )
+    glider_df.attrs = df.attrs
+    return glider_df
+
+
+def frame_cache(func: Callable) -> Callable:
+    """Cache the result of `func(df)` for as long as `df` is alive.
+
+    The result is recomputed when the index of `df` is replaced, e.g. by
+    `sort_index`, but in-place edits of the values are not detected.
+    """
+    results = {}
+
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame) -> object:
+        key = id(df)
+        cached = results.get(key)
+        if cached is not None:
+            ref, index, result = cached
+            if ref() is df and index is df.index:
+                return result
+        result = func(df)
+        results[key] = (
+            weakref.ref(df, lambda _: results.pop(key, None)),
+            df.index,
+            result,
+        )
+        return result
+
+    wrapper.cache_clear = results.clear
+    return wrapper
+
+
+class MemoryCache:
+    """Thread-safe least recently used cache for datasets.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of cached datasets, defaults to 128.
+    ttl : float
+        Maximum age, in seconds, of a cached dataset, defaults to no expiry.
+
+    """
+
+    def __init__(
+        self: "MemoryCache",
+        maxsize: int = 128,
+        *,
+        ttl: OptionalNum = None,
+    ) -> None:
+        """Instantiate an empty cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self: "MemoryCache", key: Hashable) -> pd.DataFrame | None:
+        """Return a copy of the cached dataset for `key` or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored, df = entry
+            if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                del self._data[key]
+                self._misses += 1
+                self._evictions += 1
+                return None
+            self._hits += 1
+            self._data.move_to_end(key)
+        return readonly_copy(df)
+
+    def put(self: "MemoryCache", key: Hashable, df: pd.DataFrame) -> None:
+        """Store `df` under `key`, evicting the least recently used."""
+        with self._lock:
+            self._data[key] = time.monotonic(), readonly_copy(df)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def cache_info(self: "MemoryCache") -> CacheInfo:
+        """Report the cache statistics."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._data),
+            )
+
+    def cache_clear(self: "MemoryCache") -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class DiskCache:
+    """Persist standardised datasets as Parquet files.
+
+    The cache is safe to use from several threads and processes. Writing
+    and reading Parquet files requires `pyarrow`.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Directory where the cached datasets are stored.
+    ttl : float
+        Maximum age, in seconds, of a cached dataset, defaults to no expiry.
+    max_size : int
+        Maximum size, in bytes, of the cache directory. The least recently
+        used datasets are evicted first. Defaults to no limit.
+    offline : bool
+        Serve only from the cache and never download, defaults to False.
+
+    """
+
+    suffix = ".parquet"
+
+    def __init__(
+        self: "DiskCache",
+        path: str | os.PathLike = "~/.cache/gliderpy",
+        *,
+        ttl: OptionalNum = None,
+        max_size: int | None = None,
+        offline: bool = False,
+    ) -> None:
+        """Instantiate the cache and create its directory."""
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.offline = offline
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def _count(
+        self: "DiskCache",
+        *,
+        hits: int = 0,
+        misses: int = 0,
+        evictions: int = 0,
+    ) -> None:
+        """Update the statistics, `get` and `put` run in many threads."""
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+
+    def _file(self: "DiskCache", key: str) -> Path:
+        """Return the file path for `key`."""
+        return self.path.joinpath(key).with_suffix(self.suffix)
+
+    def _expired(self: "DiskCache", fname: Path) -> bool:
+        """Check if `fname` is older than the time-to-live."""
+        if self.ttl is None:
+            return False
+        return time.time() - fname.stat().st_mtime > self.ttl
+
+    def get(self: "DiskCache", key: str) -> pd.DataFrame | None:
+        """Return the cached dataset for `key` or None when missing."""
+        fname = self._file(key)
+        try:
+            if self._expired(fname):
+                fname.unlink(missing_ok=True)
+                self._count(misses=1)
+                return None
+            df = self._read(fname)
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        self._count(hits=1)
+        # Record the access time for the least recently used eviction.
+        os.utime(fname)
+        return df
+
+    def put(self: "DiskCache", key: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Store `df` under `key` and evict old entries if needed.
+
+        :return: the dataframe to use instead of `df`, `df` itself here
+        """
+        fname = self._file(key)
+        # Write to a temporary file first so that readers never see a
+        # partially written dataset. Each thread, of each process, writes
+        # its own file.
+        tmp = fname.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        self._write(df, tmp)
+        tmp.replace(fname)
+        self.evict()
+        return df
+
+    def _read(self: "DiskCache", fname: Path) -> pd.DataFrame:
+        """Read a cached dataset."""
+        return pd.read_parquet(fname)
+
+    def _write(self: "DiskCache", df: pd.DataFrame, fname: Path) -> None:
+        """Write a dataset to `fname`."""
+        df.to_parquet(fname)
+
+    def evict(self: "DiskCache") -> None:
+        """Remove expired entries and enforce the maximum size."""
+        entries = []
+        for fname in self.path.glob(f"*{self.suffix}"):
+            try:
+                if self._expired(fname):
+                    fname.unlink(missing_ok=True)
+                    self._count(evictions=1)
+                    continue
+                stat = fname.stat()
+            except FileNotFoundError:
+                continue  # Removed by another process.
+            entries.append((stat.st_mtime, stat.st_size, fname))
+
+        if self.max_size is None:
+            return
+        size = sum(entry[1] for entry in entries)
+        for _mtime, fsize, fname in sorted(entries):
+            if size <= self.max_size:
+                break
+            fname.unlink(missing_ok=True)
+            self._count(evictions=1)
+            size -= fsize
+
+    def cache_info(self: "DiskCache") -> CacheInfo:
+        """Report the cache statistics, the sizes are in bytes."""
+        currsize = sum(
+            fname.stat().st_size for fname in self.path.glob(f"*{self.suffix}")
+        )
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.max_size,
+                currsize,
+            )
+
+    def clear(self: "DiskCache") -> None:
+        """Remove all cached datasets."""
+        for fname in self.path.glob(f"*{self.suffix}"):
+            fname.unlink(missing_ok=True)
+
+
+class ArrowCache(DiskCache):
+    """Persist standardised datasets as memory-mapped Arrow IPC files.
+
+    Cached datasets are returned as dataframes backed by the mapped files,
+    without copying them into memory. Processes reading the same dataset
+    share one copy of it in the operating system page cache. The files
+    are uncompressed and larger than Parquet ones. Requires `pyarrow`.
+
+    The files are mapped copy-on-write, edits of a returned dataframe
+    never reach the cached dataset, see `map_arrow`.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Directory where the cached datasets are stored.
+    ttl : float
+        Maximum age, in seconds, of a cached dataset, defaults to no expiry.
+    max_size : int
+        Maximum size, in bytes, of the cache directory. The least recently
+        used datasets are evicted first. Defaults to no limit.
+    offline : bool
+        Serve only from the cache and never download, defaults to False.
+
+    """
+
+    suffix = ".arrow"
+
+    def __init__(
+        self: "ArrowCache",
+        path: str | os.PathLike = "~/.cache/gliderpy",
+        *,
+        ttl: OptionalNum = None,
+        max_size: int | None = None,
+        offline: bool = False,
+    ) -> None:
+        """Instantiate the cache and create its directory."""
+        super().__init__(path, ttl=ttl, max_size=max_size, offline=offline)
+
+    def put(self: "ArrowCache", key: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Store `df` under `key` and evict old entries if needed.
+
+        :return: the stored dataset, backed by the mapped file
+        """
+        super().put(key, df)
+        try:
+            return self._read(self._file(key))
+        except FileNotFoundError:
+            return df  # Evicted by the size limit.
+
+    def _read(self: "ArrowCache", fname: Path) -> pd.DataFrame:
+        """Map a cached dataset, its numeric columns are not copied."""
+        return map_arrow(fname)
+
+    def _write(self: "ArrowCache", df: pd.DataFrame, fname: Path) -> None:
+        """Write a dataset as an uncompressed Arrow IPC file."""
+        write_arrow(df, fname)
@@ -0,0 +1,195 @@
+"""Local spatio-temporal index of the datasets in an ERDDAP server."""
+
+import datetime
+import os
+from numbers import Number
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+from erddapy import ERDDAP
+
+from gliderpy.fetchers import _server, urlopen
+
+OptionalNum = Number | None
+OptionalDateTime = datetime.datetime | str | None
+
+# Active datasets may have been updated just before the last refresh.
+_refresh_margin = pd.Timedelta("1D")
+
+
+class GliderCatalog:
+    """Index the time and space coverage of all datasets in a server.
+
+    The coverage is downloaded once from ERDDAP's `allDatasets` table and
+    queried locally. Rows are sorted by start time so that a time query
+    only scans the datasets that started before its end.
+
+    Attributes
+    ----------
+    server : str
+        ERDDAP server URL.
+    path : pathlib.Path
+        Optional CSV file where the catalog is persisted.
+    session : requests.Session
+        Optional HTTP session used for the downloads.
+    updated : pandas.Timestamp
+        Time of the last refresh, None if the catalog is empty.
+
+    """
+
+    columns = (
+        "datasetID",
+        "institution",
+        "title",
+        "minLongitude",
+        "maxLongitude",
+        "minLatitude",
+        "maxLatitude",
+        "minTime",
+        "maxTime",
+    )
+
+    def __init__(
+        self: "GliderCatalog",
+        server: str = _server,
+        path: str | os.PathLike | None = None,
+        session: requests.Session | None = None,
+    ) -> None:
+        """Instantiate the catalog, loading it from `path` if it exists."""
+        self.server = server
+        self.session = session
+        self.path = None if path is None else Path(path).expanduser()
+        self.updated = None
+        self._set_index(pd.DataFrame(columns=self.columns))
+        if self.path is not None and self.path.exists():
+            table = pd.read_csv(self.path, parse_dates=["minTime", "maxTime"])
+            self.updated = pd.Timestamp(self.path.stat().st_mtime, unit="s")
+            self._set_index(table)
+
+    def __len__(self: "GliderCatalog") -> int:
+        """Return the number of datasets in the catalog."""
+        return len(self.table)
+
+    def _set_index(self: "GliderCatalog", table: pd.DataFrame) -> None:
+        """Sort the table and build the arrays used by `search`."""
+        self.table = table.sort_values("minTime", ignore_index=True)
+        self._min_time = self.table["minTime"].to_numpy("datetime64[ns]")
+        self._max_time = self.table["maxTime"].to_numpy("datetime64[ns]")
+        self._bounds = self.table[
+            ["minLatitude", "maxLatitude", "minLongitude", "maxLongitude"]
+        ].to_numpy(float)
+        self._ids = self.table["datasetID"].to_numpy(str)
+        self._titles = self.table["title"].to_numpy(object)
+        self._institutions = self.table["institution"].to_numpy(object)
+        self._delayed = np.char.endswith(self._ids, "delayed")
+
+    def _download(
+        self: "GliderCatalog",
+        since: OptionalDateTime,
+    ) -> pd.DataFrame:
+        """Download the coverage of the datasets updated after `since`."""
+        e = ERDDAP(server=self.server, protocol="tabledap")
+        constraints = None
+        if since is not None:
+            constraints = {"maxTime>=": since.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        url = e.get_download_url(
+            dataset_id="allDatasets",
+            variables=list(self.columns),
+            response="csv",
+            constraints=constraints,
+        )
+        # The second row has the units.
+        table = pd.read_csv(urlopen(url, session=self.session), skiprows=[1])
+        table = table.loc[table["datasetID"] != "allDatasets"]
+        for col in ("minTime", "maxTime"):
+            table[col] = pd.to_datetime(table[col], utc=True).dt.tz_convert(
+                None,
+            )
+        return table
+
+    def refresh(
+        self: "GliderCatalog",
+        *,
+        full: bool = False,
+    ) -> "GliderCatalog":
+        """Update the catalog from the server.
+
+        After the first download only datasets that ended after the last
+        refresh, i.e. active and new ones, are requested. Use `full=True` to
+        pick up changes to older datasets, like new delayed mode datasets.
+
+        :param full: download the coverage of all datasets
+        :return: the updated catalog
+        """
+        now = pd.Timestamp.now(tz="UTC").tz_convert(None)
+        if full or self.updated is None or not len(self):
+            table = self._download(since=None)
+        else:
+            changes = self._download(since=self.updated - _refresh_margin)
+            table = pd.concat([self.table, changes], ignore_index=True)
+            table = table.drop_duplicates("datasetID", keep="last")
+        self._set_index(table)
+        self.updated = now
+        if self.path is not None:
+            self.table.to_csv(self.path, index=False)
+        return self
+
+    def search(  # noqa: PLR0913
+        self: "GliderCatalog",
+        *,
+        min_lat: OptionalNum = None,
+        max_lat: OptionalNum = None,
+        min_lon: OptionalNum = None,
+        max_lon: OptionalNum = None,
+        min_time: OptionalDateTime = None,
+        max_time: OptionalDateTime = None,
+        delayed: bool = False,
+    ) -> pd.DataFrame:
+        """Return the datasets overlapping the bounding box and time window.
+
+        :return: datasets in the same format as `GliderDataFetcher.query`
+        """
+        num = len(self)
+        if max_time is not None:
+            # Only datasets that started before `max_time` can overlap.
+            max_time = _to_datetime64(max_time)
+            num = np.searchsorted(self._min_time, max_time, side="right")
+        mask = np.ones(num, dtype=bool)
+        if min_time is not None:
+            mask &= self._max_time[:num] >= _to_datetime64(min_time)
+
+        bounds = self._bounds[:num]
+        if max_lat is not None:
+            mask &= bounds[:, 0] <= max_lat
+        if min_lat is not None:
+            mask &= bounds[:, 1] >= min_lat
+        if max_lon is not None:
+            mask &= bounds[:, 2] <= max_lon
+        if min_lon is not None:
+            mask &= bounds[:, 3] >= min_lon
+
+        if not delayed:
+            mask &= ~self._delayed[:num]
+
+        found = np.flatnonzero(mask)
+        datasets = {
+            "Title": self._titles[found],
+            "Institution": self._institutions[found],
+            "Dataset ID": self._ids[found].astype(object),
+        }
+        if not delayed:
+            datasets["info_url"] = [
+                f"{self.server}/info/{dataset_id}/index.html"
+                for dataset_id in datasets["Dataset ID"]
+            ]
+        return pd.DataFrame(datasets)
+
+
+def _to_datetime64(value: OptionalDateTime) -> np.datetime64:
+    """Return `value` as a naive UTC datetime64."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp.to_datetime64().astype("datetime64[ns]")
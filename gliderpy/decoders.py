@@ -0,0 +1,44 @@
+"""Decoders that turn ERDDAP tabledap responses into DataFrames.
+
+Decoders are looked up in `decoders` by the response file type, users can
+register new ones with
+
+>>> from gliderpy.decoders import decoders
+>>> decoders["json"] = my_json_decoder  # doctest: +SKIP
+
+A decoder takes the binary response and returns a DataFrame with one column
+per variable. The time column must either be typed or be ISO 8601 strings.
+"""
+
+from collections.abc import Callable
+from typing import BinaryIO
+
+import pandas as pd
+import xarray as xr
+
+Decoder = Callable[[BinaryIO], pd.DataFrame]
+
+
+def decode_csvp(data: BinaryIO) -> pd.DataFrame:
+    """Decode a `.csvp` response, columns are named `name (units)`."""
+    return pd.read_csv(data)
+
+
+def decode_parquet(data: BinaryIO) -> pd.DataFrame:
+    """Decode a `.parquet` response, requires `pyarrow`."""
+    return pd.read_parquet(data)
+
+
+def decode_nc(data: BinaryIO) -> pd.DataFrame:
+    """Decode a flat table `.nc` response, requires `scipy` or `netCDF4`."""
+    with xr.open_dataset(data) as ds:
+        return pd.DataFrame(
+            {name: var.to_numpy() for name, var in ds.data_vars.items()},
+        )
+
+
+decoders: dict[str, Decoder] = {
+    "csvp": decode_csvp,
+    "nc": decode_nc,
+    "parquet": decode_parquet,
+}
@@ -0,0 +1,50 @@
+"""Derived seawater variables, requires `gsw`."""
+
+import pandas as pd
+from pandas_flavor import register_dataframe_method
+
+from gliderpy.cache import frame_cache, readonly_copy
+
+
+@frame_cache
+def _ts_variables(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the TEOS-10 variables once per DataFrame."""
+    import gsw  # noqa: PLC0415
+
+    sa = gsw.conversions.SA_from_SP(
+        df["salinity"].to_numpy(float),
+        df["pressure"].to_numpy(float),
+        df["longitude"].to_numpy(float),
+        df["latitude"].to_numpy(float),
+    )
+    ct = gsw.conversions.CT_from_t(
+        sa,
+        df["temperature"].to_numpy(float),
+        df["pressure"].to_numpy(float),
+    )
+    return pd.DataFrame(
+        {"sa": sa, "ct": ct, "sigma0": gsw.sigma0(sa, ct)},
+        index=df.index,
+    )
+
+
+@register_dataframe_method
+def ts_variables(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the Absolute Salinity, Conservative Temperature and sigma0.
+
+    The variables are computed from the practical salinity, temperature,
+    pressure and position columns, without modifying `df`, and are cached
+    for as long as `df` is alive.
+
+    :return: DataFrame with the `sa`, `ct` and `sigma0` columns
+    """
+    return readonly_copy(_ts_variables(df))
+
+
+def with_ts_variables(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with the `ts_variables` columns added.
+
+    A module level function, unlike the `ts_variables` method, that can
+    be a step of a `Pipeline`.
+    """
+    return pd.concat([df, _ts_variables(df)], axis=1)
@@ -0,0 +1,235 @@
+"""Search and download glider data from several ERDDAP servers."""
+
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from requests.exceptions import HTTPError, RequestException
+
+from gliderpy.fetchers import GliderDataFetcher, _fetch_dataset, _results
+from gliderpy.resilience import _status_code
+from gliderpy.servers import registry
+
+
+class ServerHealth:
+    """Response time and failures of a server, used to rank mirrors.
+
+    Attributes
+    ----------
+    latency : float
+        Exponential moving average of the response times, in seconds,
+        None until the first response.
+    failures : int
+        Number of consecutive failed requests.
+
+    """
+
+    # Weight of the latest response time in the moving average.
+    alpha = 0.3
+
+    def __init__(self: "ServerHealth") -> None:
+        """Instantiate the health of a server not contacted yet."""
+        self.latency: float | None = None
+        self.failures = 0
+
+    def record(self: "ServerHealth", seconds: float) -> None:
+        """Record a successful response that took `seconds`."""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+        self.failures = 0
+
+    def record_failure(self: "ServerHealth") -> None:
+        """Record a failed request."""
+        self.failures += 1
+
+    def rank(self: "ServerHealth") -> tuple[int, float]:
+        """Return the sort key, healthy and fast servers first."""
+        latency = float("inf") if self.latency is None else self.latency
+        return self.failures, latency
+
+
+def _client_error(err: HTTPError) -> bool:
+    """Check if the server answered but rejected the request."""
+    status_code = _status_code(err)
+    return status_code is not None and status_code < 500  # noqa: PLR2004
+
+
+class FederatedFetcher:
+    """Search and download glider data from several ERDDAP servers.
+
+    Searches run on all the servers in parallel and their results are
+    merged, datasets mirrored by many servers are listed once. Each
+    dataset is downloaded from the healthiest and fastest server hosting
+    it, falling back to the other mirrors when a download fails.
+
+    Attributes
+    ----------
+    fetchers : dict
+        One `GliderDataFetcher` per server URL.
+    health : dict
+        `ServerHealth` of each server URL.
+    max_workers : int
+        Number of datasets downloaded concurrently, defaults to 4.
+    dataset_ids : list
+        Datasets to download, defaults to the ones found by `query`.
+    datasets : pandas.DataFrame
+        Merged search results, the `servers` column has the URLs of the
+        servers hosting each dataset.
+    failures : dict
+        Error of the last mirror tried for each dataset that failed on
+        every mirror in the last download.
+
+    """
+
+    def __init__(
+        self: "FederatedFetcher",
+        servers: Iterable[str] | None = None,
+        *,
+        max_workers: int = 4,
+        **kwargs: dict,
+    ) -> None:
+        """Instantiate one fetcher per server.
+
+        :param servers: server URLs, defaults to all the servers in
+                        `gliderpy.servers.registry`
+        :param kwargs: passed to each `GliderDataFetcher`
+        """
+        servers = list(registry if servers is None else servers)
+        self.fetchers = {
+            server: GliderDataFetcher(server, **kwargs) for server in servers
+        }
+        self.health = {server: ServerHealth() for server in servers}
+        self.max_workers = max_workers
+        self.dataset_ids: list[str] | None = None
+        self.datasets: pd.DataFrame | None = None
+        self.failures: dict[str, Exception] = {}
+
+    def _search(
+        self: "FederatedFetcher",
+        server: str,
+        search: dict,
+    ) -> pd.DataFrame:
+        """Search one server, an unreachable server finds nothing."""
+        start = time.perf_counter()
+        try:
+            datasets = self.fetchers[server].query(**search)
+        except HTTPError as err:
+            if not _client_error(err):
+                self.health[server].record_failure()
+                return pd.DataFrame()
+            # ERDDAP answers 404 when nothing matches the search.
+            datasets = pd.DataFrame()
+        except RequestException:
+            self.health[server].record_failure()
+            return pd.DataFrame()
+        self.health[server].record(time.perf_counter() - start)
+        return datasets.assign(server=server)
+
+    def query(self: "FederatedFetcher", **search: dict) -> pd.DataFrame:
+        """Search all the servers in parallel and merge the results.
+
+        :param search: search constraints, see `GliderDataFetcher.query`
+        :return: search results with one row per dataset
+        """
+
+        def search_server(server: str) -> pd.DataFrame:
+            return self._search(server, search)
+
+        with ThreadPoolExecutor(max_workers=len(self.fetchers) or 1) as pool:
+            found = list(pool.map(search_server, self.fetchers))
+        datasets = pd.concat(
+            [pd.DataFrame(columns=["Dataset ID", "server"]), *found],
+            ignore_index=True,
+        )
+        # Mirrored datasets have the same id in all the servers.
+        servers = datasets.groupby("Dataset ID", sort=False)["server"]
+        datasets = datasets.drop_duplicates("Dataset ID")
+        datasets = datasets.drop(columns="server")
+        datasets["servers"] = datasets["Dataset ID"].map(servers.agg(tuple))
+        self.datasets = datasets.reset_index(drop=True)
+        return self.datasets
+
+    def ranked(
+        self: "FederatedFetcher",
+        servers: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Return `servers`, healthy and fast ones first."""
+        servers = self.fetchers if servers is None else servers
+        return sorted(servers, key=lambda server: self.health[server].rank())
+
+    def _servers(self: "FederatedFetcher", dataset_id: str) -> list[str]:
+        """Return the servers hosting `dataset_id`, in download order."""
+        if self.datasets is not None:
+            found = self.datasets.loc[
+                self.datasets["Dataset ID"] == dataset_id,
+                "servers",
+            ]
+            if not found.empty:
+                return self.ranked(found.iloc[0])
+        # Datasets not found by a search may be in any server.
+        return self.ranked()
+
+    def _fetch(self: "FederatedFetcher", dataset_id: str) -> pd.DataFrame:
+        """Download `dataset_id` from the best mirror that has it.
+
+        Datasets that fail on every mirror are empty and their last error
+        is recorded in `failures`.
+        """
+        error = None
+        for server in self._servers(dataset_id):
+            start = time.perf_counter()
+            try:
+                glider_df = _fetch_dataset(self.fetchers[server], dataset_id)
+            except HTTPError as err:
+                if not _client_error(err):
+                    self.health[server].record_failure()
+                error = err
+                continue  # Not in this server or rejected, try the next.
+            except RequestException as err:
+                self.health[server].record_failure()
+                error = err
+                continue
+            # Datasets without rows in the request are empty, not failed.
+            self.health[server].record(time.perf_counter() - start)
+            return glider_df
+        if error is not None:
+            self.failures[dataset_id] = error
+        return pd.DataFrame()
+
+    def to_pandas(
+        self: "FederatedFetcher",
+        *,
+        consolidated: bool = False,
+        errors: str = "record",
+    ) -> dict | pd.DataFrame:
+        """Return data from the servers as pandas dataframes.
+
+        Datasets that fail to download from every mirror are left out and
+        their errors are stored in `failures`. Use `errors="raise"` to raise
+        a `DownloadError` instead.
+
+        :param consolidated: return a single compact dataframe for all the
+                             datasets instead, see `consolidate`
+        :param errors: "record" or "raise" the download failures
+        :return: dictionary of dataframes with datetime UTC as index
+        """
+        if self.dataset_ids is not None:
+            dataset_ids = list(self.dataset_ids)
+        elif self.datasets is not None:
+            dataset_ids = list(self.datasets["Dataset ID"])
+        else:
+            msg = "Must provide a dataset_id or query terms to download data."
+            raise ValueError(msg)
+
+        self.failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            glider_dfs = list(pool.map(self._fetch, dataset_ids))
+        return _results(
+            self,
+            dict(zip(dataset_ids, glider_dfs, strict=True)),
+            consolidated=consolidated,
+            errors=errors,
+        )
@@ -1,21 +1,56 @@
 """Helper methods to fetch glider data from multiple ERDDAP serves."""
 
+import contextlib
 import datetime
-import functools
+import io
+import os
+import time
+import warnings
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
+from itertools import pairwise
 from numbers import Number
+from typing import TYPE_CHECKING, BinaryIO
 
+import numpy as np
 import pandas as pd
+import requests
 import stamina
+import xarray as xr
 from erddapy import ERDDAP
-from erddapy.core.url import urlopen
-from requests.exceptions import HTTPError
+from erddapy.core.url import quote_url
+from pandas.api.types import union_categoricals
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
 
+from gliderpy.cache import DiskCache, MemoryCache, cache_key
+from gliderpy.decoders import decoders
+from gliderpy.instrumentation import Event, Instrumented
+from gliderpy.resilience import (
+    CircuitBreaker,
+    DownloadError,
+    RateLimiter,
+    _status_code,
+    backoff,
+    server_failure,
+)
 from gliderpy.servers import (
+    registry,
     server_parameter_rename,
     server_vars,
 )
 
+if TYPE_CHECKING:
+    from gliderpy.catalog import GliderCatalog
+
 OptionalBool = bool | None
 OptionalDF = pd.DataFrame | None
 OptionalDict = dict | None
@@ -28,73 +63,1039 @@ OptionalDateTime = datetime.datetime | str
 # Defaults to the IOOS glider DAC.
 _server = "https://gliders.ioos.us/erddap"
 
+# In-memory caches shared by all fetchers, see `memory_cache.cache_info()`.
+memory_cache = MemoryCache(maxsize=128)
+# Search results are cached per bounding box and time window.
+search_cache = MemoryCache(maxsize=128, ttl=3600)
+
+
+# Circuit breakers shared by all the fetchers of a server.
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+# Binary responses that failed with a server that serves csvp.
+_unsupported_responses: set[tuple[str, str]] = set()
+
 
 def retry_only_on_real_errors(exc: Exception) -> bool:
-    """Retry on real fetch errors."""
+    """Retry on real fetch errors.
+
+    Deprecated, use `gliderpy.resilience.backoff` with `stamina`. Unlike
+    this predicate it also retries rate limiting (429), timeouts and
+    connection errors and honors the server `Retry-After`.
+    """
+    warnings.warn(
+        "retry_only_on_real_errors is deprecated, use "
+        "gliderpy.resilience.backoff instead, which also retries 429 "
+        "responses, timeouts and connection errors and returns the "
+        "Retry-After seconds when the server sends them.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     # If the error is an HTTP status error, only retry on 5xx errors.
     html_code = 500
     if isinstance(exc, HTTPError):
-        return exc.response.status_code >= html_code
-    return isinstance(exc, HTTPError)
+        status_code = _status_code(exc)
+        return status_code is not None and status_code >= html_code
+    return False
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Return an HTTP session that keeps connections alive.
+
+    Up to `pool_size` connections per host are reused, e.g. one per
+    download thread, and responses are compressed when the server
+    supports it. Retries are left to `stamina`, see `_call_erddapy`.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+# Used by requests that do not come from a `GliderDataFetcher`.
+_session = make_session()
+
+
+def urlopen(
+    url: str,
+    *,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] = 60,
+) -> BinaryIO:
+    """Return the content of `url`.
+
+    Unlike erddapy's `urlopen` responses are not cached, caching is left to
+    `memory_cache`, `search_cache` and the optional disk cache.
+
+    :param session: session whose connections are reused, defaults to a
+                    shared module session
+    :param timeout: seconds to wait for the server, or a (connect, read)
+                    tuple
+    """
+    session = _session if session is None else session
+    response = session.get(
+        quote_url(url), allow_redirects=True, timeout=timeout
+    )
+    response.raise_for_status()
+    return io.BytesIO(response.content)
+
+
+def _before_request(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: OptionalStr,
+) -> float:
+    """Check the server circuit and take a rate limiter token.
+
+    :return: seconds to wait before sending the request
+    """
+    glider_grab.circuit_breaker.before_request(glider_grab.server)
+    if glider_grab.rate_limiter is None:
+        return 0.0
+    waited = glider_grab.rate_limiter.reserve()
+    if waited:
+        glider_grab.emit("rate_limit", dataset_id, waited)
+    return waited
+
+
+def _request_failed(
+    glider_grab: "GliderDataFetcher",
+    err: RequestException,
+) -> None:
+    """Count a failed request in the server circuit."""
+    if server_failure(err):
+        glider_grab.circuit_breaker.record_failure()
+    else:
+        glider_grab.circuit_breaker.record_success()
+
+
+def _received(
+    glider_grab: "GliderDataFetcher",
+    data: BinaryIO,
+    *,
+    phase: str,
+    dataset_id: OptionalStr,
+    start: float,
+) -> BinaryIO:
+    """Close the server circuit and report a successful request."""
+    glider_grab.circuit_breaker.record_success()
+    if glider_grab.hooks:
+        glider_grab.emit(
+            phase,
+            dataset_id,
+            time.perf_counter() - start,
+            data.getbuffer().nbytes,
+        )
+    return data
+
+
+def _run(steps: Generator, transport: Callable) -> object:
+    """Run the request `steps` with a synchronous `transport`.
+
+    The request logic shared with `AsyncGliderDataFetcher` is written as
+    generators that yield each request, e.g. a URL, and receive the
+    `transport` response, or have its error thrown in. Their return value
+    is returned.
+    """
+    send, value = steps.send, None
+    while True:
+        try:
+            request = send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            send, value = steps.send, transport(request)
+        except Exception as err:  # noqa: BLE001
+            send, value = steps.throw, err
+
+
+def _download_url(
+    fetcher: ERDDAP,
+    response: str,
+    filters: OptionalList = None,
+) -> str:
+    """Return the download URL with the server-side `filters` appended."""
+    url = fetcher.get_download_url(response=response)
+    return "".join(
+        [url, *(f"&{server_filter}" for server_filter in filters or [])]
+    )
+
+
+def _decode(
+    glider_grab: "GliderDataFetcher",
+    request: tuple[str, str],
+) -> pd.DataFrame:
+    """Download the `(response, url)` request and decode it."""
+    response, url = request
+    dataset_id = glider_grab.fetcher.dataset_id
+    data = glider_grab.urlopen(url, phase="download", dataset_id=dataset_id)
+    return _decoded(glider_grab, response, data)
+
+
+def _decoded(
+    glider_grab: "GliderDataFetcher",
+    response: str,
+    data: BinaryIO,
+) -> pd.DataFrame:
+    """Decode the downloaded `data` as `response`."""
+    start = time.perf_counter()
+    glider_df = decoders[response](data)
+    glider_grab.emit(
+        "decode",
+        glider_grab.fetcher.dataset_id,
+        time.perf_counter() - start,
+    )
+    return glider_df
+
+
+def _no_matching_results(err: Exception) -> bool:
+    """Check if ERDDAP answered that no rows match a valid request.
+
+    ERDDAP answers 404 both for requests without rows and for unknown
+    datasets, only the message tells them apart.
+    """
+    if not isinstance(err, HTTPError) or _status_code(err) != 404:  # noqa: PLR2004
+        return False
+    return "no matching results" in err.response.text
+
+
+def _unsupported(err: Exception) -> bool:
+    """Check if a failed binary download should fall back to csvp.
+
+    Client errors and decode failures do. Server failures, rate limiting,
+    timeouts, connection errors and open circuits are raised instead, to
+    be retried in the same format, and requests without rows are empty in
+    every format.
+    """
+    if isinstance(err, HTTPError):
+        return (
+            _status_code(err) is not None
+            and not server_failure(err)
+            and not _no_matching_results(err)
+        )
+    return not isinstance(err, RequestException)
+
+
+def _download(
+    glider_grab: "GliderDataFetcher",
+) -> Generator[tuple[str, str], pd.DataFrame, pd.DataFrame]:
+    """Download and decode a dataset, see `_fallback`.
+
+    Requests without matching rows, e.g. a time range where the glider
+    was idle, return an empty dataset instead of failing.
+    """
+    try:
+        return (yield from _fallback(glider_grab))
+    except HTTPError as err:
+        if not _no_matching_results(err):
+            raise
+    return pd.DataFrame()
+
+
+def _fallback(
+    glider_grab: "GliderDataFetcher",
+) -> Generator[tuple[str, str], pd.DataFrame, pd.DataFrame]:
+    """Download and decode a dataset in the fetcher `response` format.
+
+    Falls back to csvp when the server, or the local environment,
+    cannot handle `response`. Yields the `(response, url)` requests to
+    download and decode, see `_run`.
+    """
+    fetcher, response, filters = (
+        glider_grab.fetcher,
+        glider_grab.response,
+        glider_grab.filters,
+    )
+    fallback = response != "csvp" and (
+        (fetcher.server, response) not in _unsupported_responses
+    )
+    if fallback:
+        url = _download_url(fetcher, response, filters)
+        try:
+            return (yield response, url)
+        except (ImportError, OSError, ValueError) as err:
+            # Missing optional dependency or undecodable response.
+            if not _unsupported(err):
+                raise
+
+    url = _download_url(fetcher, "csvp", filters)
+    glider_df = yield "csvp", url
+    if fallback:
+        # Only flag the format after csvp worked for the same request.
+        _unsupported_responses.add((fetcher.server, response))
+    return glider_df
+
+
+class _Retries:
+    """Download attempts of a dataset, see `stamina.retry_context`.
+
+    Failures are retried with exponential backoff, or after the server
+    `Retry-After`, up to `glider_grab.attempts` times and then raised.
+    Each retry is reported with the seconds waited before it. Iterate
+    with `for`, or `async for`, and run each attempt in a `with` block.
+
+    Attributes
+    ----------
+    glider_grab : GliderDataFetcher
+        Fetcher of the dataset, synchronous or asynchronous.
+
+    """
+
+    def __init__(self: "_Retries", glider_grab: "GliderDataFetcher") -> None:
+        """Instantiate the attempts of the fetcher dataset."""
+        self.glider_grab = glider_grab
+        self._context = stamina.retry_context(
+            on=backoff,
+            attempts=glider_grab.attempts,
+        )
+        self._failed = 0.0
+
+    def __iter__(
+        self: "_Retries",
+    ) -> Iterator[contextlib.AbstractContextManager]:
+        """Yield the attempts, sleeping between them."""
+        return map(self._attempt, self._context)
+
+    async def __aiter__(
+        self: "_Retries",
+    ) -> AsyncIterator[contextlib.AbstractContextManager]:
+        """Yield the attempts, awaiting between them."""
+        async for attempt in self._context:
+            yield self._attempt(attempt)
+
+    @contextlib.contextmanager
+    def _attempt(self: "_Retries", attempt: stamina.Attempt) -> Iterator[None]:
+        """Report a retry and run the attempt."""
+        if attempt.num > 1:
+            self.glider_grab.emit(
+                "retry",
+                self.glider_grab.fetcher.dataset_id,
+                time.perf_counter() - self._failed,
+            )
+        try:
+            with attempt:
+                yield
+        finally:
+            self._failed = time.perf_counter()
 
 
 def _call_erddapy(glider_grab: "GliderDataFetcher") -> pd.DataFrame:
-    """Temporary workaround until we move optional stamina to erddapy."""
-    # NB: We will attempt 3 times, but return an empty dataset after that.
-    stop = 3
-    for attempt in stamina.retry_context(
-        on=retry_only_on_real_errors,
-        attempts=4,
-    ):
+    """Download a dataset, retrying when the server fails, see `_Retries`."""
+    for attempt in _Retries(glider_grab):
         with attempt:
-            if attempt.num == stop:
-                return pd.DataFrame()
-            return glider_grab.fetcher.to_pandas()
+            return _run(
+                _download(glider_grab),
+                lambda request: _decode(glider_grab, request),
+            )
+    return pd.DataFrame()
+
+
+def _lookup(cache: str, found: object) -> str:
+    """Return the event name of a cache lookup."""
+    return f"{cache}_miss" if found is None else f"{cache}_hit"
+
+
+def _fetch_dataset(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+    *,
+    constraints: OptionalDict = None,
+    memory: bool = True,
+) -> pd.DataFrame:
+    """Download and standardise a single dataset.
+
+    :param constraints: overrides the fetcher constraints for this dataset
+    :param memory: keep the dataset in `memory_cache`, time windows and
+                   refresh deltas are not kept so that they do not pile up
+                   in memory
+    """
+    glider_grab_copy, key = _dataset_request(
+        glider_grab,
+        dataset_id,
+        constraints,
+    )
+    glider_df = _cached(glider_grab_copy, key, memory=memory)
+    if glider_df is not None:
+        return glider_df
+    glider_df = _call_erddapy(glider_grab_copy)
+    return _standardised(glider_grab_copy, key, glider_df, memory=memory)
+
+
+def _dataset_request(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+    constraints: OptionalDict = None,
+) -> tuple["GliderDataFetcher", str]:
+    """Return a copy of the fetcher for one dataset and its cache key."""
+    # Each download gets its own ERDDAP instance so that concurrent
+    # requests do not race on the shared `dataset_id`.
+    glider_grab_copy = copy(glider_grab)
+    glider_grab_copy.fetcher = copy(glider_grab.fetcher)
+    glider_grab_copy.fetcher.dataset_id = dataset_id
+    if constraints is not None:
+        glider_grab_copy.fetcher.constraints = constraints
+
+    key = cache_key(
+        glider_grab.server,
+        dataset_id,
+        glider_grab_copy.fetcher.variables,
+        glider_grab_copy.fetcher.constraints,
+        glider_grab.filters,
+    )
+    return glider_grab_copy, key
+
+
+def _cached(
+    glider_grab: "GliderDataFetcher",
+    key: str,
+    *,
+    memory: bool = True,
+) -> OptionalDF:
+    """Return the cached dataset, None when it must be downloaded.
+
+    Offline disk caches return an empty dataframe instead.
+
+    :param memory: look the dataset up in, and add it to, `memory_cache`
+    """
+    dataset_id = glider_grab.fetcher.dataset_id
+    if memory:
+        glider_df = memory_cache.get(key)
+        glider_grab.emit(_lookup("memory_cache", glider_df), dataset_id)
+        if glider_df is not None:
+            return glider_df
+
+    cache = glider_grab.cache
+    if cache is not None:
+        glider_df = cache.get(key)
+        glider_grab.emit(_lookup("disk_cache", glider_df), dataset_id)
+        if glider_df is not None:
+            if memory:
+                memory_cache.put(key, glider_df)
+            return glider_df
+        if cache.offline:
+            return pd.DataFrame()
+    return None
+
+
+def _standardised(
+    glider_grab: "GliderDataFetcher",
+    key: str,
+    glider_df: pd.DataFrame,
+    *,
+    memory: bool = True,
+) -> pd.DataFrame:
+    """Standardise a downloaded dataset and cache it.
+
+    :param memory: add the dataset to `memory_cache`
+    """
+    if glider_df.empty:
+        return glider_df
+    dataset_id = glider_grab.fetcher.dataset_id
+    dataset_url = glider_grab.fetcher.get_download_url().split("?")[0]
+    start = time.perf_counter()
+    glider_df = standardise_df(
+        glider_df,
+        dataset_url,
+        registry.renames(glider_grab.server),
+    )
+    glider_grab.emit("standardise", dataset_id, time.perf_counter() - start)
+    if glider_grab.cache is not None:
+        glider_df = glider_grab.cache.put(key, glider_df)
+    if memory:
+        memory_cache.put(key, glider_df)
+    return glider_df
+
+
+def _fetch_datasets(
+    glider_grab: "GliderDataFetcher",
+    dataset_ids: list[str],
+    constraints: list[dict] | None = None,
+    *,
+    memory: bool = True,
+) -> list[pd.DataFrame]:
+    """Fetch `dataset_ids`, concurrently when `max_workers` allows it.
+
+    Datasets that fail are empty and their errors are recorded in
+    `glider_grab.failures`.
+
+    :param constraints: optional per dataset constraints
+    :param memory: keep the datasets in `memory_cache`
+    :return: list of dataframes in the same order as `dataset_ids`
+    """
+    if constraints is None:
+        constraints = [None] * len(dataset_ids)
+
+    def fetch(dataset_id: str, constraint: OptionalDict) -> pd.DataFrame:
+        try:
+            return _fetch_dataset(
+                glider_grab,
+                dataset_id,
+                constraints=constraint,
+                memory=memory,
+            )
+        except RequestException as err:
+            return _failed(glider_grab, dataset_id, err)
+
+    return _map(glider_grab, fetch, dataset_ids, constraints)
+
+
+def _failed(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+    err: RequestException,
+) -> pd.DataFrame:
+    """Record the failure of `dataset_id` and return an empty dataset."""
+    glider_grab.failures[dataset_id] = err
     return pd.DataFrame()
 
 
-@functools.lru_cache(maxsize=128)
+def _results(
+    glider_grab: "GliderDataFetcher",
+    glider_dfs: dict[str, pd.DataFrame],
+    *,
+    consolidated: bool,
+    errors: str,
+) -> dict | pd.DataFrame:
+    """Return the downloaded datasets, see `GliderDataFetcher.to_pandas`.
+
+    Empty datasets are left out.
+
+    :param errors: "raise" the `glider_grab.failures` in a `DownloadError`
+                   or only "record" them
+    """
+    glider_dfs = {
+        dataset_id: glider_df
+        for dataset_id, glider_df in glider_dfs.items()
+        if not glider_df.empty
+    }
+    if errors == "raise" and glider_grab.failures:
+        raise DownloadError(dict(glider_grab.failures))
+    if consolidated:
+        return consolidate(glider_dfs)
+    return glider_dfs
+
+
+def _map(
+    glider_grab: "GliderDataFetcher",
+    func: Callable,
+    *iterables: Iterable,
+) -> list:
+    """Map `func` in a thread pool when `max_workers` allows it."""
+    iterables = [list(iterable) for iterable in iterables]
+    if glider_grab.max_workers > 1 and len(iterables[0]) > 1:
+        with ThreadPoolExecutor(max_workers=glider_grab.max_workers) as pool:
+            # `map` yields in submission order, keeping the output stable.
+            return list(pool.map(func, *iterables))
+    return list(map(func, *iterables))
+
+
+def _count_rows(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+    constraints: dict,
+) -> int:
+    """Return the number of rows of a request, without downloading it."""
+    url = glider_grab.fetcher.get_download_url(
+        dataset_id=dataset_id,
+        variables=["time"],
+        response="csvp",
+        constraints=constraints,
+    )
+    try:
+        filters = [*glider_grab.filters, 'orderByCount("")']
+        data = glider_grab.urlopen(
+            "&".join([url, *filters]),
+            phase="count",
+            dataset_id=dataset_id,
+        )
+        counts = pd.read_csv(data)
+    except HTTPError as err:
+        if _no_matching_results(err):
+            return 0
+        raise
+    return int(counts.iloc[0, 0])
+
+
+def _variable_name(variable: str, rename: Mapping[str, str]) -> str:
+    """Return the standardised name of an ERDDAP variable."""
+    for column, name in rename.items():
+        if column.split(" (")[0] == variable.lower():
+            return name
+    return variable.lower()
+
+
+def _column_name(column: str, rename: Mapping[str, str]) -> str:
+    """Return the standardised name of a downloaded column."""
+    if column in rename:
+        return rename[column]
+    # Binary responses have no units in the column names.
+    if " (" not in column:
+        return _variable_name(column, rename)
+    return column
+
+
+def _column(glider_df: pd.DataFrame, name: str, size: int) -> np.ndarray:
+    """Return the values of the `name` column of a downloaded window."""
+    if len(glider_df) != size:
+        msg = (
+            f"Expected {size} rows but downloaded {len(glider_df)}, the "
+            "dataset changed since it was opened."
+        )
+        raise RuntimeError(msg)
+    if name == "time":
+        return glider_df.index.to_numpy("datetime64[ns]")
+    if name not in glider_df:
+        return np.full(size, np.nan)
+    return glider_df[name].to_numpy(float)
+
+
+def _fetch_window(  # noqa: PLR0913
+    server: str,
+    dataset_id: str,
+    variables: list[str],
+    constraints: dict,
+    *,
+    filters: list[str],
+    response: str,
+) -> pd.DataFrame:
+    """Download one time window of a lazy dataset.
+
+    Only picklable request parameters are passed, instead of the fetcher,
+    so that the chunks can be computed by other processes.
+    """
+    glider_grab = GliderDataFetcher(
+        server,
+        response=response,
+        session=_session,
+    )
+    glider_grab.fetcher.variables = variables
+    glider_grab.filters = filters
+    return _fetch_dataset(
+        glider_grab,
+        dataset_id,
+        constraints=constraints,
+        memory=False,
+    )
+
+
+def _lazy_dataset(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+    windows: list[tuple[dict, int]],
+) -> xr.Dataset:
+    """Build a Dask backed dataset with one chunk per time window."""
+    import dask  # noqa: PLC0415
+    import dask.array as da  # noqa: PLC0415
+
+    variables = list(glider_grab.fetcher.variables)
+    rename = registry.renames(glider_grab.server)
+    names = [
+        _variable_name(variable, rename)
+        for variable in variables
+        if variable != "time"
+    ]
+    glider_dfs = [
+        dask.delayed(_fetch_window, pure=True)(
+            glider_grab.server,
+            dataset_id,
+            variables,
+            constraint,
+            filters=list(glider_grab.filters),
+            response=glider_grab.response,
+        )
+        for constraint, _ in windows
+    ]
+    columns = {}
+    for name in ["time", *names]:
+        dtype = np.dtype("datetime64[ns]" if name == "time" else float)
+        chunks = [
+            da.from_delayed(
+                dask.delayed(_column, pure=True)(glider_df, name, size),
+                shape=(size,),
+                dtype=dtype,
+            )
+            for glider_df, (_, size) in zip(glider_dfs, windows, strict=True)
+        ]
+        columns[name] = (
+            da.concatenate(chunks) if chunks else da.empty(0, dtype=dtype)
+        )
+
+    sizes = [size for _, size in windows]
+    window = np.repeat(
+        [_to_utc(constraint["time>="]) for constraint, _ in windows],
+        sizes,
+    ).astype("datetime64[ns]")
+    return xr.Dataset(
+        {name: ("obs", columns[name]) for name in names},
+        coords={
+            "time": ("obs", columns["time"]),
+            "window": ("obs", window),
+            "dataset_id": ("obs", np.repeat(dataset_id, sum(sizes))),
+        },
+    )
+
+
 def _to_pandas(
     glider_grab: "GliderDataFetcher",
     *,
     query: OptionalBool = True,
 ) -> pd.DataFrame:
-    """Thin wrapper to cache results when multiple datasets are requested."""
-    df_all = {}
-    glider_grab_copy = copy(glider_grab)
+    """Thin wrapper to fetch multiple datasets into a dictionary.
+
+    Each dataset is cached individually, see `memory_cache`.
+    """
     if query:
-        dataset_ids = glider_grab_copy.datasets["Dataset ID"]
+        dataset_ids = list(glider_grab.datasets["Dataset ID"])
+    else:
+        dataset_ids = list(glider_grab.dataset_ids)
+
+    glider_dfs = _fetch_datasets(glider_grab, dataset_ids)
+    return {
+        dataset_id: glider_df
+        for dataset_id, glider_df in zip(dataset_ids, glider_dfs, strict=True)
+        if not glider_df.empty
+    }
+
+
+def _to_utc(value: OptionalDateTime) -> pd.Timestamp | None:
+    """Return `value` as a naive UTC timestamp, None if it is not a date."""
+    try:
+        timestamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        # ERDDAP relative constraints, like `now-7days`, are not parsed.
+        return None
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp
+
+
+def _time_coverage(
+    glider_grab: "GliderDataFetcher",
+    dataset_id: str,
+) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Return the time coverage start and end of a dataset."""
+    url = glider_grab.fetcher.get_info_url(
+        dataset_id=dataset_id,
+        response="csv",
+    )
+    return _coverage(
+        glider_grab.urlopen(url, phase="info", dataset_id=dataset_id),
+    )
+
+
+def _coverage(data: BinaryIO) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Return the time coverage start and end from an info response."""
+    info = pd.read_csv(data)
+    attrs = info.loc[info["Variable Name"] == "NC_GLOBAL"].set_index(
+        "Attribute Name",
+    )["Value"]
+    return (
+        _to_utc(attrs["time_coverage_start"]),
+        _to_utc(attrs["time_coverage_end"]),
+    )
+
+
+def _time_windows(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    freq: str,
+) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    """Split the `start` to `end` interval into `freq` long windows."""
+    if start > end:
+        return []
+    if start == end:
+        return [(start, end)]
+    edges = pd.date_range(start, end, freq=freq).union([start, end])
+    return list(pairwise(edges))
+
+
+def _window_constraints(
+    constraints: OptionalDict,
+    coverage: tuple[pd.Timestamp, pd.Timestamp],
+    freq: str,
+) -> list[dict]:
+    """Return the constraints of each time window of a dataset.
+
+    :param constraints: fetcher constraints, their time bounds clip the
+                        dataset time `coverage`
+    """
+    constraints = dict(constraints or {})
+    min_time = _to_utc(constraints.pop("time>=", None))
+    max_time = _to_utc(constraints.pop("time<=", None))
+    start, end = coverage
+    if min_time is not None:
+        start = max(start, min_time)
+    if max_time is not None:
+        end = min(end, max_time)
+    windows = _time_windows(start, end, freq)
+    return [
+        {
+            **constraints,
+            "time>=": left.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            # Windows are half-open except for the last one.
+            ("time<=" if num == len(windows) else "time<"): right.strftime(
+                "%Y-%m-%dT%H:%M:%SZ",
+            ),
+        }
+        for num, (left, right) in enumerate(windows, start=1)
+    ]
+
+
+def _request(
+    glider_grab: "GliderDataFetcher",
+    variables: OptionalList = None,
+    constraints: OptionalDict = None,
+    filters: OptionalList = None,
+) -> "GliderDataFetcher":
+    """Return a copy of the fetcher for a single request."""
+    glider_grab = copy(glider_grab)
+    glider_grab.fetcher = copy(glider_grab.fetcher)
+    if variables:
+        # The time is the index of the standardised dataframes.
+        glider_grab.fetcher.variables = list(
+            dict.fromkeys(["time", *variables]),
+        )
+    if constraints:
+        glider_grab.fetcher.constraints = {
+            **(glider_grab.fetcher.constraints or {}),
+            **constraints,
+        }
+    if filters:
+        glider_grab.filters = [*glider_grab.filters, *filters]
+    return glider_grab
+
+
+def _requested_dataset_ids(glider_grab: "GliderDataFetcher") -> list[str]:
+    """Return the known dataset_ids or the ones found by `query`."""
+    if glider_grab.dataset_ids is not None:
+        return list(glider_grab.dataset_ids)
+    if glider_grab.datasets is not None:
+        return list(glider_grab.datasets["Dataset ID"])
+    msg = "Must provide a dataset_id or query terms to download data."
+    raise ValueError(msg)
+
+
+def _search_terms(  # noqa: PLR0913
+    *,
+    min_lat: OptionalNum = None,
+    max_lat: OptionalNum = None,
+    min_lon: OptionalNum = None,
+    max_lon: OptionalNum = None,
+    min_time: OptionalDateTime = None,
+    max_time: OptionalDateTime = None,
+    delayed: OptionalBool = False,
+) -> tuple[dict, dict]:
+    """Return the download constraints and search terms of a query."""
+    # NB: The time constrain could be better implemented by just
+    # dropping it instead.
+    min_time = min_time or "1970-01-01"
+    max_time = max_time or "2038-01-19"
+    min_lat = min_lat or -90.0
+    max_lat = max_lat or 90.0
+    min_lon = min_lon or -180.0
+    max_lon = max_lon or 180.0
+
+    constraints = {
+        "time>=": min_time,
+        "time<=": max_time,
+        "latitude>=": min_lat,
+        "latitude<=": max_lat,
+        "longitude>=": min_lon,
+        "longitude<=": max_lon,
+    }
+    search = {
+        "min_lat": min_lat,
+        "max_lat": max_lat,
+        "min_lon": min_lon,
+        "max_lon": max_lon,
+        "min_time": min_time,
+        "max_time": max_time,
+        "delayed": delayed,
+    }
+    return constraints, search
+
+
+def _query(
+    glider_grab: "GliderDataFetcher",
+    **terms: dict,
+) -> Generator[str, BinaryIO, pd.DataFrame]:
+    """Search the datasets, see `GliderDataFetcher.query`.
+
+    The local catalog, or else `search_cache`, is looked up first. Yields
+    the search URL when the server must be searched, see `_run`.
+    """
+    glider_grab.fetcher.constraints, search = _search_terms(**terms)
+    if glider_grab.catalog is not None:
+        # The local catalog is a superset of every search.
+        datasets = glider_grab.catalog.search(**search)
     else:
-        dataset_ids = glider_grab_copy.dataset_ids
-
-    for dataset_id in dataset_ids:
-        glider_grab_copy.fetcher.dataset_id = dataset_id
-        glider_df = _call_erddapy(glider_grab_copy)
-        if glider_df.empty:
-            continue
-        dataset_url = glider_grab_copy.fetcher.get_download_url().split("?")[0]
-        glider_df = standardise_df(glider_df, dataset_url)
-        df_all.update({dataset_id: glider_df})
-    return df_all
-
-
-def standardise_df(glider_df: pd.DataFrame, dataset_url: str) -> pd.DataFrame:
-    """Standardise variable names in a dataset and add column for URL."""
-    glider_df.columns = glider_df.columns.str.lower()
-    glider_df = glider_df.set_index("time (utc)")
-    glider_df = glider_df.rename(columns=server_parameter_rename)
-    glider_df.index = pd.to_datetime(
-        glider_df.index,
-        format="%Y-%m-%dT%H:%M:%SZ",
+        key = (glider_grab.server, *map(str, search.values()))
+        datasets = search_cache.get(key)
+        glider_grab.emit(_lookup("search_cache", datasets))
+        if datasets is None:
+            url = _search_url(glider_grab, search)
+            glider_grab.query_url = url
+            try:
+                data = yield url
+            except HTTPError as err:
+                _no_datasets_found(glider_grab, err)
+                raise
+            datasets = _search_results(
+                glider_grab,
+                data,
+                delayed=search["delayed"],
+            )
+            search_cache.put(key, datasets)
+    glider_grab.datasets = datasets
+    return datasets
+
+
+def _search_url(glider_grab: "GliderDataFetcher", search: dict) -> str:
+    """Return the ERDDAP advanced search URL for glider datasets."""
+    return glider_grab.fetcher.get_search_url(
+        search_for="glider",
+        response="csv",
+        **{key: value for key, value in search.items() if key != "delayed"},
+    )
+
+
+def _search_results(
+    glider_grab: "GliderDataFetcher",
+    data: BinaryIO,
+    *,
+    delayed: bool,
+) -> pd.DataFrame:
+    """Return the datasets of a search response."""
+    cols = ["Title", "Institution", "Dataset ID"]
+    datasets = pd.read_csv(data)[cols]
+    if not delayed:
+        datasets = datasets.loc[
+            ~datasets["Dataset ID"].str.endswith("delayed")
+        ]
+        datasets["info_url"] = (
+            f"{glider_grab.server}/info/"
+            + datasets["Dataset ID"]
+            + "/index.html"
+        )
+    return datasets
+
+
+def _no_datasets_found(
+    glider_grab: "GliderDataFetcher", err: Exception
+) -> None:
+    """Add a hint to relax the constraints to a failed search error."""
+    msg = (
+        "Error, no datasets found in supplied range. "
+        f"Try relaxing the constraints: {glider_grab.fetcher.constraints}"
     )
+    err.message = f"{getattr(err, 'message', err)}\n{msg}"
+
+
+def _merge(glider_df: OptionalDF, new_df: pd.DataFrame) -> pd.DataFrame:
+    """Merge newly downloaded rows into a previously downloaded dataset."""
+    if glider_df is None:
+        return new_df
+    glider_df = pd.concat([glider_df, new_df])
+    duplicated = glider_df.reset_index().duplicated().to_numpy()
+    return glider_df.loc[~duplicated].sort_index(kind="stable")
+
+
+def standardise_df(
+    glider_df: pd.DataFrame,
+    dataset_url: str,
+    rename: Mapping[str, str] | None = None,
+) -> pd.DataFrame:
+    """Standardise variable names in a dataset and add column for URL.
+
+    The URL is stored as a categorical column, and in `df.attrs`,
+    to avoid one Python string per row.
+
+    :param rename: column renames of the server of the dataset, see
+                   `gliderpy.servers.ServerRegistry.renames`, defaults to
+                   the renames of all the servers
+    """
+    if rename is None:
+        rename = server_parameter_rename
+    columns = glider_df.columns.str.lower()
+    # Binary responses have no units in the column names.
+    time_col = "time (utc)" if "time (utc)" in columns else "time"
+    time = glider_df.iloc[:, columns.get_loc(time_col)]
+    if not pd.api.types.is_datetime64_any_dtype(time):
+        # The ISO 8601 fast path is ~3x faster than an explicit format.
+        time = pd.to_datetime(time, format="ISO8601", utc=True)
+    if time.dt.tz is not None:
+        time = time.dt.tz_convert(None)
+
+    # With copy-on-write the steps below do not copy the data.
+    glider_df = glider_df.set_axis(columns, axis="columns").drop(
+        columns=time_col,
+    )
+    glider_df.columns = [
+        _column_name(col, rename) for col in glider_df.columns
+    ]
+    glider_df.index = pd.DatetimeIndex(time, name="time (utc)")
     # We need to sort b/c of the non-sequential submission of files due to
     # the nature of glider data transmission.
-    glider_df = glider_df.sort_index()
-    glider_df["dataset_url"] = dataset_url
+    if not glider_df.index.is_monotonic_increasing:
+        glider_df = glider_df.sort_index(kind="stable")
+    glider_df["dataset_url"] = pd.Categorical.from_codes(
+        np.zeros(len(glider_df), dtype=np.int8),
+        categories=[dataset_url],
+    )
+    glider_df.attrs["dataset_url"] = dataset_url
+    return glider_df
+
+
+def consolidate(
+    glider_dfs: dict[str, pd.DataFrame],
+    *,
+    atol: float = 1e-5,
+) -> pd.DataFrame:
+    """Concatenate multiple datasets into a single compact dataframe.
+
+    The result is indexed by a categorical `dataset_id` level and the time.
+    Float columns are downcast to float32 when no value changes by more than
+    `atol`, and `profile_id` is stored as a nullable integer.
+
+    :param glider_dfs: dictionary of dataframes returned by `to_pandas`
+    :param atol: absolute tolerance for the float32 downcast
+    :return: dataframe with a (dataset_id, time (utc)) index
+    """
+    if not glider_dfs:
+        return pd.DataFrame()
+
+    glider_df = pd.concat(glider_dfs, names=["dataset_id"])
+    if "dataset_url" in glider_df:
+        # Concatenating categoricals with different categories gives
+        # object, unless they are combined explicitly.
+        glider_df["dataset_url"] = union_categoricals(
+            [
+                df["dataset_url"].astype("category")
+                for df in glider_dfs.values()
+            ],
+        )
+    glider_df.index = glider_df.index.set_levels(
+        pd.CategoricalIndex(glider_df.index.levels[0]),
+        level="dataset_id",
+    )
+    glider_df.attrs = {}
+
+    for col in glider_df.select_dtypes("float64"):
+        values = glider_df[col].to_numpy()
+        downcast = values.astype(np.float32)
+        if np.allclose(downcast, values, rtol=0, atol=atol, equal_nan=True):
+            glider_df[col] = downcast
+    if "profile_id" in glider_df:
+        glider_df["profile_id"] = glider_df["profile_id"].astype("Int64")
     return glider_df
 
 
-class GliderDataFetcher:
+class GliderDataFetcher(Instrumented):
     """Instantiate the glider fetcher.
 
     Attributes
@@ -103,29 +1104,168 @@ class GliderDataFetcher:
         A dataset unique id.
     constraints : dict
         Download constraints, defaults same as query.
+    max_workers : int
+        Number of datasets downloaded concurrently, defaults to 1.
+    cache : gliderpy.cache.DiskCache
+        Optional on-disk cache for the downloaded datasets, use a
+        `gliderpy.cache.ArrowCache` to share them between processes.
+    response : str
+        ERDDAP response format used for downloads, one of
+        `gliderpy.decoders.decoders`, defaults to csvp. Binary formats
+        fall back to csvp when unsupported.
+    catalog : gliderpy.catalog.GliderCatalog
+        Optional local catalog used by `query` instead of an ERDDAP search.
+    session : requests.Session
+        HTTP session used for all requests, defaults to a new session
+        from `make_session` with a pool of `pool_size` connections.
+    timeout : float or tuple
+        Seconds to wait for the server, or a (connect, read) tuple,
+        defaults to 60.
+    filters : list
+        ERDDAP server-side operations appended to the download URLs, e.g.
+        `'orderByMean("profile_id")'`, defaults to none.
+    rate_limiter : gliderpy.resilience.RateLimiter
+        Optional limit of the requests per second, share it between
+        fetchers to limit them all.
+    circuit_breaker : gliderpy.resilience.CircuitBreaker
+        Stops requests to a failing server, defaults to the one shared by
+        all the fetchers of the server in `circuit_breakers`.
+    attempts : int
+        Download attempts before giving up on a dataset, defaults to 3.
+    failures : dict
+        Error of each dataset that failed in the last download.
+    hooks : list
+        Callables called with each `gliderpy.instrumentation.Event`, e.g.
+        the time and size of the downloads, see `instrument`.
 
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self: "GliderDataFetcher",
         server: OptionalStr = _server,
+        *,
+        max_workers: int = 1,
+        cache: DiskCache | None = None,
+        response: str = "csvp",
+        catalog: "GliderCatalog | None" = None,
+        session: requests.Session | None = None,
+        pool_size: int | None = None,
+        timeout: float | tuple[float, float] = 60,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        attempts: int = 3,
+        hooks: Iterable[Callable[[Event], None]] = (),
     ) -> None:
-        """Instantiate main class attributes."""
+        """Instantiate main class attributes.
+
+        :param pool_size: connections kept alive per host, defaults to
+                          the larger of 10 and `max_workers`
+        """
         self.server = server
+        self.max_workers = max_workers
+        self.cache = cache
+        self.response = response
+        self.catalog = catalog
+        if session is None:
+            session = make_session(pool_size or max(10, max_workers))
+        self.session = session
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        if circuit_breaker is None:
+            circuit_breaker = circuit_breakers.setdefault(
+                server,
+                CircuitBreaker(),
+            )
+        self.circuit_breaker = circuit_breaker
+        self.attempts = attempts
+        self.failures: dict[str, Exception] = {}
+        self.hooks = list(hooks)
         self.fetcher = ERDDAP(
             server=server,
             protocol="tabledap",
         )
         self.fetcher.variables = server_vars[server]
+        self.filters: list[str] = []
         self.dataset_ids: OptionalList = None
         self.datasets: OptionalDF = None
+        self._refreshed: dict[str, pd.DataFrame] = {}
 
-    def to_pandas(self: "GliderDataFetcher") -> pd.DataFrame:
+    def urlopen(
+        self: "GliderDataFetcher",
+        url: str,
+        *,
+        phase: str = "request",
+        dataset_id: OptionalStr = None,
+    ) -> BinaryIO:
+        """Return the content of `url` using the fetcher session.
+
+        Requests wait for the rate limiter and fail fast, with
+        `CircuitOpenError`, while the server circuit is open.
+
+        :param phase: event name reported to the hooks with the request
+                      time and response size
+        :param dataset_id: dataset requested, if any, for the hooks
+        """
+        time.sleep(_before_request(self, dataset_id))
+        start = time.perf_counter()
+        try:
+            data = urlopen(url, session=self.session, timeout=self.timeout)
+        except RequestException as err:
+            _request_failed(self, err)
+            raise
+        return _received(
+            self,
+            data,
+            phase=phase,
+            dataset_id=dataset_id,
+            start=start,
+        )
+
+    def to_pandas(
+        self: "GliderDataFetcher",
+        *,
+        consolidated: bool = False,
+        variables: OptionalList = None,
+        constraints: OptionalDict = None,
+        filters: OptionalList = None,
+        errors: str = "record",
+    ) -> pd.DataFrame:
         """Return data from the server as a pandas dataframe.
 
+        The variables, constraints and filters only apply to this call and
+        are sent to the server, only the requested data is downloaded.
+
+        Datasets that fail to download, after the retries, are left out and
+        their errors are stored in `failures`. Use `errors="raise"` to raise
+        a `DownloadError` instead.
+
+        >>> glider_grab.to_pandas(
+        ...     variables=["latitude", "longitude"],
+        ...     constraints={"pressure<=": 5},
+        ...     filters=['orderByMean("profile_id")'],
+        ... )  # doctest: +SKIP
+
+        :param consolidated: return a single compact dataframe for all the
+                             datasets instead, see `consolidate`
+        :param variables: subset of variables to download, time is always
+                          included
+        :param constraints: extra constraints, e.g. `{"pressure<=": 10}`
+        :param filters: extra ERDDAP server-side operations, like
+                        `orderByClosest` or `orderByMean`
+        :param errors: "record" or "raise" the download failures
         :return: pandas a dataframe with datetime UTC as index,
                  multiple dataset_ids dataframes are stored in a dictionary
         """
+        if variables or constraints or filters:
+            glider_grab = _request(self, variables, constraints, filters)
+            try:
+                return glider_grab.to_pandas(
+                    consolidated=consolidated,
+                    errors=errors,
+                )
+            finally:
+                self.failures = glider_grab.failures
+
         if self.dataset_ids is not None:
             query = False  # Passing known dataset_ids
         elif self.dataset_ids is None and self.datasets is not None:
@@ -134,12 +1274,236 @@ class GliderDataFetcher:
             msg = "Must provide a dataset_id or query terms to download data."
             raise ValueError(msg)
 
+        self.failures = {}
         glider_df = _to_pandas(self, query=query)
         # We need to reset to avoid fetching a single dataset_id when
         # making multiple requests.
         self.fetcher.dataset_id = None
+        return _results(
+            self,
+            glider_df,
+            consolidated=consolidated,
+            errors=errors,
+        )
 
-        return glider_df
+    def iter_chunks(
+        self: "GliderDataFetcher",
+        freq: str = "7D",
+        **request: dict,
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        """Yield data from the server one time window at a time.
+
+        Each dataset time coverage, clipped by the `time>=` and `time<=`
+        constraints, is split into `freq` long windows that are downloaded
+        and standardised separately. Only one window is held in memory,
+        the windows are not kept in `memory_cache`.
+
+        :param freq: pandas frequency string for the time windows
+        :param request: variables, constraints and filters for this call,
+                        see `to_pandas`
+        :return: iterator of (dataset_id, dataframe) tuples
+        """
+        if request:
+            yield from _request(self, **request).iter_chunks(freq)
+            return
+
+        for dataset_id in _requested_dataset_ids(self):
+            for constraint in self._window_constraints(dataset_id, freq):
+                glider_df = _fetch_dataset(
+                    self,
+                    dataset_id,
+                    constraints=constraint,
+                    memory=False,
+                )
+                if not glider_df.empty:
+                    yield dataset_id, glider_df
+
+    def _window_constraints(
+        self: "GliderDataFetcher",
+        dataset_id: str,
+        freq: str,
+    ) -> list[dict]:
+        """Return the constraints of each time window of `dataset_id`."""
+        return _window_constraints(
+            self.fetcher.constraints,
+            _time_coverage(self, dataset_id),
+            freq,
+        )
+
+    def to_xarray(
+        self: "GliderDataFetcher",
+        *,
+        lazy: bool = True,
+        freq: str = "7D",
+        **request: dict,
+    ) -> xr.Dataset:
+        """Return data from the server as a Dask backed xarray Dataset.
+
+        Each dataset is split into `freq` long time windows, like in
+        `iter_chunks`, and each window becomes one Dask chunk. Only the
+        number of rows per window is requested upfront, the data is
+        downloaded when the chunks are computed. Multiple datasets are
+        concatenated along the `obs` dimension with a `dataset_id`
+        coordinate. The `window` coordinate holds the start of the time
+        window of each row and can select a time range without loading
+        the lazy `time` coordinate, e.g.
+
+        >>> start = np.datetime64("2016-09-10")
+        >>> ds.isel(obs=ds["window"] >= start)  # doctest: +SKIP
+
+        The chunks are downloaded with the server, variables, constraints,
+        filters and response format of the fetcher, without its cache, hooks
+        or rate limiter, so that they can be computed by other processes.
+        Requires `dask`.
+
+        :param lazy: return Dask arrays, otherwise load all the data
+        :param freq: pandas frequency string for the time windows
+        :param request: variables, constraints and filters for this call,
+                        see `to_pandas`
+        :return: dataset with one `obs` dimension
+        """
+        if request:
+            return _request(self, **request).to_xarray(lazy=lazy, freq=freq)
+
+        dataset_ids = _requested_dataset_ids(self)
+        windows = [
+            (dataset_id, constraint)
+            for dataset_id in dataset_ids
+            for constraint in self._window_constraints(dataset_id, freq)
+        ]
+        if not windows:
+            # The time constraints are outside of the datasets coverage.
+            return xr.Dataset()
+        counts = _map(self, _count_rows, *zip(*windows, strict=True))
+        datasets = [
+            _lazy_dataset(
+                self,
+                dataset_id,
+                [
+                    (constraint, count)
+                    for (ds_id, constraint), count in zip(
+                        windows,
+                        counts,
+                        strict=True,
+                    )
+                    if ds_id == dataset_id and count
+                ],
+            )
+            for dataset_id in dataset_ids
+        ]
+        ds = xr.concat(datasets, dim="obs") if datasets else xr.Dataset()
+        return ds if lazy else ds.compute()
+
+    def to_parquet(
+        self: "GliderDataFetcher",
+        path: str | os.PathLike,
+        *,
+        freq: OptionalStr = None,
+        row_group_size: int = 65_536,
+        **request: dict,
+    ) -> None:
+        """Download data into a Parquet dataset partitioned by month.
+
+        The datasets are written by `gliderpy.lake.write_lake`, replacing
+        the ones downloaded before, and can be queried without loading them
+        whole with `gliderpy.lake.read_lake`. Requires `pyarrow`.
+
+        :param path: directory of the dataset
+        :param freq: download one `freq` long time window at a time, like
+                     `iter_chunks`, defaults to whole datasets
+        :param row_group_size: maximum number of rows of the row groups
+        :param request: variables, constraints and filters for this call,
+                        see `to_pandas`
+        """
+        from gliderpy.lake import write_lake  # noqa: PLC0415
+
+        if freq is None:
+            glider_dfs = self.to_pandas(**request)
+        else:
+            glider_dfs = self.iter_chunks(freq, **request)
+        write_lake(glider_dfs, path, row_group_size=row_group_size)
+
+    def refresh(self: "GliderDataFetcher") -> dict:
+        """Return data from the server, downloading only new observations.
+
+        The first call downloads the full datasets. Later calls request only
+        data newer than the last time seen for each dataset_id and merge it
+        into the previous result. Data transmitted late, with times before
+        that watermark, is only picked up by a full `to_pandas` download.
+
+        :return: dictionary of dataframes with datetime UTC as index
+        """
+        dataset_ids = _requested_dataset_ids(self)
+
+        self._load_refreshed(dataset_ids)
+        watermarks = self.watermarks
+        constraints = []
+        for dataset_id in dataset_ids:
+            constraint = dict(self.fetcher.constraints or {})
+            if dataset_id in watermarks:
+                watermark = watermarks[dataset_id]
+                constraint["time>"] = watermark.strftime("%Y-%m-%dT%H:%M:%SZ")
+            constraints.append(constraint)
+
+        # The deltas are never cached, only the merged result is, under
+        # the key of a full download so that `to_pandas` returns it.
+        self.failures = {}
+        glider_grab = copy(self)
+        glider_grab.cache = None
+        glider_dfs = _fetch_datasets(
+            glider_grab,
+            dataset_ids,
+            constraints,
+            memory=False,
+        )
+
+        for dataset_id, new_df in zip(dataset_ids, glider_dfs, strict=True):
+            if new_df.empty:
+                continue
+            glider_df = _merge(self._refreshed.get(dataset_id), new_df)
+            key = self._cache_key(dataset_id)
+            if self.cache is not None:
+                glider_df = self.cache.put(key, glider_df)
+            memory_cache.put(key, glider_df)
+            self._refreshed[dataset_id] = glider_df
+
+        return {
+            dataset_id: self._refreshed[dataset_id]
+            for dataset_id in dataset_ids
+            if dataset_id in self._refreshed
+        }
+
+    def _load_refreshed(self: "GliderDataFetcher", dataset_ids: list) -> None:
+        """Seed datasets not refreshed yet from the disk cache, if any.
+
+        This allows a new process to resume where the last one stopped.
+        """
+        if self.cache is None:
+            return
+        for dataset_id in dataset_ids:
+            if dataset_id in self._refreshed:
+                continue
+            glider_df = self.cache.get(self._cache_key(dataset_id))
+            if glider_df is not None:
+                self._refreshed[dataset_id] = glider_df
+
+    @property
+    def watermarks(self: "GliderDataFetcher") -> dict:
+        """Return the last time seen for each refreshed dataset_id."""
+        return {
+            dataset_id: glider_df.index.max()
+            for dataset_id, glider_df in self._refreshed.items()
+        }
+
+    def _cache_key(self: "GliderDataFetcher", dataset_id: str) -> str:
+        """Return the cache key of a full `dataset_id` download."""
+        return cache_key(
+            self.server,
+            dataset_id,
+            self.fetcher.variables,
+            self.fetcher.constraints,
+            self.filters,
+        )
 
     def query(  # noqa: PLR0913
         self: "GliderDataFetcher",
@@ -162,58 +1526,14 @@ class GliderDataFetcher:
         :param max_time: end time, can be datetime object or string
         :return: search query with argument constraints applied
         """
-        # NB: The time constrain could be better implemented by just
-        # dropping it instead.
-        min_time = min_time or "1970-01-01"
-        max_time = max_time or "2038-01-19"
-        min_lat = min_lat or -90.0
-        max_lat = max_lat or 90.0
-        min_lon = min_lon or -180.0
-        max_lon = max_lon or 180.0
-
-        self.fetcher.constraints = {
-            "time>=": min_time,
-            "time<=": max_time,
-            "latitude>=": min_lat,
-            "latitude<=": max_lat,
-            "longitude>=": min_lon,
-            "longitude<=": max_lon,
-        }
-        if self.datasets is None:
-            url = self.fetcher.get_search_url(
-                search_for="glider",
-                response="csv",
-                min_lat=min_lat,
-                max_lat=max_lat,
-                min_lon=min_lon,
-                max_lon=max_lon,
-                min_time=min_time,
-                max_time=max_time,
-            )
-            self.query_url = url
-            try:
-                data = urlopen(url)
-            except HTTPError as err:
-                msg = (
-                    "Error, no datasets found in supplied range. "
-                    f"Try relaxing the constraints: {self.fetcher.constraints}"
-                )
-                err.message = f"{err.message}\n{msg}"
-                raise
-
-            cols = ["Title", "Institution", "Dataset ID"]
-            datasets = pd.read_csv(data)[cols]
-            if not delayed:
-                datasets = datasets.loc[
-                    ~datasets["Dataset ID"].str.endswith("delayed")
-                ]
-                info_urls = [
-                    self.fetcher.get_info_url(
-                        dataset_id=dataset_id,
-                        response="html",
-                    )
-                    for dataset_id in datasets["Dataset ID"]
-                ]
-                datasets["info_url"] = info_urls
-            self.datasets = datasets
-        return self.datasets
+        steps = _query(
+            self,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lon=min_lon,
+            max_lon=max_lon,
+            min_time=min_time,
+            max_time=max_time,
+            delayed=delayed,
+        )
+        return _run(steps, lambda url: self.urlopen(url, phase="search"))
@@ -0,0 +1,229 @@
+"""Timings and counters of the requests made by the fetchers."""
+
+import contextlib
+import threading
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import pandas as pd
+
+# Caches whose hits and misses are reported, see `FetchReport`.
+_caches = ("search_cache", "memory_cache", "disk_cache")
+
+
+class Event(NamedTuple):
+    """A timed phase, or a counted occurrence, of a fetch.
+
+    The phases are `search`, `info`, `count` and `download` for the
+    requests, whose `nbytes` are the response sizes, then `decode` and
+    `standardise`. `rate_limit` and `retry` are the seconds waited before
+    a request and `<cache>_hit` or `<cache>_miss` count the cache lookups.
+    """
+
+    name: str
+    server: str
+    dataset_id: str | None = None
+    seconds: float = 0.0
+    nbytes: int = 0
+
+
+class FetchReport:
+    """Collect the events of a fetcher into a per-run report.
+
+    Use it as a hook, e.g. with `GliderDataFetcher.instrument`, and then
+    `to_pandas` for the totals per dataset and phase or `summary` for a
+    flat dictionary to send to a monitoring system.
+
+    Attributes
+    ----------
+    events : list
+        Events received, in order.
+    elapsed : float
+        Seconds between the first and last events, or the duration of the
+        `GliderDataFetcher.instrument` block.
+
+    """
+
+    def __init__(self: "FetchReport") -> None:
+        """Instantiate an empty report."""
+        self.events: list[Event] = []
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __call__(self: "FetchReport", event: Event) -> None:
+        """Record `event`, the hooks are called from the download threads."""
+        with self._lock:
+            self.events.append(event)
+            self.elapsed = time.perf_counter() - self._start
+
+    def to_pandas(self: "FetchReport") -> pd.DataFrame:
+        """Return the number of events, seconds and bytes of each phase.
+
+        :return: dataframe with a (dataset_id, name) index, events not tied
+                 to a dataset, like searches, have an empty dataset_id
+        """
+        with self._lock:
+            events = pd.DataFrame(self.events, columns=Event._fields)
+        events["dataset_id"] = events["dataset_id"].fillna("")
+        return (
+            events.groupby(["dataset_id", "name"])
+            .agg(
+                count=("name", "size"),
+                seconds=("seconds", "sum"),
+                nbytes=("nbytes", "sum"),
+            )
+            .astype({"count": int, "nbytes": int})
+        )
+
+    def cache_hit_rates(self: "FetchReport") -> dict[str, float]:
+        """Return the fraction of the lookups of each cache that hit."""
+        with self._lock:
+            names = [event.name for event in self.events]
+        rates = {}
+        for cache in _caches:
+            hits = names.count(f"{cache}_hit")
+            lookups = hits + names.count(f"{cache}_miss")
+            if lookups:
+                rates[cache] = hits / lookups
+        return rates
+
+    def summary(self: "FetchReport") -> dict:
+        """Return the run totals as a flat dictionary.
+
+        :return: elapsed seconds, number of datasets, retries, bytes, the
+                 seconds spent in each phase and the cache hit rates
+        """
+        with self._lock:
+            events = list(self.events)
+        seconds: dict[str, float] = {}
+        for event in events:
+            if event.seconds:
+                seconds[event.name] = (
+                    seconds.get(event.name, 0.0) + event.seconds
+                )
+        return {
+            "elapsed": self.elapsed,
+            "datasets": len(
+                {event.dataset_id for event in events if event.dataset_id},
+            ),
+            "retries": sum(event.name == "retry" for event in events),
+            "nbytes": sum(event.nbytes for event in events),
+            **{f"seconds.{name}": total for name, total in seconds.items()},
+            **{
+                f"hit_rate.{cache}": rate
+                for cache, rate in self.cache_hit_rates().items()
+            },
+        }
+
+
+class OpenTelemetryExporter:
+    """Record the events as OpenTelemetry metrics.
+
+    Phase durations go to the `gliderpy.fetch.duration` histogram,
+    response sizes to the `gliderpy.fetch.bytes` counter and every event
+    is counted in `gliderpy.fetch.events`, all with the event name, server
+    and dataset_id attributes. Requires `opentelemetry-api`, the metrics
+    are exported by the SDK configured in the application.
+
+    Attributes
+    ----------
+    attributes : dict
+        Extra attributes added to every measurement, e.g. the job name.
+
+    """
+
+    def __init__(
+        self: "OpenTelemetryExporter",
+        meter: object | None = None,
+        attributes: dict | None = None,
+    ) -> None:
+        """Create the instruments.
+
+        :param meter: OpenTelemetry meter, defaults to the `gliderpy` meter
+                      of the global meter provider
+        """
+        if meter is None:
+            from opentelemetry import metrics  # noqa: PLC0415
+
+            meter = metrics.get_meter("gliderpy")
+        self.attributes = dict(attributes or {})
+        self._duration = meter.create_histogram(
+            "gliderpy.fetch.duration",
+            unit="s",
+            description="Duration of the fetch phases.",
+        )
+        self._bytes = meter.create_counter(
+            "gliderpy.fetch.bytes",
+            unit="By",
+            description="Size of the responses downloaded.",
+        )
+        self._events = meter.create_counter(
+            "gliderpy.fetch.events",
+            description="Requests, retries and cache lookups.",
+        )
+
+    def __call__(self: "OpenTelemetryExporter", event: Event) -> None:
+        """Record `event`."""
+        attributes = {
+            **self.attributes,
+            "gliderpy.event": event.name,
+            "gliderpy.server": event.server,
+        }
+        if event.dataset_id is not None:
+            attributes["gliderpy.dataset_id"] = event.dataset_id
+        self._events.add(1, attributes)
+        if event.seconds:
+            self._duration.record(event.seconds, attributes)
+        if event.nbytes:
+            self._bytes.add(event.nbytes, attributes)
+
+
+class Instrumented:
+    """Report the events of a fetcher to its `hooks`.
+
+    Attributes
+    ----------
+    server : str
+        ERDDAP server URL, added to the events.
+    hooks : list
+        Callables called with each `Event`.
+
+    """
+
+    server: str
+    hooks: list
+
+    def emit(
+        self: "Instrumented",
+        name: str,
+        dataset_id: str | None = None,
+        seconds: float = 0.0,
+        nbytes: int = 0,
+    ) -> None:
+        """Call the hooks with an event."""
+        if not self.hooks:
+            return
+        event = Event(name, self.server, dataset_id, seconds, nbytes)
+        for hook in self.hooks:
+            hook(event)
+
+    @contextlib.contextmanager
+    def instrument(self: "Instrumented") -> Iterator[FetchReport]:
+        """Report the requests made inside a `with` block.
+
+        >>> with glider_grab.instrument() as report:  # doctest: +SKIP
+        ...     glider_grab.to_pandas()
+        >>> report.to_pandas()  # doctest: +SKIP
+
+        :return: report of the events, see `FetchReport`
+        """
+        report = FetchReport()
+        self.hooks.append(report)
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            self.hooks.remove(report)
+            report.elapsed = time.perf_counter() - start
@@ -0,0 +1,260 @@
+"""Partitioned Parquet datasets of downloaded glider data."""
+
+import datetime
+import os
+import shutil
+import uuid
+from collections.abc import Iterable
+from numbers import Number
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from gliderpy.fetchers import _to_utc, consolidate
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+OptionalNum = Number | None
+OptionalDateTime = datetime.datetime | str | None
+
+# Index of the standardised dataframes, stored as a column.
+_time = "time (utc)"
+
+
+def _partitioning() -> "ds.Partitioning":
+    """Return the `dataset_id=.../year=.../month=...` partitioning."""
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    return ds.partitioning(
+        pa.schema(
+            [
+                ("dataset_id", pa.string()),
+                ("year", pa.int16()),
+                ("month", pa.int8()),
+            ],
+        ),
+        flavor="hive",
+    )
+
+
+def _to_table(dataset_id: str, glider_df: pd.DataFrame) -> "pa.Table":
+    """Return a standardised dataframe as a table with partition columns."""
+    import pyarrow as pa  # noqa: PLC0415
+
+    glider_df = glider_df.reset_index()
+    time = glider_df[_time]
+    glider_df["dataset_id"] = dataset_id
+    glider_df["year"] = time.dt.year.astype("int16")
+    glider_df["month"] = time.dt.month.astype("int8")
+    return pa.Table.from_pandas(glider_df, preserve_index=False)
+
+
+def write_lake(
+    glider_dfs: dict[str, pd.DataFrame] | Iterable[tuple[str, pd.DataFrame]],
+    path: str | os.PathLike,
+    *,
+    row_group_size: int = 65_536,
+) -> None:
+    """Write standardised datasets into a partitioned Parquet dataset.
+
+    The data is partitioned by dataset_id, year and month. The rows keep
+    their time order so that the statistics of each row group, like the
+    time, latitude and longitude ranges, are narrow and `read_lake` skips
+    the row groups outside of a query. Datasets written before are
+    replaced. Requires `pyarrow`.
+
+    >>> write_lake(glider_grab.iter_chunks(), "lake")  # doctest: +SKIP
+
+    :param glider_dfs: dictionary of dataframes returned by `to_pandas`,
+        or (dataset_id, dataframe) chunks from `iter_chunks`
+    :param path: directory of the dataset
+    :param row_group_size: maximum number of rows of the row groups
+    """
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    path = Path(path).expanduser()
+    if isinstance(glider_dfs, dict):
+        glider_dfs = glider_dfs.items()
+    written = set()
+    for dataset_id, glider_df in glider_dfs:
+        if dataset_id not in written:
+            shutil.rmtree(
+                path.joinpath(f"dataset_id={dataset_id}"),
+                ignore_errors=True,
+            )
+            written.add(dataset_id)
+        if glider_df.empty:
+            continue
+        ds.write_dataset(
+            _to_table(dataset_id, glider_df),
+            path,
+            format="parquet",
+            partitioning=_partitioning(),
+            # Chunks of the same month are written to new files.
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=row_group_size,
+            min_rows_per_group=min(row_group_size, len(glider_df)),
+        )
+
+
+def _months_after(timestamp: pd.Timestamp) -> "ds.Expression":
+    """Select the partitions of the month of `timestamp` and later."""
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    year, month = ds.field("year"), ds.field("month")
+    return (year > timestamp.year) | (
+        (year == timestamp.year) & (month >= timestamp.month)
+    )
+
+
+def _months_before(timestamp: pd.Timestamp) -> "ds.Expression":
+    """Select the partitions of the month of `timestamp` and earlier."""
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    year, month = ds.field("year"), ds.field("month")
+    return (year < timestamp.year) | (
+        (year == timestamp.year) & (month <= timestamp.month)
+    )
+
+
+def _filter(  # noqa: PLR0913
+    *,
+    dataset_ids: list[str] | None = None,
+    min_lat: OptionalNum = None,
+    max_lat: OptionalNum = None,
+    min_lon: OptionalNum = None,
+    max_lon: OptionalNum = None,
+    min_time: OptionalDateTime = None,
+    max_time: OptionalDateTime = None,
+) -> "ds.Expression | None":
+    """Return the filter of a query, None to read everything."""
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    conditions = []
+    if dataset_ids is not None:
+        conditions.append(ds.field("dataset_id").isin(list(dataset_ids)))
+    # The partitions are pruned by the year and month, the row groups by
+    # the statistics of the columns.
+    if min_time is not None:
+        min_time = _to_utc(min_time)
+        conditions.append(_months_after(min_time))
+        conditions.append(ds.field(_time) >= min_time.to_datetime64())
+    if max_time is not None:
+        max_time = _to_utc(max_time)
+        conditions.append(_months_before(max_time))
+        conditions.append(ds.field(_time) <= max_time.to_datetime64())
+    if min_lat is not None:
+        conditions.append(ds.field("latitude") >= min_lat)
+    if max_lat is not None:
+        conditions.append(ds.field("latitude") <= max_lat)
+    if min_lon is not None:
+        conditions.append(ds.field("longitude") >= min_lon)
+    if max_lon is not None:
+        conditions.append(ds.field("longitude") <= max_lon)
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression &= condition
+    return expression
+
+
+def read_lake(  # noqa: PLR0913
+    path: str | os.PathLike,
+    *,
+    dataset_ids: list[str] | None = None,
+    variables: list[str] | None = None,
+    min_lat: OptionalNum = None,
+    max_lat: OptionalNum = None,
+    min_lon: OptionalNum = None,
+    max_lon: OptionalNum = None,
+    min_time: OptionalDateTime = None,
+    max_time: OptionalDateTime = None,
+    consolidated: bool = False,
+) -> dict | pd.DataFrame:
+    """Read the data matching a query from a `write_lake` dataset.
+
+    Only the partitions, and the row groups, whose time and position
+    ranges overlap the query are read. Positions are checked row by row,
+    rows without a position are left out of a bounding box query.
+    Requires `pyarrow`.
+
+    :param dataset_ids: datasets to read, defaults to all
+    :param variables: columns to read, defaults to all, the time is always
+                      included
+    :param consolidated: return a single compact dataframe for all the
+                         datasets instead, see `consolidate`
+    :return: dictionary of dataframes with datetime UTC as index, like
+             `GliderDataFetcher.to_pandas`
+    """
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    partitioning = _partitioning()
+    dataset = ds.dataset(
+        Path(path).expanduser(),
+        format="parquet",
+        partitioning=partitioning,
+    )
+    expression = _filter(
+        dataset_ids=dataset_ids,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lon=min_lon,
+        max_lon=max_lon,
+        min_time=min_time,
+        max_time=max_time,
+    )
+    fragments = list(dataset.get_fragments(filter=expression))
+    glider_dfs = {}
+    if fragments:
+        # Datasets may have different columns, or integer and float types
+        # for the same column.
+        schema = pa.unify_schemas(
+            [
+                *(fragment.physical_schema for fragment in fragments),
+                partitioning.schema,
+            ],
+            promote_options="permissive",
+        ).remove_metadata()
+        columns = None
+        if variables is not None:
+            columns = [
+                col
+                for col in ["dataset_id", _time, *variables]
+                if col in schema.names
+            ]
+        table = ds.FileSystemDataset(
+            fragments,
+            schema,
+            dataset.format,
+            dataset.filesystem,
+        ).to_table(columns=columns, filter=expression)
+        glider_df = table.to_pandas().drop(
+            columns=["year", "month"],
+            errors="ignore",
+        )
+        for dataset_id, df in glider_df.groupby("dataset_id"):
+            glider_dfs[dataset_id] = _restore(df)
+    if consolidated:
+        return consolidate(glider_dfs)
+    return glider_dfs
+
+
+def _restore(glider_df: pd.DataFrame) -> pd.DataFrame:
+    """Return the rows of a dataset as a standardised dataframe."""
+    glider_df = glider_df.drop(columns="dataset_id").set_index(_time)
+    # Later months may be read first.
+    if not glider_df.index.is_monotonic_increasing:
+        glider_df = glider_df.sort_index(kind="stable")
+    if "dataset_url" in glider_df:
+        urls = glider_df["dataset_url"].astype("category")
+        glider_df["dataset_url"] = urls.cat.remove_unused_categories()
+        if len(glider_df["dataset_url"].cat.categories) == 1:
+            glider_df.attrs["dataset_url"] = urls.iloc[0]
+    return glider_df
@@ -0,0 +1,173 @@
+"""Process the downloaded deployments in parallel processes."""
+
+import contextlib
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from gliderpy.cache import map_arrow, write_arrow
+
+# Linux shared memory, files written there are never flushed to disk.
+_SHARED_MEMORY = Path("/dev/shm")  # noqa: S108
+
+
+class Pipeline:
+    """Steps applied, in order, to a deployment dataframe.
+
+    Each step takes the output of the previous one, e.g. the dataframe
+    with derived variables, and the last step may return anything, e.g.
+    the gridded profiles. The steps are sent to other processes and must
+    be picklable: module level functions or `functools.partial` of them,
+    not lambdas.
+
+    >>> pipeline = Pipeline(
+    ...     with_ts_variables,
+    ...     functools.partial(to_grid, pressure_bins=5),
+    ... )  # doctest: +SKIP
+
+    Attributes
+    ----------
+    steps : tuple
+        Callables of the pipeline.
+
+    """
+
+    def __init__(self: "Pipeline", *steps: Callable) -> None:
+        """Instantiate the pipeline of `steps`."""
+        self.steps = steps
+
+    def __call__(self: "Pipeline", df: pd.DataFrame) -> object:
+        """Apply the steps to `df`."""
+        for step in self.steps:
+            df = step(df)
+        return df
+
+
+class _ArrowResult(NamedTuple):
+    """Dataframe returned by a worker in an Arrow IPC file."""
+
+    fname: str
+
+
+def _shared_dir(nbytes: int) -> str | None:
+    """Return the directory of the transferred frames.
+
+    Shared memory is used only when it can hold `nbytes`, e.g. Docker
+    limits `/dev/shm` to 64 MB, otherwise the temporary directory is.
+    """
+    if not (_SHARED_MEMORY.is_dir() and os.access(_SHARED_MEMORY, os.W_OK)):
+        return None
+    if shutil.disk_usage(_SHARED_MEMORY).free < nbytes:
+        return None
+    return str(_SHARED_MEMORY)
+
+
+def _apply(func: Callable, fname: str, result: str) -> object:
+    """Apply `func` to a mapped deployment in a worker process."""
+    output = func(map_arrow(fname))
+    if isinstance(output, pd.DataFrame):
+        write_arrow(output, result)
+        return _ArrowResult(result)
+    return output
+
+
+def _result(future: Future, fname: Path) -> object:
+    """Return the output of a worker and remove its files.
+
+    Dataframes are read from memory.
+    """
+    try:
+        output = future.result()
+        if isinstance(output, _ArrowResult):
+            return map_arrow(output.fname).copy()
+        return output
+    finally:
+        for path in (fname, fname.with_suffix(".out.arrow")):
+            # Files still mapped cannot be removed on Windows.
+            with contextlib.suppress(PermissionError):
+                path.unlink(missing_ok=True)
+
+
+def map_deployments(
+    func: Callable,
+    glider_dfs: dict[str, pd.DataFrame],
+    *,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> dict:
+    """Apply `func` to each deployment in a pool of processes.
+
+    The dataframes are exchanged with the workers as Arrow IPC files in
+    shared memory, `/dev/shm` where available, instead of being pickled
+    through pipes. Workers map their deployment without copying it and
+    dataframes returned by `func` are copied once out of shared memory.
+    Other results, like `xarray` datasets, are pickled. Requires `pyarrow`.
+
+    About `max_workers` deployments are in flight at a time and their
+    files are removed once their results are read, so shared memory only
+    holds a few deployments. The temporary directory is used instead when
+    there is not enough free shared memory.
+
+    >>> gridded = map_deployments(
+    ...     Pipeline(
+    ...         with_ts_variables,
+    ...         functools.partial(to_grid, pressure_bins=5),
+    ...     ),
+    ...     glider_grab.to_pandas(),
+    ... )  # doctest: +SKIP
+
+    :param func: picklable callable taking a deployment dataframe, e.g. a
+        `Pipeline`
+    :param glider_dfs: dictionary of dataframes returned by `to_pandas`
+    :param max_workers: number of processes, defaults to the number of
+        CPUs
+    :param executor: process pool to use instead of creating one, it is
+        left open
+    :return: dictionary of the outputs of `func` by dataset_id, in the
+        order of `glider_dfs`
+    """
+    in_flight = max_workers or os.cpu_count() or 1
+    largest = max(
+        (df.memory_usage().sum() for df in glider_dfs.values()),
+        default=0,
+    )
+    # Each deployment in flight has an input and, at most, an output file.
+    nbytes = 2 * in_flight * int(largest)
+    with tempfile.TemporaryDirectory(
+        prefix="gliderpy-",
+        dir=_shared_dir(nbytes),
+        # Files still mapped cannot be removed on Windows.
+        ignore_cleanup_errors=True,
+    ) as tmp:
+        pool = executor or ProcessPoolExecutor(max_workers)
+        try:
+            results = {}
+            pending = deque()
+            # The workers start while the next deployments are written.
+            for num, (dataset_id, df) in enumerate(glider_dfs.items()):
+                if len(pending) >= in_flight:
+                    done_id, future, done_fname = pending.popleft()
+                    results[done_id] = _result(future, done_fname)
+                fname = Path(tmp, f"{num}.arrow")
+                write_arrow(df, fname)
+                future = pool.submit(
+                    _apply,
+                    func,
+                    str(fname),
+                    str(fname.with_suffix(".out.arrow")),
+                )
+                pending.append((dataset_id, future, fname))
+            while pending:
+                done_id, future, done_fname = pending.popleft()
+                results[done_id] = _result(future, done_fname)
+            return results
+        finally:
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING
+
+import pandas as pd
 
 try:
     import matplotlib.dates as mdates
@@ -33,21 +34,35 @@ except ModuleNotFoundError:
     )
 
 
-if TYPE_CHECKING:
-    import pandas as pd
-
 from pandas_flavor import register_dataframe_method
 
+from gliderpy.derived import ts_variables
+from gliderpy.profiles import profile_index
+
+# Above this number of samples the plots are binned or thinned by default.
+points_budget = 200_000
+
+
+def _thin(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Keep every n-th sample so that at most `max_points` are left."""
+    step = -(-len(df) // max_points)  # Ceiling division.
+    return df.iloc[::step] if step > 1 else df
+
 
 @register_dataframe_method
 def plot_track(
     df: pd.DataFrame,
     ax: plt.Axes = None,
+    *,
+    max_points: int | None = None,
 ) -> tuple[plt.Figure, plt.Axes]:
     """Plot a track of glider path coloured by temperature.
 
+    :param max_points: thin the track along the path to at most this
+        number of samples (default: `gliderpy.plotting.points_budget`)
     :return: figures, axes
     """
+    df = _thin(df, max_points or points_budget)
     x = df["longitude"]
     y = df["latitude"]
     dx, dy = 2, 4
@@ -70,20 +85,89 @@ def plot_track(
     return fig, ax
 
 
+def bin_transect(
+    df: pd.DataFrame,
+    var: str,
+    resolution: tuple[int, int] = (1000, 100),
+    statistic: str = "mean",
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aggregate `var` on a regular time by pressure grid.
+
+    :param var: variable to aggregate
+    :param resolution: number of time and pressure bins
+    :param statistic: "mean" or "median" of the samples in each cell
+    :return: time edges, pressure edges and the (pressure, time) grid with
+        NaN in empty cells
+    """
+    ntime, npressure = resolution
+    time = df.index.to_numpy("datetime64[ns]").view("int64")
+    pressure = df["pressure"].to_numpy(float)
+    values = df[var].to_numpy(float)
+    valid = ~(np.isnan(pressure) | np.isnan(values))
+    time, pressure, values = time[valid], pressure[valid], values[valid]
+
+    time_edges = np.linspace(time.min(), time.max(), ntime + 1)
+    pressure_edges = np.linspace(pressure.min(), pressure.max(), npressure + 1)
+    # The last edge is closed, like in `numpy.histogram`.
+    col = np.clip(np.searchsorted(time_edges, time, "right") - 1, 0, ntime - 1)
+    row = np.clip(
+        np.searchsorted(pressure_edges, pressure, "right") - 1,
+        0,
+        npressure - 1,
+    )
+    cell = row * ntime + col
+
+    size = ntime * npressure
+    if statistic == "mean":
+        count = np.bincount(cell, minlength=size)
+        total = np.bincount(cell, weights=values, minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid = total / count
+    elif statistic == "median":
+        grid = np.full(size, np.nan)
+        medians = pd.Series(values).groupby(cell).median()
+        grid[medians.index] = medians.to_numpy()
+    else:
+        msg = f"statistic must be 'mean' or 'median', got {statistic!r}."
+        raise ValueError(msg)
+
+    return (
+        time_edges.astype("int64").astype("datetime64[ns]"),
+        pressure_edges,
+        grid.reshape(npressure, ntime),
+    )
+
+
 @register_dataframe_method
-def plot_transect(
+def plot_transect(  # noqa: PLR0913
     df: pd.DataFrame,
     var: str,
     ax: plt.Axes = None,
+    *,
+    binned: bool | None = None,
+    resolution: tuple[int, int] = (1000, 100),
+    statistic: str = "mean",
+    max_points: int | None = None,
     **kw: dict,
 ) -> tuple[plt.Figure, plt.Axes]:
     """Make a scatter plot of depth vs time coloured by a user defined
     variable.
 
+    Large deployments are drawn as a time by pressure grid of the binned
+    values instead, see `bin_transect`.
+
     :param var: variable to colour the scatter plot
+    :param binned: draw the binned grid, defaults to True above
+        `max_points` samples
+    :param resolution: number of time and pressure bins
+    :param statistic: "mean" or "median" of the samples in each cell
+    :param max_points: number of samples above which the data is binned
+        (default: `gliderpy.plotting.points_budget`)
     :return: figure, axes
     """
     cmap = kw.get("cmap")
+    if binned is None:
+        binned = len(df) > (max_points or points_budget)
 
     fignums = plt.get_fignums()
     if ax is None and not fignums:
@@ -97,15 +181,29 @@ def plot_transect(
     if not ax.yaxis_inverted():
         ax.invert_yaxis()
 
-    cs = ax.scatter(
-        df.index,
-        df["pressure"],
-        s=15,
-        c=df[var],
-        marker="o",
-        edgecolor="none",
-        cmap=cmap,
-    )
+    if binned:
+        time_edges, pressure_edges, grid = bin_transect(
+            df,
+            var,
+            resolution=resolution,
+            statistic=statistic,
+        )
+        cs = ax.pcolormesh(
+            time_edges,
+            pressure_edges,
+            np.ma.masked_invalid(grid),
+            cmap=cmap,
+        )
+    else:
+        cs = ax.scatter(
+            df.index,
+            df["pressure"],
+            s=15,
+            c=df[var],
+            marker="o",
+            edgecolor="none",
+            cmap=cmap,
+        )
 
     xfmt = mdates.DateFormatter("%H:%Mh\n%d-%b")
     ax.xaxis.set_major_formatter(xfmt)
@@ -120,24 +218,38 @@ def plot_transect(
 
 
 @register_dataframe_method
-def plot_cast(
+def plot_cast(  # noqa: PLR0913
     df: pd.DataFrame,
     profile_number: int,
     var: str,
     ax: plt.Axes = None,
     color: str | None = None,
+    *,
+    order: str = "position",
 ) -> tuple[plt.Figure, plt.Axes]:
     """Make a CTD profile plot of pressure vs property
     depending on what variable was chosen.
 
+    By default the casts are the samples grouped by their (longitude,
+    latitude) position, numbered in sorted position order, and casts
+    sharing a position are merged. With `order="time"` the profiles of
+    `profile_index` are used instead, numbered in time order.
+
     :param profile_number: profile number of CTD
     :param var: variable to plot against pressure
     :param ax: existing axis to plot on (default: None)
     :param color: color for the plot line (default: None)
+    :param order: "position" or "time" numbering of the profiles
     :return: figure, axes
     """
-    g = df.groupby(["longitude", "latitude"])
-    profile = g.get_group(list(g.groups)[profile_number])
+    if order == "position":
+        g = df.groupby(["longitude", "latitude"])
+        profile = g.get_group(list(g.groups)[profile_number])
+    elif order == "time":
+        profile = df.iloc[profile_index(df)[profile_number]]
+    else:
+        msg = f"order must be 'position' or 'time', got {order!r}."
+        raise ValueError(msg)
 
     if ax is None:
         fig, ax = plt.subplots(figsize=(5, 6))
@@ -155,49 +267,60 @@ def plot_cast(
 @register_dataframe_method
 def plot_ts(
     df: pd.DataFrame,
+    ax: plt.Axes = None,
+    *,
+    hexbin: bool | None = None,
+    gridsize: int = 100,
+    max_points: int | None = None,
 ) -> tuple[plt.Figure, plt.Axes]:
     """Make a TS diagram for all profiles in the DataFrame.
 
+    The samples are coloured by pressure. Large datasets are drawn as a
+    hexagonal binning of the mean pressure instead.
+
+    :param ax: existing axis to plot on (default: None)
+    :param hexbin: draw the hexagonal binning, defaults to True above
+        `max_points` samples
+    :param gridsize: number of hexagons in the x-direction
+    :param max_points: number of samples above which the data is binned
+        (default: `gliderpy.plotting.points_budget`)
     :return: figure, axes
     """
-    df["sa"] = gsw.conversions.SA_from_SP(
-        df["salinity"],
-        df["pressure"],
-        df["longitude"],
-        df["latitude"],
-    )
-
-    df["ct"] = gsw.conversions.CT_from_t(
-        df["sa"],
-        df["temperature"],
-        df["pressure"],
-    )
-
-    g = df.groupby(["longitude", "latitude"])
+    ts = ts_variables(df)
+    sa, ct = ts["sa"], ts["ct"]
+    if hexbin is None:
+        hexbin = len(df) > (max_points or points_budget)
 
-    fig, ax = plt.subplots(figsize=(10, 10))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 10))
+    else:
+        fig = ax.get_figure()
 
-    for _name, group in g:
-        sc = plt.scatter(
-            group["sa"],
-            group["ct"],
-            c=group["pressure"],
+    if hexbin:
+        sc = ax.hexbin(
+            sa,
+            ct,
+            C=df["pressure"],
+            reduce_C_function=np.mean,
+            gridsize=gridsize,
             cmap="plasma_r",
-            s=30,
+            mincnt=1,
         )
+    else:
+        sc = ax.scatter(sa, ct, c=df["pressure"], cmap="plasma_r", s=30)
 
-    plt.xlabel("Absolute Salinity(g/kg)")
-    plt.ylabel("Conservative Temperature (°C)")
-    cbar = plt.colorbar(sc)
+    ax.set_xlabel("Absolute Salinity(g/kg)")
+    ax.set_ylabel("Conservative Temperature (°C)")
+    cbar = fig.colorbar(sc, ax=ax)
     cbar.set_label("Pressure (dbar)")
 
     # Define salinity and temperature grids
-    salinity_grid = np.linspace(df["sa"].min() - 5, df["sa"].max() + 5, 100)
-    temperature_grid = np.linspace(df["ct"].min() - 5, df["ct"].max() + 5, 100)
+    salinity_grid = np.linspace(sa.min() - 5, sa.max() + 5, 100)
+    temperature_grid = np.linspace(ct.min() - 5, ct.max() + 5, 100)
     sal, temp = np.meshgrid(salinity_grid, temperature_grid)
     sigma = gsw.sigma0(sal, temp)
 
-    contours = plt.contour(
+    contours = ax.contour(
         sal,
         temp,
         sigma,
@@ -206,6 +329,6 @@ def plot_ts(
         linestyles="--",
     )
 
-    plt.clabel(contours, inline=True, fmt="%1.1f", fontsize=8, colors="black")
+    ax.clabel(contours, inline=True, fmt="%1.1f", fontsize=8, colors="black")
 
     return fig, ax
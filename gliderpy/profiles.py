@@ -0,0 +1,239 @@
+"""Vectorized profile segmentation and gridding for glider data."""
+
+from collections.abc import Iterable, Sequence
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from pandas_flavor import register_dataframe_method
+
+from gliderpy.cache import frame_cache
+
+
+class ProfileIndex:
+    """Compressed row offsets of the profiles in a DataFrame.
+
+    Profile `n` spans the rows `offsets[n]:offsets[n + 1]`, like the index
+    pointer of a CSR sparse matrix.
+
+    Attributes
+    ----------
+    offsets : numpy.ndarray
+        Row offsets with one more element than the number of profiles.
+
+    """
+
+    def __init__(self: "ProfileIndex", offsets: np.ndarray) -> None:
+        """Instantiate the index from the row offsets."""
+        self.offsets = offsets
+
+    def __len__(self: "ProfileIndex") -> int:
+        """Return the number of profiles."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self: "ProfileIndex", profile_number: int) -> slice:
+        """Return the rows of a profile as a slice for `df.iloc`."""
+        start, stop = self.offsets[[profile_number, profile_number + 1]]
+        return slice(start, stop)
+
+    @property
+    def sizes(self: "ProfileIndex") -> np.ndarray:
+        """Return the number of rows in each profile."""
+        return np.diff(self.offsets)
+
+    @property
+    def labels(self: "ProfileIndex") -> np.ndarray:
+        """Return the profile number of each row."""
+        return np.repeat(np.arange(len(self)), self.sizes)
+
+    def reduce(
+        self: "ProfileIndex",
+        values: np.ndarray,
+        ufunc: np.ufunc = np.add,
+    ) -> np.ndarray:
+        """Reduce `values` over each profile with `ufunc`, e.g. np.maximum."""
+        if not len(self):
+            return np.empty(0, dtype=np.asarray(values).dtype)
+        return ufunc.reduceat(values, self.offsets[:-1])
+
+    def mean(self: "ProfileIndex", values: np.ndarray) -> np.ndarray:
+        """Return the mean of `values` in each profile, ignoring NaNs."""
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        total = self.reduce(np.where(valid, values, 0.0))
+        count = self.reduce(valid.astype(int))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count
+
+
+def _profile_starts(df: pd.DataFrame) -> np.ndarray:
+    """Return the first row of each profile, except the first one."""
+    if "profile_id" in df and df["profile_id"].notna().any():
+        profile_id = df["profile_id"].ffill().bfill().to_numpy()
+        return np.flatnonzero(profile_id[1:] != profile_id[:-1]) + 1
+
+    # Without profile_id a new profile starts after the glider changes
+    # direction, i.e. after each pressure reversal. `direction[n]` is the
+    # direction from row n to n + 1, so a change at n makes row n the turn.
+    pressure = df["pressure"].ffill().to_numpy(dtype=float)
+    direction = pd.Series(np.sign(np.diff(pressure)))
+    direction = direction.replace(0, np.nan).ffill().bfill().to_numpy()
+    return np.flatnonzero(direction[1:] != direction[:-1]) + 2
+
+
+@register_dataframe_method
+@frame_cache
+def profile_index(df: pd.DataFrame) -> ProfileIndex:
+    """Return the profile index of the time sorted DataFrame.
+
+    Profiles are identified by `profile_id` when available, otherwise by the
+    pressure reversals. The index is computed once per DataFrame.
+
+    :return: profile index with the row offsets of each profile
+    """
+    if df.empty:
+        return ProfileIndex(np.zeros(1, dtype=np.intp))
+    offsets = np.concatenate([[0], _profile_starts(df), [len(df)]])
+    return ProfileIndex(offsets.astype(np.intp))
+
+
+# Columns that are coordinates of the gridded profiles, not variables.
+_grid_coords = ("pressure", "latitude", "longitude", "profile_id")
+
+
+def _pressure_edges(
+    pressure_bins: Number | Sequence[float],
+    pressure: np.ndarray,
+) -> np.ndarray:
+    """Return the bin edges, a bin size is turned into edges from zero."""
+    if np.ndim(pressure_bins) == 0:
+        stop = np.nanmax(pressure) + pressure_bins
+        return np.arange(0, stop, pressure_bins, dtype=float)
+    return np.asarray(pressure_bins, dtype=float)
+
+
+def _grid_variables(df: pd.DataFrame) -> list[str]:
+    """Return the numeric columns that are not coordinates."""
+    return [
+        col
+        for col in df.columns
+        if col not in _grid_coords and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+
+def _grid(
+    df: pd.DataFrame,
+    edges: np.ndarray,
+    variables: list[str],
+) -> xr.Dataset:
+    """Bin all profiles of `df` at once."""
+    index = profile_index(df)
+    nprofiles, nlevels = len(index), len(edges) - 1
+    pressure = df["pressure"].to_numpy(float)
+    # The last bin includes its right edge, like `numpy.histogram`.
+    level = np.searchsorted(edges, pressure, side="right") - 1
+    level[pressure == edges[-1]] = nlevels - 1
+    inside = (level >= 0) & (level < nlevels)
+    cell = index.labels * nlevels + level
+
+    data_vars = {}
+    for var in variables:
+        values = df[var].to_numpy(float)
+        valid = inside & ~np.isnan(values)
+        count = np.bincount(cell[valid], minlength=nprofiles * nlevels)
+        total = np.bincount(
+            cell[valid],
+            weights=values[valid],
+            minlength=nprofiles * nlevels,
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+        data_vars[var] = (("profile", "pressure"), mean.reshape(-1, nlevels))
+
+    # The time is the last level of consolidated frames.
+    time = df.index.get_level_values(-1).to_numpy("datetime64[ns]")
+    # Sums of nanoseconds since 1970 overflow after a few samples, the
+    # offsets from the start of each profile do not.
+    start = time[index.offsets[:-1]]
+    offset = (time - start[index.labels]).view("int64")
+    mean_time = start + (index.reduce(offset) // index.sizes).astype(
+        "timedelta64[ns]",
+    )
+    coords = {
+        "profile": np.arange(nprofiles),
+        "pressure": (edges[:-1] + edges[1:]) / 2,
+        "time": ("profile", mean_time),
+    }
+    for coord in ("latitude", "longitude"):
+        if coord in df:
+            coords[coord] = ("profile", index.mean(df[coord]))
+    return xr.Dataset(data_vars, coords=coords)
+
+
+@register_dataframe_method
+def to_grid(
+    df: pd.DataFrame,
+    pressure_bins: Number | Sequence[float],
+    variables: list[str] | None = None,
+) -> xr.Dataset:
+    """Average all profiles onto common pressure levels.
+
+    Each sample is assigned to its profile and pressure bin and the bins
+    are averaged at once, without looping over the profiles. Empty bins
+    are NaN. Use `ds[var].to_numpy()` for a (profile, level) array.
+
+    :param pressure_bins: bin edges, or the bin size starting from zero
+    :param variables: columns to grid, defaults to all numeric columns
+    :return: dataset with the (profile, pressure) variables and the mean
+        time and position of each profile
+    """
+    pressure = df["pressure"].to_numpy(float)
+    edges = _pressure_edges(pressure_bins, pressure)
+    return _grid(df, edges, variables or _grid_variables(df))
+
+
+def grid_chunks(
+    chunks: Iterable[pd.DataFrame],
+    pressure_bins: Sequence[float],
+    variables: list[str] | None = None,
+) -> xr.Dataset:
+    """Grid a deployment that is read in consecutive time chunks.
+
+    The last profile of each chunk is carried over to the next one, so
+    profiles that span a chunk boundary are gridded once. Only one chunk
+    is held in memory at a time, e.g. with
+
+    >>> chunks = (df for _, df in fetcher.iter_chunks())  # doctest: +SKIP
+    >>> ds = grid_chunks(chunks, range(0, 1000, 5))  # doctest: +SKIP
+
+    :param pressure_bins: bin edges, the maximum pressure is not known
+        beforehand so a bin size is not supported
+    :param variables: columns to grid, defaults to the numeric columns of
+        the first chunk
+    :return: dataset as in `to_grid`
+    """
+    if np.ndim(pressure_bins) == 0:
+        msg = "Chunked gridding requires the pressure bin edges."
+        raise ValueError(msg)
+    edges = np.asarray(pressure_bins, dtype=float)
+
+    grids = []
+    leftover = None
+    for chunk in chunks:
+        df = chunk if leftover is None else pd.concat([leftover, chunk])
+        if df.empty:
+            continue
+        variables = variables or _grid_variables(df)
+        last = profile_index(df).offsets[-2]
+        if last:
+            grids.append(_grid(df.iloc[:last], edges, variables))
+        leftover = df.iloc[last:]
+    if leftover is not None and not leftover.empty:
+        grids.append(_grid(leftover, edges, variables))
+    if not grids:
+        empty = pd.DataFrame({"pressure": []}, index=pd.DatetimeIndex([]))
+        return _grid(empty, edges, variables or [])
+
+    ds = xr.concat(grids, dim="profile")
+    return ds.assign_coords(profile=np.arange(ds.sizes["profile"]))
@@ -0,0 +1,221 @@
+"""Rate limiting, retries and circuit breaking for ERDDAP requests."""
+
+import email.utils
+import threading
+import time
+from typing import NamedTuple
+
+from requests.exceptions import (
+    ConnectionError,  # noqa: A004
+    HTTPError,
+    RequestException,
+    Timeout,
+)
+
+# Overloaded and rate limited servers, they may send a `Retry-After`.
+_retry_after_codes = (429, 503)
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of sending a request to a failing server."""
+
+
+class DownloadError(RuntimeError):
+    """Raised when one or more datasets could not be downloaded.
+
+    Attributes
+    ----------
+    failures : dict
+        The exception raised for each dataset_id.
+
+    """
+
+    def __init__(self: "DownloadError", failures: dict) -> None:
+        """Instantiate the error from the failures of each dataset_id."""
+        self.failures = failures
+        details = ", ".join(
+            f"{dataset_id}: {err!r}" for dataset_id, err in failures.items()
+        )
+        msg = f"Failed to download {len(failures)} datasets: {details}"
+        super().__init__(msg)
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting the requests to a server.
+
+    Attributes
+    ----------
+    rate : float
+        Requests per second allowed in the long run.
+    burst : int
+        Requests allowed at once after an idle period, defaults to 1.
+
+    """
+
+    def __init__(self: "RateLimiter", rate: float, burst: int = 1) -> None:
+        """Instantiate a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self: "RateLimiter") -> float:
+        """Wait for a token.
+
+        :return: seconds waited
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self: "RateLimiter") -> float:
+        """Take a token without waiting, e.g. to wait with `asyncio.sleep`.
+
+        :return: seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            # Tokens can go negative, later callers wait in line.
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class CircuitState(NamedTuple):
+    """State of a circuit breaker."""
+
+    state: str
+    failures: int
+    opened_at: float | None
+
+
+class CircuitBreaker:
+    """Stop calling a server after repeated failures.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    requests fail fast with `CircuitOpenError`. After `reset_timeout`
+    seconds one trial request is let through, the circuit closes again if
+    it succeeds.
+
+    Attributes
+    ----------
+    failure_threshold : int
+        Consecutive failures that open the circuit, defaults to 5.
+    reset_timeout : float
+        Seconds before a trial request is allowed, defaults to 30.
+
+    """
+
+    def __init__(
+        self: "CircuitBreaker",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ) -> None:
+        """Instantiate a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self: "CircuitBreaker") -> CircuitState:
+        """Return the state, one of closed, open or half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                state = "closed"
+            elif time.monotonic() - self._opened_at < self.reset_timeout:
+                state = "open"
+            else:
+                state = "half-open"
+            return CircuitState(state, self._failures, self._opened_at)
+
+    def before_request(self: "CircuitBreaker", server: str = "") -> None:
+        """Raise `CircuitOpenError` unless a request may be sent."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._trial:
+                self._trial = True
+                return
+        msg = (
+            f"Circuit open for {server or 'the server'} after "
+            f"{self._failures} failures, retry in "
+            f"{max(self.reset_timeout - elapsed, 0):.0f}s."
+        )
+        raise CircuitOpenError(msg)
+
+    def record_success(self: "CircuitBreaker") -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self: "CircuitBreaker") -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+def _status_code(exc: Exception) -> int | None:
+    """Return the HTTP status code of `exc`, if any."""
+    response = getattr(exc, "response", None)
+    return None if response is None else response.status_code
+
+
+def retry_after(exc: Exception) -> float | None:
+    """Return the seconds to wait from the `Retry-After` header, if any."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def server_failure(exc: Exception) -> bool:
+    """Check if `exc` means the server is failing or overloaded."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, HTTPError):
+        status_code = _status_code(exc)
+        if status_code is None:
+            return False
+        html_code = 500
+        return status_code >= html_code or status_code in _retry_after_codes
+    return isinstance(exc, ConnectionError | Timeout)
+
+
+def backoff(exc: Exception) -> bool | float:
+    """Decide whether to retry `exc` for `stamina`.
+
+    Server failures are retried with exponential backoff, unless the server
+    sent a `Retry-After`, which is honored.
+
+    :return: False to give up, True to back off or the seconds to wait
+    """
+    if not server_failure(exc):
+        return False
+    seconds = retry_after(exc)
+    return True if seconds is None else seconds
@@ -1,7 +1,114 @@
-"""Server names and aliases that point to an ERDDAP instance."""
+"""Server names and aliases that point to an ERDDAP instance.
 
-server_vars = {
-    "https://gliders.ioos.us/erddap": [
+Servers are registered in `registry`, new ones can be added with
+
+>>> from gliderpy.servers import registry
+>>> registry.register(
+...     "https://erddap.example.org/erddap",
+...     variables=["latitude", "longitude", "pressure", "time"],
+...     rename={"pres (decibar)": "pressure"},
+... )  # doctest: +SKIP
+
+The downloaded columns are renamed with the renames of their server, see
+`ServerRegistry.renames`. `server_vars` and `server_parameter_rename` are
+views of the registry.
+"""
+
+from collections import ChainMap
+from collections.abc import Iterator, Mapping
+from typing import NamedTuple
+
+
+class Server(NamedTuple):
+    """Variables to download and column renames of an ERDDAP server."""
+
+    url: str
+    variables: list[str]
+    rename: dict[str, str]
+
+
+class ServerRegistry:
+    """Pluggable registry of the known ERDDAP servers.
+
+    Attributes
+    ----------
+    variables : dict
+        Variables to download for each server URL.
+    rename : dict
+        Mapping from the `name (units)` columns of all the servers to the
+        gliderpy variable names.
+
+    """
+
+    def __init__(self: "ServerRegistry") -> None:
+        """Instantiate an empty registry."""
+        self._servers: dict[str, Server] = {}
+        self.variables: dict[str, list[str]] = {}
+        self.rename: dict[str, str] = {}
+
+    def register(
+        self: "ServerRegistry",
+        url: str,
+        variables: list[str],
+        rename: dict[str, str] | None = None,
+    ) -> Server:
+        """Add, or replace, a server.
+
+        :param url: ERDDAP server URL
+        :param variables: variables to download
+        :param rename: mapping from the server columns to gliderpy names
+        :return: the registered server
+        """
+        server = Server(url, list(variables), dict(rename or {}))
+        self._servers[url] = server
+        self._update()
+        return server
+
+    def unregister(self: "ServerRegistry", url: str) -> None:
+        """Remove a server."""
+        del self._servers[url]
+        self._update()
+
+    def _update(self: "ServerRegistry") -> None:
+        """Rebuild the views in place, so that imported names stay valid."""
+        self.variables.clear()
+        self.rename.clear()
+        for server in self._servers.values():
+            self.variables[server.url] = server.variables
+            self.rename.update(server.rename)
+
+    def renames(self: "ServerRegistry", url: str) -> Mapping[str, str]:
+        """Return the column renames used for the data of `url`.
+
+        The renames of the server come first, the columns it does not
+        rename fall back to the renames of all the servers.
+        """
+        if url not in self._servers:
+            return self.rename
+        return ChainMap(self._servers[url].rename, self.rename)
+
+    def __getitem__(self: "ServerRegistry", url: str) -> Server:
+        """Return the server registered for `url`."""
+        return self._servers[url]
+
+    def __contains__(self: "ServerRegistry", url: object) -> bool:
+        """Check if `url` is registered."""
+        return url in self._servers
+
+    def __iter__(self: "ServerRegistry") -> Iterator[str]:
+        """Iterate over the server URLs."""
+        return iter(self._servers)
+
+    def __len__(self: "ServerRegistry") -> int:
+        """Return the number of servers."""
+        return len(self._servers)
+
+
+registry = ServerRegistry()
+
+registry.register(
+    "https://gliders.ioos.us/erddap",
+    variables=[
         "latitude",
         "longitude",
         "pressure",
@@ -10,21 +117,23 @@ server_vars = {
         "temperature",
         "time",
     ],
-}
-
-server_parameter_rename = {
-    "ctdgv_m_glider_instrument_practical_salinity (1)": "salinity",
-    "ctdgv_m_glider_instrument_sci_water_pressure_dbar (dbar)": "pressure",
-    "ctdgv_m_glider_instrument_sci_water_temp (deg_c)": "temperature",
-    "dataset_url": "dataset_url",
-    "latitude (degrees_north)": "latitude",
-    "longitude (degrees_east)": "longitude",
-    "pres (decibar)": "pressure",
-    "pressure (dbar)": "pressure",
-    "profile_id": "profile_id",
-    "psal (psu)": "salinity",
-    "salinity (1)": "salinity",
-    "temp (degree_celsius)": "temperature",
-    "temperature (celsius)": "temperature",
-    "time (utc)": "time",
-}
+    rename={
+        "ctdgv_m_glider_instrument_practical_salinity (1)": "salinity",
+        "ctdgv_m_glider_instrument_sci_water_pressure_dbar (dbar)": "pressure",
+        "ctdgv_m_glider_instrument_sci_water_temp (deg_c)": "temperature",
+        "dataset_url": "dataset_url",
+        "latitude (degrees_north)": "latitude",
+        "longitude (degrees_east)": "longitude",
+        "pres (decibar)": "pressure",
+        "pressure (dbar)": "pressure",
+        "profile_id": "profile_id",
+        "psal (psu)": "salinity",
+        "salinity (1)": "salinity",
+        "temp (degree_celsius)": "temperature",
+        "temperature (celsius)": "temperature",
+        "time (utc)": "time",
+    },
+)
+
+server_vars = registry.variables
+server_parameter_rename = registry.rename
@@ -0,0 +1,87 @@
+"""Benchmarks only run with ``pytest --benchmark-only``.
+
+The downloads are replayed against a local ERDDAP stand-in, see the
+``erddap_server`` fixture, with ``GLIDERPY_BENCHMARK_LATENCY`` seconds of
+latency per request (default 0.02). Track a commit with
+
+    pytest tests/benchmarks --benchmark-only --benchmark-autosave
+
+and compare with the last saved run with ``--benchmark-compare``. The
+peak memory, in MiB, is reported in the ``extra_info`` of each benchmark.
+"""
+
+import os
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+here = Path(__file__).parent
+
+LATENCY = float(os.environ.get("GLIDERPY_BENCHMARK_LATENCY", "0.02"))
+
+
+def pytest_collection_modifyitems(config, items) -> None:  # noqa: ANN001
+    """Skip the benchmarks unless they were explicitly requested."""
+    if config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="run with --benchmark-only")
+    for item in items:
+        if here in item.path.parents:
+            item.add_marker(skip)
+
+
+def _synthetic_deployment(num_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a csvp-like response with `num_rows` rows and 500 per yo."""
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("2016-09-02T17:00", periods=num_rows, freq="s")
+    # Saw-tooth dives between the surface and 200 dbar.
+    phase = np.arange(num_rows) % 500 / 250
+    return pd.DataFrame(
+        {
+            "latitude (degrees_north)": np.linspace(40, 42, num_rows),
+            "longitude (degrees_east)": np.linspace(-71, -69, num_rows),
+            "pressure (dbar)": 200 * np.minimum(phase, 2 - phase),
+            "profile_id": np.arange(num_rows) // 500,
+            "salinity (1)": rng.uniform(30, 36, num_rows),
+            "temperature (Celsius)": rng.uniform(2, 30, num_rows),
+            "time (UTC)": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+    )
+
+
+@pytest.fixture(scope="session")
+def synthetic_deployment() -> Callable[..., pd.DataFrame]:
+    """Return a factory of csvp-like deployments, see `num_rows`."""
+    return _synthetic_deployment
+
+
+@pytest.fixture
+def peak_memory(benchmark) -> Callable:  # noqa: ANN001
+    """Record the peak memory of one call in the benchmark extra info."""
+
+    def measure(func: Callable, *args: tuple) -> object:
+        tracemalloc.start()
+        try:
+            result = func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_mib"] = peak / 2**20
+        return result
+
+    return measure
+
+
+@pytest.fixture
+def deployments_server(erddap_server):  # noqa: ANN001, ANN201
+    """Serve a search and eight 20k row deployments with some latency."""
+    erddap_server.latency = LATENCY
+    erddap_server.serve_datasets(
+        [f"glider_{num}" for num in range(8)],
+        _synthetic_deployment(20_000),
+    )
+    return erddap_server
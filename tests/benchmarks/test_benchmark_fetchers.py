@@ -0,0 +1,39 @@
+"""Benchmark the downloads and searches against a local ERDDAP stand-in.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pytest
+
+from gliderpy.fetchers import GliderDataFetcher, memory_cache, search_cache
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="to_pandas")
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_to_pandas(benchmark, peak_memory, deployments_server, max_workers):
+    """Time and peak memory of downloading eight deployments."""
+    g = GliderDataFetcher(deployments_server.url, max_workers=max_workers)
+    g.dataset_ids = deployments_server.dataset_ids
+    peak_memory(g.to_pandas)
+    glider_dfs = benchmark.pedantic(
+        g.to_pandas,
+        setup=memory_cache.cache_clear,
+        rounds=5,
+    )
+    assert len(glider_dfs) == len(deployments_server.dataset_ids)
+
+
+@pytest.mark.benchmark(group="query")
+def test_query(benchmark, deployments_server):
+    """Time of an uncached search."""
+    g = GliderDataFetcher(deployments_server.url)
+
+    def query():
+        return g.query(min_time="2016-09-01", max_time="2016-09-30")
+
+    datasets = benchmark.pedantic(
+        query, setup=search_cache.cache_clear, rounds=10
+    )
+    assert len(datasets) == len(deployments_server.dataset_ids)
@@ -0,0 +1,70 @@
+"""Benchmark the plotting functions, including the Agg rendering.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import matplotlib as mpl
+
+mpl.use("agg")
+
+import matplotlib.pyplot as plt
+import pytest
+
+from gliderpy.fetchers import standardise_df
+from gliderpy.plotting import plot_cast, plot_track, plot_transect, plot_ts
+
+pytest.importorskip("pytest_benchmark")
+
+URL = "https://gliders.ioos.us/erddap/tabledap/glider.html"
+
+
+@pytest.fixture(scope="module")
+def deployment(synthetic_deployment):
+    """Build a standardised deployment with two million rows."""
+    return standardise_df(synthetic_deployment(2_000_000), URL)
+
+
+def _render(func, *args: tuple):
+    """Plot and render to an in-memory canvas."""
+    fig, _ = func(*args)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+@pytest.mark.benchmark(group="plotting")
+@pytest.mark.parametrize("num_rows", [100_000, 2_000_000])
+def test_plot_transect(benchmark, peak_memory, deployment, num_rows):
+    """Scatter below the points budget and binned grid above it."""
+    df = deployment.iloc[:num_rows]
+    peak_memory(_render, plot_transect, df, "temperature")
+    benchmark.pedantic(_render, (plot_transect, df, "temperature"), rounds=3)
+
+
+@pytest.mark.benchmark(group="plotting")
+@pytest.mark.parametrize("num_rows", [100_000, 2_000_000])
+def test_plot_ts(benchmark, peak_memory, deployment, num_rows):
+    """Single scatter below the points budget and hexbin above it."""
+    df = deployment.iloc[:num_rows]
+    peak_memory(_render, plot_ts, df)
+    benchmark.pedantic(_render, (plot_ts, df), rounds=3)
+
+
+@pytest.mark.benchmark(group="plotting")
+def test_plot_cast(benchmark, deployment):
+    """Time to plot one cast out of the whole deployment."""
+    benchmark.pedantic(
+        _render,
+        (plot_cast, deployment, 1000, "temperature"),
+        rounds=5,
+    )
+
+
+@pytest.mark.benchmark(group="plotting")
+def test_plot_track(benchmark, deployment):
+    """Time to build the thinned track, without rendering the coastlines."""
+
+    def plot():
+        fig, _ = plot_track(deployment)
+        plt.close(fig)
+
+    benchmark.pedantic(plot, rounds=3)
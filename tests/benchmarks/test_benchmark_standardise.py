@@ -0,0 +1,52 @@
+"""Benchmark standardise_df on multi-million-row deployments.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pandas as pd
+import pytest
+
+from gliderpy.fetchers import standardise_df
+from gliderpy.servers import server_parameter_rename
+
+pytest.importorskip("pytest_benchmark")
+
+URL = "https://gliders.ioos.us/erddap/tabledap/glider.html"
+
+
+def legacy_standardise_df(glider_df, dataset_url):
+    """Previous multi-pass implementation, kept for comparison."""
+    glider_df.columns = glider_df.columns.str.lower()
+    glider_df = glider_df.set_index("time (utc)")
+    glider_df = glider_df.rename(columns=server_parameter_rename)
+    glider_df.index = pd.to_datetime(
+        glider_df.index,
+        format="%Y-%m-%dT%H:%M:%SZ",
+    )
+    glider_df = glider_df.sort_index()
+    glider_df["dataset_url"] = dataset_url
+    return glider_df
+
+
+@pytest.fixture(scope="module", params=[1_000_000, 4_000_000])
+def raw_deployment(request, synthetic_deployment):
+    """Build a csvp-like response with 1M and 4M rows."""
+    return synthetic_deployment(request.param)
+
+
+@pytest.mark.benchmark(group="standardise_df")
+@pytest.mark.parametrize(
+    "func",
+    [legacy_standardise_df, standardise_df],
+    ids=["legacy", "single-pass"],
+)
+def test_standardise_df(benchmark, peak_memory, raw_deployment, func):
+    """Time, peak memory and output size of the standardisation step."""
+    df = peak_memory(func, raw_deployment.copy(deep=False), URL)
+    benchmark.extra_info["output_mib"] = (
+        df.memory_usage(deep=True).sum() / 2**20
+    )
+    df = benchmark(
+        lambda: func(raw_deployment.copy(deep=False), URL),
+    )
+    assert len(df) == len(raw_deployment)
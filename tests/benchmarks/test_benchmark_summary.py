@@ -0,0 +1,47 @@
+"""Benchmark the deployment summaries on a million-row deployment.
+
+Run with ``pytest tests/benchmarks --benchmark-only``.
+"""
+
+import pytest
+
+from gliderpy import summary_table
+from gliderpy.fetchers import standardise_df
+
+pytest.importorskip("pytest_benchmark")
+
+URL = "https://gliders.ioos.us/erddap/tabledap/glider.html"
+
+
+@pytest.fixture(scope="module")
+def deployment(synthetic_deployment):
+    """Build a standardised deployment with a million rows."""
+    return standardise_df(synthetic_deployment(1_000_000), URL)
+
+
+def _fresh(df):
+    """Return a new frame so that the profile index is not cached."""
+    return (df.copy(deep=False),), {}
+
+
+@pytest.mark.benchmark(group="summary")
+def test_summary(benchmark, peak_memory, deployment):
+    """Time and peak memory of a single deployment summary."""
+    peak_memory(lambda: deployment.copy(deep=False).summary())
+    summary = benchmark.pedantic(
+        lambda df: df.summary(),
+        setup=lambda: _fresh(deployment),
+        rounds=5,
+    )
+    assert summary["num_profiles"] == 2000  # noqa: PLR2004
+
+
+@pytest.mark.benchmark(group="summary")
+def test_summary_table(benchmark, deployment):
+    """Time of the batched summary of ten deployments."""
+
+    def setup():
+        return ({num: deployment.copy(deep=False) for num in range(10)},), {}
+
+    table = benchmark.pedantic(summary_table, setup=setup, rounds=3)
+    assert len(table) == 10  # noqa: PLR2004
@@ -0,0 +1,199 @@
+"""Shared test fixtures."""
+
+import gzip
+import threading
+import time
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pandas as pd
+import pytest
+
+from gliderpy.fetchers import circuit_breakers, memory_cache, search_cache
+from gliderpy.servers import registry
+
+# Stand-ins serve the variables of the IOOS glider DAC.
+_ioos = "https://gliders.ioos.us/erddap"
+
+
+@pytest.fixture(autouse=True)
+def _clear_memory_cache() -> None:
+    """Start every test with empty in-memory caches and closed circuits."""
+    memory_cache.cache_clear()
+    search_cache.cache_clear()
+    circuit_breakers.clear()
+
+
+def _erddap_response(dataset_id: str) -> pd.DataFrame:
+    """Build a small csvp-like response for `dataset_id`."""
+    return pd.DataFrame(
+        {
+            "latitude (degrees_north)": [41.0, 41.1],
+            "longitude (degrees_east)": [-70.0, -70.1],
+            "pressure (dbar)": [1.0, 2.0],
+            "profile_id": [1, 1],
+            "salinity (1)": [33.0, 33.1],
+            "temperature (Celsius)": [20.0, 19.9],
+            "time (UTC)": ["2016-09-02T17:00:00Z", "2016-09-02T17:01:00Z"],
+            "dataset_id": [dataset_id, dataset_id],
+        },
+    )
+
+
+@pytest.fixture(scope="session")
+def erddap_response() -> Callable[[str], pd.DataFrame]:
+    """Return a factory of small csvp-like responses by dataset_id."""
+    return _erddap_response
+
+
+class _ERDDAPHandler(BaseHTTPRequestHandler):
+    """Serve the canned responses of an `ERDDAPServer`."""
+
+    # HTTP/1.1 keeps the connections alive.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append(
+            (self.path, self.client_address, dict(self.headers)),
+        )
+        time.sleep(server.latency)
+        path = urlsplit(self.path).path
+        body = server.routes.get(path)
+        errors = server.errors.get(path)
+        if errors:
+            status, headers, *message = errors.pop(0)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            body = b"".join(message) or b"Error: the server is overloaded."
+        elif body is None:
+            self.send_response(404)
+            body = b"Error: Your query produced no matching results."
+        else:
+            self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: tuple) -> None:
+        """Keep the test output quiet."""
+
+
+class ERDDAPServer(ThreadingHTTPServer):
+    """Local stand-in for an ERDDAP server.
+
+    Attributes
+    ----------
+    url : str
+        ERDDAP URL of the server.
+    routes : dict
+        Response body for each URL path, other paths answer 404.
+    errors : dict
+        (status, headers) of the errors to answer, in order, for each URL
+        path before serving the route, with an optional third body item.
+    requests : list
+        (path, client address, headers) of each request received.
+    latency : float
+        Seconds to wait before each response.
+    dataset_ids : list
+        Datasets added by `serve_datasets`.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), _ERDDAPHandler)
+        self.url = f"http://127.0.0.1:{self.server_port}/erddap"
+        self.routes: dict[str, bytes] = {}
+        self.errors: dict[str, list[tuple]] = {}
+        self.requests: list[tuple] = []
+        self.latency = 0.0
+        self.dataset_ids: list[str] = []
+
+    def serve_datasets(
+        self,
+        dataset_ids: Iterable[str],
+        frame: pd.DataFrame | Callable[[str], pd.DataFrame],
+    ) -> None:
+        """Serve a search listing `dataset_ids` and their csvp responses.
+
+        :param frame: csvp-like response of every dataset, or a callable
+            returning the response of a dataset_id
+        """
+        self.dataset_ids.extend(dataset_ids)
+        search = pd.DataFrame(
+            {
+                "Title": self.dataset_ids,
+                "Institution": "IOOS",
+                "Dataset ID": self.dataset_ids,
+            },
+        )
+        self.routes["/erddap/search/advanced.csv"] = search.to_csv(
+            index=False,
+        ).encode()
+        if isinstance(frame, pd.DataFrame):
+            body = frame.to_csv(index=False).encode()
+        for dataset_id in self.dataset_ids:
+            if callable(frame):
+                body = frame(dataset_id).to_csv(index=False).encode()
+            self.routes[f"/erddap/tabledap/{dataset_id}.csvp"] = body
+
+    def serve_info(self, dataset_id: str, start: str, end: str) -> None:
+        """Serve the time coverage of `dataset_id` in its info page."""
+        info = pd.DataFrame(
+            {
+                "Row Type": "attribute",
+                "Variable Name": "NC_GLOBAL",
+                "Attribute Name": [
+                    "time_coverage_start",
+                    "time_coverage_end",
+                ],
+                "Data Type": "String",
+                "Value": [start, end],
+            },
+        )
+        self.routes[f"/erddap/info/{dataset_id}/index.csv"] = info.to_csv(
+            index=False,
+        ).encode()
+
+
+@pytest.fixture
+def make_erddap_server() -> Callable[..., ERDDAPServer]:
+    """Return a factory of local ERDDAP stand-ins, stopped after the test.
+
+    The stand-ins are registered in `gliderpy.servers.registry` with the
+    variables of the IOOS glider DAC and the `rename` columns, if any,
+    added to its renames.
+    """
+    servers = []
+
+    def make(rename: dict | None = None) -> ERDDAPServer:
+        server = ERDDAPServer()
+        ioos = registry[_ioos]
+        registry.register(
+            server.url,
+            ioos.variables,
+            {**ioos.rename, **(rename or {})},
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        registry.unregister(server.url)
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def erddap_server(make_erddap_server: Callable) -> ERDDAPServer:
+    """Run a local ERDDAP stand-in for the duration of a test."""
+    return make_erddap_server()
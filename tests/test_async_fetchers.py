@@ -0,0 +1,116 @@
+"""Test the asyncio fetcher."""
+
+import asyncio
+import time
+from urllib.parse import unquote
+
+import pandas as pd
+import pytest
+
+from gliderpy.async_fetchers import AsyncGliderDataFetcher
+from gliderpy.fetchers import GliderDataFetcher, memory_cache
+
+pytest.importorskip("httpx")
+
+_dataset_ids = [f"glider_{num}" for num in range(8)]
+
+
+@pytest.fixture
+def glider_server(erddap_server, erddap_response):
+    """Serve a search and eight datasets from the local ERDDAP stand-in."""
+    erddap_server.serve_datasets(_dataset_ids, erddap_response)
+    erddap_server.latency = 0.1
+    return erddap_server
+
+
+def test_async_to_pandas(glider_server):
+    """Check concurrent downloads match the synchronous fetcher ones."""
+    glider_server.errors["/erddap/tabledap/glider_1.csvp"] = [
+        (503, {"Retry-After": "0"}),
+    ]
+    glider_server.errors["/erddap/tabledap/glider_2.csvp"] = [
+        (500, {"Retry-After": "0"}),
+    ] * 3
+
+    async def fetch() -> tuple[dict, dict]:
+        async with AsyncGliderDataFetcher(glider_server.url) as g:
+            await g.query(min_lat=38, max_lat=41)
+            return await g.to_pandas(), g.failures
+
+    start = time.perf_counter()
+    glider_dfs, failures = asyncio.run(fetch())
+    elapsed = time.perf_counter() - start
+
+    expected = [
+        dataset_id for dataset_id in _dataset_ids if dataset_id != "glider_2"
+    ]
+    assert list(glider_dfs) == expected
+    assert list(failures) == ["glider_2"]
+    # The downloads overlap, one at a time they take 12 round trips.
+    assert elapsed < 0.1 * 10
+
+    memory_cache.cache_clear()
+    g = GliderDataFetcher(glider_server.url)
+    g.dataset_ids = expected
+    for dataset_id, glider_df in g.to_pandas().items():
+        pd.testing.assert_frame_equal(glider_dfs[dataset_id], glider_df)
+
+
+def test_async_iter_chunks(glider_server):
+    """Check chunks are requested as consecutive time windows."""
+    glider_server.serve_info(
+        "glider_0",
+        "2016-09-02T17:00:00Z",
+        "2016-09-20T00:00:00Z",
+    )
+    glider_server.latency = 0
+
+    async def chunks() -> list:
+        async with AsyncGliderDataFetcher(glider_server.url) as g:
+            g.dataset_ids = ["glider_0"]
+            return [
+                dataset_id
+                async for dataset_id, _ in g.iter_chunks(
+                    freq="7D",
+                    constraints={"time>=": "2016-09-05T00:00:00Z"},
+                )
+            ]
+
+    assert asyncio.run(chunks()) == ["glider_0"] * 3
+    paths = [unquote(path) for path, _, _ in glider_server.requests]
+    assert paths[0] == "/erddap/info/glider_0/index.csv"
+    # The window bounds are sent as seconds since 1970.
+    assert paths[1].endswith("time>=1473033600.0&time<1473638400.0")
+    assert paths[-1].endswith("time>=1474243200.0&time<=1474329600.0")
+
+
+def test_async_iter_chunks_empty_window(glider_server):
+    """Check windows without rows are skipped."""
+    glider_server.serve_info(
+        "glider_0",
+        "2016-09-02T17:00:00Z",
+        "2016-09-20T00:00:00Z",
+    )
+    glider_server.latency = 0
+
+    async def chunks() -> list:
+        async with AsyncGliderDataFetcher(glider_server.url) as g:
+            g.dataset_ids = ["glider_0"]
+            windows = g.iter_chunks(freq="7D")
+            found = [await anext(windows)]
+            # ERDDAP answers 404 when no rows match the window.
+            glider_server.errors["/erddap/tabledap/glider_0.csvp"] = [
+                (404, {}, b"Error: Your query produced no matching results."),
+            ]
+            found.extend([chunk async for chunk in windows])
+            return found, g.failures
+
+    found, failures = asyncio.run(chunks())
+    assert len(found) == 2  # noqa: PLR2004
+    assert not failures
+    downloads = [
+        path
+        for path, _, _ in glider_server.requests
+        if path.startswith("/erddap/tabledap/")
+    ]
+    assert len(downloads) == 3  # noqa: PLR2004
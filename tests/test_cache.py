@@ -0,0 +1,169 @@
+"""Test caches."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from gliderpy import fetchers
+from gliderpy.cache import ArrowCache, CacheInfo, DiskCache, cache_key
+from gliderpy.fetchers import GliderDataFetcher, memory_cache
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def fake_erddap(monkeypatch, erddap_response):
+    """Replace the download with a counter of requested datasets."""
+    calls = []
+
+    def fake_call(glider_grab):
+        dataset_id = glider_grab.fetcher.dataset_id
+        calls.append(dataset_id)
+        return erddap_response(dataset_id)
+
+    monkeypatch.setattr(fetchers, "_call_erddapy", fake_call)
+    return calls
+
+
+def test_cache_key():
+    """Check the key changes with the request."""
+    key = cache_key("server", "glider", ["time"], {"time>=": "2020-01-01"})
+    assert key == cache_key(
+        "server",
+        "glider",
+        ["time"],
+        {"time>=": "2020-01-01"},
+    )
+    assert key != cache_key("server", "glider", ["time"], None)
+    assert key != cache_key("server", "other", ["time"], None)
+
+
+def test_disk_cache_across_fetchers(tmp_path, fake_erddap):
+    """Check datasets are served from disk by a new fetcher."""
+    for _ in range(2):
+        g = GliderDataFetcher(cache=DiskCache(tmp_path))
+        g.dataset_ids = ["glider_0"]
+        df = g.to_pandas()["glider_0"]
+    assert fake_erddap == ["glider_0"]
+    assert df.index.name == "time (utc)"
+    assert list(df.columns) == [
+        "latitude",
+        "longitude",
+        "pressure",
+        "profile_id",
+        "salinity",
+        "temperature",
+        "dataset_id",
+        "dataset_url",
+    ]
+
+
+def test_disk_cache_offline(tmp_path, fake_erddap):
+    """Check offline mode never downloads."""
+    g = GliderDataFetcher(cache=DiskCache(tmp_path, offline=True))
+    g.dataset_ids = ["glider_0"]
+    assert g.to_pandas() == {}
+    assert fake_erddap == []
+
+
+def test_disk_cache_eviction(tmp_path):
+    """Check expired and least recently used entries are evicted."""
+    df = pd.DataFrame({"a": range(1000)})
+    cache = DiskCache(tmp_path, ttl=60)
+    cache.put("old", df)
+    fname = tmp_path.joinpath("old.parquet")
+    os.utime(fname, (0, 0))
+    assert cache.get("old") is None
+    assert not fname.exists()
+
+    cache = DiskCache(tmp_path)
+    cache.put("first", df)
+    os.utime(tmp_path.joinpath("first.parquet"), (0, 0))
+    cache.put("second", df)
+    cache.max_size = tmp_path.joinpath("second.parquet").stat().st_size
+    cache.evict()
+    assert cache.get("first") is None
+    pd.testing.assert_frame_equal(cache.get("second"), df)
+
+
+@pytest.mark.parametrize("cache_class", [DiskCache, ArrowCache])
+def test_disk_cache_threads(tmp_path, cache_class):
+    """Check threads can write and read the same keys at once."""
+    df = pd.DataFrame({"a": range(10_000)})
+    cache = cache_class(tmp_path)
+
+    def put_get(num):
+        cache.put(str(num % 2), df)
+        return cache.get(str(num % 2))
+
+    with ThreadPoolExecutor(8) as pool:
+        for cached in pool.map(put_get, range(64)):
+            pd.testing.assert_frame_equal(cached, df)
+    assert cache.cache_info().hits == 64  # noqa: PLR2004
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_arrow_cache_memory_mapped(tmp_path, fake_erddap):
+    """Check cached datasets are served from the mapped files."""
+    for _ in range(2):
+        g = GliderDataFetcher(cache=ArrowCache(tmp_path))
+        g.dataset_ids = ["glider_0"]
+        df = g.to_pandas()["glider_0"]
+        memory_cache.cache_clear()
+    assert fake_erddap == ["glider_0"]
+    assert list(tmp_path.glob("*.arrow"))
+    pressure = df["pressure"].to_numpy()
+    assert not pressure.flags.writeable
+    assert not pressure.flags.owndata
+
+    # Edits copy the column, the mapped file is unchanged.
+    df.loc[:, "pressure"] = -1
+    g = GliderDataFetcher(cache=ArrowCache(tmp_path))
+    g.dataset_ids = ["glider_0"]
+    assert (g.to_pandas()["glider_0"]["pressure"] > 0).all()
+
+
+def test_arrow_cache_edit_after_clear(tmp_path):
+    """Check returned datasets stay editable once the cache lets go."""
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [1, 2]})
+    cache = ArrowCache(tmp_path)
+    cached = cache.put("key", df)
+    fetched = cache.get("key").sort_index()
+    cache.clear()
+
+    cached.loc[:, "a"] = -1.0
+    fetched.loc[:, "b"] = -1
+    assert (cached["a"] == -1).all()
+    assert (fetched["b"] == -1).all()
+    pd.testing.assert_frame_equal(fetched["a"].to_frame(), df[["a"]])
+
+
+def test_arrow_cache_nan(tmp_path):
+    """Check NaN are stored as is and the columns are not copied."""
+    df = pd.DataFrame({"a": [1.0, float("nan")], "b": [1, 2]})
+    cache = ArrowCache(tmp_path)
+    cached = cache.put("nan", df)
+    pd.testing.assert_frame_equal(cached, df)
+    assert not cached["a"].to_numpy().flags.writeable
+
+
+def test_memory_cache_key_and_copies(fake_erddap):
+    """Check new constraints miss and hits cannot alter the cache."""
+    g = GliderDataFetcher()
+    g.dataset_ids = ["glider_0"]
+    df = g.to_pandas()["glider_0"]
+    df.loc[:, "pressure"] = -1
+    assert (g.to_pandas()["glider_0"]["pressure"] > 0).all()
+
+    g.fetcher.constraints = {"time>=": "2016-09-02T17:01:00Z"}
+    g.to_pandas()
+    assert fake_erddap == ["glider_0", "glider_0"]
+    assert memory_cache.cache_info() == CacheInfo(
+        hits=1,
+        misses=2,
+        evictions=0,
+        maxsize=128,
+        currsize=2,
+    )
@@ -0,0 +1,81 @@
+"""Test the local catalog."""
+
+import io
+
+import pytest
+
+from gliderpy import catalog
+from gliderpy.catalog import GliderCatalog
+from gliderpy.fetchers import GliderDataFetcher
+
+ALL_DATASETS = """\
+datasetID,institution,title,minLongitude,maxLongitude,minLatitude,maxLatitude,minTime,maxTime
+,,,degrees_east,degrees_east,degrees_north,degrees_north,UTC,UTC
+allDatasets,,,,,,,,
+whoi_406-20160902T1700,WHOI,Glider A,-71.0,-70.0,40.0,41.0,2016-09-02T17:00:00Z,2016-09-30T00:00:00Z
+whoi_406-20160902T1700-delayed,WHOI,Glider A,-71.0,-70.0,40.0,41.0,2016-09-02T17:00:00Z,2016-09-30T00:00:00Z
+ru29-20200101T0000,Rutgers,Glider B,-60.0,-50.0,10.0,20.0,2020-01-01T00:00:00Z,2020-03-01T00:00:00Z
+"""  # noqa: E501
+
+NEW_DATASET = """\
+datasetID,institution,title,minLongitude,maxLongitude,minLatitude,maxLatitude,minTime,maxTime
+,,,degrees_east,degrees_east,degrees_north,degrees_north,UTC,UTC
+ru30-20240101T0000,Rutgers,Glider C,-60.0,-50.0,10.0,20.0,2024-01-01T00:00:00Z,2024-03-01T00:00:00Z
+"""  # noqa: E501
+
+
+@pytest.fixture
+def fake_all_datasets(monkeypatch):
+    """Serve the allDatasets table, only new datasets after a refresh."""
+    urls = []
+
+    def urlopen(url, **_kwargs: dict):
+        urls.append(url)
+        body = NEW_DATASET if "maxTime>=" in url else ALL_DATASETS
+        return io.StringIO(body)
+
+    monkeypatch.setattr(catalog, "urlopen", urlopen)
+    return urls
+
+
+def test_search(fake_all_datasets):
+    """Check bounding box and time windows are matched locally."""
+    cat = GliderCatalog().refresh()
+    assert "allDatasets" not in set(cat.table["datasetID"])
+
+    found = cat.search(min_lat=39, max_lat=40.5, max_time="2016-09-03")
+    assert list(found["Dataset ID"]) == ["whoi_406-20160902T1700"]
+
+    found = cat.search(min_time="2016-10-01", delayed=True)
+    assert list(found["Dataset ID"]) == ["ru29-20200101T0000"]
+
+    found = cat.search(min_lon=0, max_lon=10)
+    assert found.empty
+    assert len(fake_all_datasets) == 1
+
+
+def test_refresh_changes(tmp_path, fake_all_datasets):
+    """Check refreshes only request changes and are persisted."""
+    path = tmp_path.joinpath("catalog.csv")
+    GliderCatalog(path=path).refresh()
+
+    cat = GliderCatalog(path=path)
+    assert cat.updated is not None
+    cat.refresh()
+    assert "maxTime>=" in fake_all_datasets[-1]
+    assert list(GliderCatalog(path=path).table["datasetID"]) == [
+        "whoi_406-20160902T1700",
+        "whoi_406-20160902T1700-delayed",
+        "ru29-20200101T0000",
+        "ru30-20240101T0000",
+    ]
+
+
+def test_query_with_catalog(fake_all_datasets):
+    """Check queries are answered by the catalog."""
+    g = GliderDataFetcher(catalog=GliderCatalog().refresh())
+    datasets = g.query(min_lat=38, max_lat=41, min_lon=-72, max_lon=-69)
+    assert list(datasets["Dataset ID"]) == ["whoi_406-20160902T1700"]
+    g.query(min_lat=10, max_lat=12)
+    assert list(g.datasets["Dataset ID"]) == ["ru29-20200101T0000"]
+    assert len(fake_all_datasets) == 1
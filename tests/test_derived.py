@@ -0,0 +1,30 @@
+"""Test the derived seawater variables."""
+
+import numpy as np
+import pandas as pd
+
+from gliderpy.derived import _ts_variables, ts_variables
+
+
+def test_ts_variables():
+    """Check the TEOS-10 variables are cached and leave the input alone."""
+    df = pd.DataFrame(
+        {
+            "salinity": [35.0, 35.0, 35.0],
+            "temperature": [20.0, 10.0, 5.0],
+            "pressure": [0.0, 100.0, 500.0],
+            "longitude": [-70.0, -70.0, -70.0],
+            "latitude": [40.0, 40.0, 40.0],
+        },
+    )
+    columns = list(df.columns)
+    ts = df.ts_variables()
+
+    assert list(df.columns) == columns
+    assert list(ts.columns) == ["sa", "ct", "sigma0"]
+    assert ts.index.equals(df.index)
+    assert np.all(np.diff(ts["sigma0"]) > 0)
+    assert _ts_variables(df) is _ts_variables(df)
+
+    ts["sa"] = 0
+    assert not (ts_variables(df)["sa"] == 0).any()
@@ -0,0 +1,107 @@
+"""Test the multi-server federation."""
+
+import pandas as pd
+import pytest
+import stamina
+
+from gliderpy.federation import FederatedFetcher
+from gliderpy.fetchers import GliderDataFetcher, memory_cache
+from gliderpy.resilience import DownloadError
+from gliderpy.servers import registry, server_parameter_rename, server_vars
+
+_ioos = "https://gliders.ioos.us/erddap"
+
+
+@pytest.fixture
+def mirrors(make_erddap_server, erddap_response):
+    """Run a slow server, a fast mirror and list an unreachable server."""
+    slow, fast = make_erddap_server(), make_erddap_server()
+    slow.latency = 0.05
+    slow.serve_datasets(["glider_0", "glider_1"], erddap_response)
+    fast.serve_datasets(["glider_0"], erddap_response)
+    down = "http://127.0.0.1:9/erddap"
+    registry.register(down, server_vars[_ioos])
+    yield slow, fast, down
+    registry.unregister(down)
+
+
+def test_federated_fetcher(mirrors):
+    """Check mirrored datasets are listed once and fetched from the best."""
+    slow, fast, down = mirrors
+    g = FederatedFetcher([slow.url, fast.url, down])
+    datasets = g.query(min_time="2016-09-01", max_time="2016-09-30")
+
+    assert list(datasets["Dataset ID"]) == ["glider_0", "glider_1"]
+    assert set(datasets.loc[0, "servers"]) == {slow.url, fast.url}
+    assert datasets.loc[1, "servers"] == (slow.url,)
+    assert g.ranked() == [fast.url, slow.url, down]
+
+    glider_dfs = g.to_pandas()
+    assert list(glider_dfs) == ["glider_0", "glider_1"]
+
+    def downloads(server):
+        return [
+            path
+            for path, _, _ in server.requests
+            if path.startswith("/erddap/tabledap/")
+        ]
+
+    assert len(downloads(fast)) == 1
+    assert "glider_0" in downloads(fast)[0]
+    assert len(downloads(slow)) == 1
+    assert "glider_1" in downloads(slow)[0]
+    assert not g.failures
+
+    # Datasets missing from every mirror are reported.
+    for server in (slow, fast):
+        server.errors["/erddap/tabledap/glider_2.csvp"] = [
+            (404, {}, b"Error: Resource not found: unknown datasetID"),
+        ] * 2
+    g.dataset_ids = ["glider_1", "glider_2"]
+    with stamina.set_testing(True):
+        assert list(g.to_pandas()) == ["glider_1"]
+        assert list(g.failures) == ["glider_2"]
+        with pytest.raises(DownloadError, match="glider_2"):
+            g.to_pandas(errors="raise")
+
+    # A mirror without rows in the request is not a failure.
+    del fast.routes["/erddap/tabledap/glider_0.csvp"]
+    memory_cache.cache_clear()
+    g.dataset_ids = ["glider_0"]
+    assert g.to_pandas(errors="raise") == {}
+    assert not [path for path in downloads(slow) if "glider_0" in path]
+
+
+def test_registry_views():
+    """Check registering a server updates the legacy dictionaries."""
+    url = "https://erddap.example.org/erddap"
+    registry.register(url, ["time", "pres"], {"pres (decibar)": "pressure"})
+    try:
+        assert server_vars[url] == ["time", "pres"]
+        assert server_parameter_rename["pres (decibar)"] == "pressure"
+        assert url in registry
+    finally:
+        registry.unregister(url)
+    assert url not in server_vars
+    assert server_parameter_rename["pressure (dbar)"] == "pressure"
+
+
+def test_server_renames(make_erddap_server):
+    """Check each server's data is renamed with its own columns."""
+    column = "sst (degree_c)"
+    servers = {
+        name: make_erddap_server(rename={column: name})
+        for name in ("temperature", "skin_temperature")
+    }
+    data = pd.DataFrame(
+        {column: [20.0], "time (UTC)": ["2016-09-02T17:00:00Z"]},
+    )
+    for name, server in servers.items():
+        server.routes["/erddap/tabledap/glider_0.csvp"] = data.to_csv(
+            index=False,
+        ).encode()
+        g = GliderDataFetcher(server.url)
+        g.dataset_ids = ["glider_0"]
+        glider_df = g.to_pandas()["glider_0"]
+        assert list(glider_df.columns) == [name, "dataset_url"]
+        assert registry.renames(server.url)[column] == name
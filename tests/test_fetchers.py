@@ -1,9 +1,23 @@
 """Test Fetchers."""
 
+import io
+import pickle
+import time
+
+import pandas as pd
 import pytest
+import requests
+import stamina
+import xarray as xr
 
-from gliderpy.fetchers import GliderDataFetcher
-from gliderpy.servers import server_parameter_rename
+from gliderpy import fetchers
+from gliderpy.fetchers import (
+    GliderDataFetcher,
+    consolidate,
+    standardise_df,
+)
+from gliderpy.resilience import DownloadError
+from gliderpy.servers import server_parameter_rename, server_vars
 
 
 @pytest.fixture
@@ -39,3 +53,418 @@ def test_standardise_variables(glider_grab):
     variables = df.columns
     for var in variables:
         assert var in server_parameter_rename.values()
+
+
+def test_to_pandas_concurrent_order(monkeypatch, erddap_response):
+    """Check concurrent downloads come back in the requested order."""
+    dataset_ids = [f"glider_{n}" for n in range(8)]
+    delays = dict(zip(dataset_ids, reversed(range(8)), strict=True))
+
+    def fake_call(glider_grab):
+        dataset_id = glider_grab.fetcher.dataset_id
+        time.sleep(delays[dataset_id] / 100)
+        return erddap_response(dataset_id)
+
+    monkeypatch.setattr(fetchers, "_call_erddapy", fake_call)
+    g = GliderDataFetcher(max_workers=4)
+    g.dataset_ids = dataset_ids
+    dfs = g.to_pandas()
+    assert list(dfs) == dataset_ids
+    for dataset_id, df in dfs.items():
+        assert (df["dataset_id"] == dataset_id).all()
+
+
+def test_refresh_incremental(monkeypatch):
+    """Check refresh requests and merges only new observations."""
+    times = pd.date_range("2016-09-02T17:00", periods=6, freq="1min")
+    requested = []
+
+    def fake_call(glider_grab):
+        constraints = glider_grab.fetcher.constraints or {}
+        requested.append(constraints.get("time>"))
+        watermark = pd.Timestamp(constraints.get("time>", "1970")).tz_localize(
+            None,
+        )
+        available = times[: 3 + 3 * (len(requested) > 1)]
+        new = available[available > watermark]
+        return pd.DataFrame(
+            {
+                "pressure (dbar)": range(len(new)),
+                "time (UTC)": new.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+        )
+
+    monkeypatch.setattr(fetchers, "_call_erddapy", fake_call)
+    g = GliderDataFetcher()
+    g.dataset_ids = ["glider_0"]
+    first = g.refresh()["glider_0"]
+    assert first.index.equals(pd.DatetimeIndex(times[:3], name="time (utc)"))
+    assert g.watermarks["glider_0"] == times[2]
+
+    merged = g.refresh()["glider_0"]
+    assert requested == [None, "2016-09-02T17:02:00Z"]
+    assert merged.index.equals(pd.DatetimeIndex(times, name="time (utc)"))
+    assert merged.index.is_unique
+    # Only the merged dataset is cached, and it is the full download.
+    assert fetchers.memory_cache.cache_info().currsize == 1
+    pd.testing.assert_frame_equal(g.to_pandas()["glider_0"], merged)
+    assert len(requested) == 2  # noqa: PLR2004
+
+
+def test_iter_chunks(monkeypatch):
+    """Check chunks are requested as consecutive time windows."""
+    requested = []
+
+    def fake_call(glider_grab):
+        constraints = glider_grab.fetcher.constraints
+        requested.append(constraints)
+        return pd.DataFrame(
+            {
+                "pressure (dbar)": [1.0],
+                "time (UTC)": [constraints["time>="]],
+            },
+        )
+
+    monkeypatch.setattr(fetchers, "_call_erddapy", fake_call)
+    monkeypatch.setattr(
+        fetchers,
+        "_time_coverage",
+        lambda _fetcher, _dataset_id: (
+            pd.Timestamp("2016-09-02T17:00"),
+            pd.Timestamp("2016-09-20T00:00"),
+        ),
+    )
+    g = GliderDataFetcher()
+    g.fetcher.constraints = {"time>=": "2016-09-05T00:00:00Z"}
+    g.dataset_ids = ["glider_0"]
+    chunks = list(g.iter_chunks(freq="7D"))
+
+    assert [dataset_id for dataset_id, _ in chunks] == ["glider_0"] * 3
+    assert requested == [
+        {"time>=": "2016-09-05T00:00:00Z", "time<": "2016-09-12T00:00:00Z"},
+        {"time>=": "2016-09-12T00:00:00Z", "time<": "2016-09-19T00:00:00Z"},
+        {"time>=": "2016-09-19T00:00:00Z", "time<=": "2016-09-20T00:00:00Z"},
+    ]
+    # The windows are not kept in memory after they are yielded.
+    assert fetchers.memory_cache.cache_info().currsize == 0
+
+
+def test_iter_chunks_empty_window(erddap_server, erddap_response):
+    """Check windows without rows are skipped."""
+    erddap_server.serve_datasets(["glider_0"], erddap_response)
+    erddap_server.serve_info(
+        "glider_0",
+        "2016-09-02T17:00:00Z",
+        "2016-09-20T00:00:00Z",
+    )
+    g = GliderDataFetcher(erddap_server.url)
+    g.dataset_ids = ["glider_0"]
+    chunks = g.iter_chunks(freq="7D")
+    found = [next(chunks)]
+    # ERDDAP answers 404 when no rows match the window.
+    erddap_server.errors["/erddap/tabledap/glider_0.csvp"] = [
+        (404, {}, b"Error: Your query produced no matching results."),
+    ]
+    found.extend(chunks)
+
+    assert len(found) == 2  # noqa: PLR2004
+    downloads = [
+        path
+        for path, _, _ in erddap_server.requests
+        if path.startswith("/erddap/tabledap/")
+    ]
+    assert len(downloads) == 3  # noqa: PLR2004
+
+
+def test_to_xarray_lazy(monkeypatch, erddap_response):
+    """Check windows are only downloaded when their chunks are computed."""
+    pytest.importorskip("dask")
+    downloaded = []
+
+    def fake_call(glider_grab):
+        constraints = glider_grab.fetcher.constraints
+        downloaded.append(constraints["time>="])
+        return erddap_response("glider_0").assign(
+            **{"time (UTC)": [constraints["time>="]] * 2},
+        )
+
+    monkeypatch.setattr(fetchers, "_call_erddapy", fake_call)
+    monkeypatch.setattr(fetchers, "_count_rows", lambda *_args: 2)
+    monkeypatch.setattr(
+        fetchers,
+        "_time_coverage",
+        lambda _fetcher, _dataset_id: (
+            pd.Timestamp("2016-09-05T00:00"),
+            pd.Timestamp("2016-09-20T00:00"),
+        ),
+    )
+    g = GliderDataFetcher()
+    g.dataset_ids = ["glider_0"]
+    ds = g.to_xarray(freq="7D")
+
+    assert ds.sizes["obs"] == 6  # noqa: PLR2004
+    assert ds["temperature"].chunks == ((2, 2, 2),)
+    assert not downloaded
+
+    last = ds.isel(obs=ds["window"] >= pd.Timestamp("2016-09-19"))
+    assert list(last["temperature"].to_numpy()) == [20.0, 19.9]
+    assert downloaded == ["2016-09-19T00:00:00Z"]
+
+    # The chunks hold the request, not the fetcher, and can be sent to
+    # other processes.
+    ds = pickle.loads(pickle.dumps(ds))  # noqa: S301
+    assert list(ds["temperature"].to_numpy()) == [20.0, 19.9] * 3
+
+    # No windows overlap the constraints.
+    g.fetcher.constraints = {"time>=": "2020-01-01T00:00:00Z"}
+    xr.testing.assert_identical(g.to_xarray(), xr.Dataset())
+
+
+def test_standardise_df(erddap_response):
+    """Check the index, names and URL column of a standardised dataset."""
+    raw = erddap_response("glider_0").iloc[::-1]
+    raw_columns = raw.columns.copy()
+    df = standardise_df(raw, "https://example.org/glider_0")
+
+    assert raw.columns.equals(raw_columns)
+    assert df.index.name == "time (utc)"
+    assert df.index.is_monotonic_increasing
+    assert pd.api.types.is_datetime64_any_dtype(df.index)
+    assert df["dataset_url"].dtype == "category"
+    assert (df["dataset_url"] == "https://example.org/glider_0").all()
+    assert df.attrs["dataset_url"] == "https://example.org/glider_0"
+    for var in df.columns.drop("dataset_id"):
+        assert var in server_parameter_rename.values()
+
+
+def test_standardise_df_typed_time():
+    """Check binary responses with typed and unitless time columns."""
+    raw = pd.DataFrame(
+        {
+            "time": pd.to_datetime(["2016-09-02T17:00:00Z"]),
+            "pressure": [1.0],
+        },
+    )
+    df = standardise_df(raw, "https://example.org/glider_0")
+    assert df.index.equals(
+        pd.DatetimeIndex(["2016-09-02T17:00:00"], name="time (utc)"),
+    )
+
+
+def test_standardise_df_binary_names():
+    """Check columns without units get the same names as csvp ones."""
+    raw = pd.DataFrame(
+        {
+            "time": pd.to_datetime(["2016-09-02T17:00:00Z"]),
+            "pres": [1.0],
+            "PSAL": [35.0],
+        },
+    )
+    df = standardise_df(raw, "https://example.org/glider_0")
+    assert list(df.columns) == ["pressure", "salinity", "dataset_url"]
+
+
+@pytest.fixture
+def fake_urlopen(monkeypatch, erddap_response):
+    """Serve csvp and parquet responses, parquet can be unsupported.
+
+    Set `parquet` to False for a 400 response or to an exception to raise.
+    """
+    raw = erddap_response("glider_0").drop(columns="dataset_id")
+    served = {"parquet": True, "urls": []}
+
+    def urlopen(url, **_kwargs: dict):
+        served["urls"].append(url)
+        if ".parquet?" in url:
+            if isinstance(served["parquet"], Exception):
+                raise served["parquet"]
+            if not served["parquet"]:
+                response = requests.Response()
+                response.status_code = 400
+                msg = "fileType=.parquet is not supported"
+                raise requests.exceptions.HTTPError(msg, response=response)
+            typed = raw.rename(columns=lambda col: col.split(" ")[0])
+            typed["time"] = pd.to_datetime(typed["time"], utc=True)
+            return io.BytesIO(typed.to_parquet())
+        return io.BytesIO(raw.to_csv(index=False).encode())
+
+    monkeypatch.setattr(fetchers, "urlopen", urlopen)
+    monkeypatch.setattr(fetchers, "_unsupported_responses", set())
+    return served
+
+
+def test_binary_response(fake_urlopen):
+    """Check parquet responses match the csvp ones."""
+    pytest.importorskip("pyarrow")
+    dfs = {}
+    for response in ("csvp", "parquet"):
+        g = GliderDataFetcher(response=response)
+        g.dataset_ids = ["glider_0"]
+        dfs[response] = g.to_pandas()["glider_0"]
+        fetchers.memory_cache.cache_clear()
+    assert ".parquet?" in fake_urlopen["urls"][-1]
+    pd.testing.assert_frame_equal(dfs["csvp"], dfs["parquet"])
+
+
+def test_binary_response_fallback(fake_urlopen):
+    """Check unsupported binary responses fall back to csvp once."""
+    fake_urlopen["parquet"] = False
+    g = GliderDataFetcher(response="parquet")
+    g.dataset_ids = ["glider_0"]
+    df = g.to_pandas()["glider_0"]
+    fetchers.memory_cache.cache_clear()
+    g.to_pandas()
+
+    responses = [
+        url.split("?")[0].rsplit(".", 1)[-1] for url in fake_urlopen["urls"]
+    ]
+    assert responses == ["parquet", "csvp", "csvp"]
+    assert not df.empty
+
+
+def test_binary_response_timeout(fake_urlopen):
+    """Check transient failures are retried in the binary format."""
+    fake_urlopen["parquet"] = requests.exceptions.Timeout("read timed out")
+    g = GliderDataFetcher(response="parquet", attempts=2)
+    g.dataset_ids = ["glider_0"]
+    with stamina.set_testing(True, attempts=2):
+        assert g.to_pandas() == {}
+    assert isinstance(g.failures["glider_0"], requests.exceptions.Timeout)
+
+    responses = [
+        url.split("?")[0].rsplit(".", 1)[-1] for url in fake_urlopen["urls"]
+    ]
+    assert responses == ["parquet", "parquet"]
+    assert not fetchers._unsupported_responses  # noqa: SLF001
+
+
+def test_request_pushdown(fake_urlopen):
+    """Check per-call variables, constraints and filters reach the URL."""
+    g = GliderDataFetcher()
+    g.dataset_ids = ["glider_0"]
+    g.to_pandas(
+        variables=["latitude", "longitude"],
+        constraints={"pressure<=": 5},
+        filters=['orderByMean("profile_id")'],
+    )
+    url = fake_urlopen["urls"][-1]
+    assert "?time,latitude,longitude&" in url
+    assert url.endswith('&pressure<=5&orderByMean("profile_id")')
+
+    # The fetcher is unchanged and the full request is not a cache hit.
+    assert g.fetcher.variables == server_vars[g.server]
+    assert not g.filters
+    g.to_pandas()
+    assert fake_urlopen["urls"][-1].endswith("temperature,time")
+
+
+def test_session_keep_alive(erddap_server, erddap_response):
+    """Check downloads reuse one compressed keep-alive connection."""
+    erddap_server.serve_datasets(["glider_0", "glider_1"], erddap_response)
+
+    g = GliderDataFetcher(erddap_server.url)
+    g.dataset_ids = ["glider_0", "glider_1"]
+    glider_dfs = g.to_pandas()
+
+    assert list(glider_dfs) == ["glider_0", "glider_1"]
+    paths = [path.split("?")[0] for path, _, _ in erddap_server.requests]
+    assert paths == [
+        "/erddap/tabledap/glider_0.csvp",
+        "/erddap/tabledap/glider_1.csvp",
+    ]
+    clients = {client for _, client, _ in erddap_server.requests}
+    assert len(clients) == 1
+    assert all(
+        "gzip" in headers["Accept-Encoding"]
+        for _, _, headers in erddap_server.requests
+    )
+
+
+def test_no_matching_results(erddap_server, erddap_response):
+    """Check requests without rows are empty instead of failed."""
+    erddap_server.serve_datasets(["glider_0"], erddap_response)
+    g = GliderDataFetcher(erddap_server.url)
+    g.dataset_ids = ["glider_0"]
+    first = g.refresh()["glider_0"]
+
+    # Polls of an idle glider get the ERDDAP 404 for no matching rows.
+    del erddap_server.routes["/erddap/tabledap/glider_0.csvp"]
+    pd.testing.assert_frame_equal(g.refresh()["glider_0"], first)
+    assert not g.failures
+    fetchers.memory_cache.cache_clear()
+    assert g.to_pandas(errors="raise") == {}
+
+    # Unknown datasets are a 404 too, with another message.
+    erddap_server.errors["/erddap/tabledap/glider_1.csvp"] = [
+        (404, {}, b"Error: Resource not found: unknown datasetID=glider_1"),
+    ]
+    g.dataset_ids = ["glider_1"]
+    with pytest.raises(DownloadError, match="glider_1"):
+        g.to_pandas(errors="raise")
+
+    # Empty in every format, binary responses do not fall back to csvp.
+    g = GliderDataFetcher(erddap_server.url, response="parquet")
+    g.dataset_ids = ["glider_0"]
+    assert g.to_pandas(errors="raise") == {}
+    assert erddap_server.requests[-1][0].startswith(
+        "/erddap/tabledap/glider_0.parquet?",
+    )
+    assert not fetchers._unsupported_responses  # noqa: SLF001
+
+
+def test_consolidate(erddap_response):
+    """Check the consolidated layout of multiple datasets."""
+    dfs = {
+        dataset_id: standardise_df(
+            erddap_response(dataset_id),
+            f"https://example.org/{dataset_id}",
+        )
+        for dataset_id in ("glider_0", "glider_1")
+    }
+    df = consolidate(dfs)
+
+    assert df.index.names == ["dataset_id", "time (utc)"]
+    assert isinstance(df.index.levels[0], pd.CategoricalIndex)
+    assert df["dataset_url"].dtype == "category"
+    assert df["profile_id"].dtype == "Int64"
+    assert df["pressure"].dtype == "float32"
+    assert df["latitude"].dtype == "float32"
+    pd.testing.assert_frame_equal(
+        df.loc["glider_1"].drop(columns="dataset_url"),
+        dfs["glider_1"].drop(columns="dataset_url"),
+        check_dtype=False,
+        check_exact=False,
+        atol=1e-5,
+    )
+
+
+def test_query_cache(monkeypatch):
+    """Check new bounds run a new search and repeated ones are cached."""
+    urls = []
+
+    def urlopen(url, **_kwargs: dict):
+        urls.append(url)
+        return io.StringIO(
+            "Title,Institution,Dataset ID\n"
+            "Glider,WHOI,whoi_406-20160902T1700\n"
+            "Glider,WHOI,whoi_406-20160902T1700-delayed\n",
+        )
+
+    monkeypatch.setattr(fetchers, "urlopen", urlopen)
+    g = GliderDataFetcher()
+    searches = []
+    datasets = g.query(min_lat=38, max_lat=41)
+    searches.append(len(urls))
+    g.query(min_lat=38, max_lat=41)
+    searches.append(len(urls))
+    assert list(datasets["info_url"]) == [
+        f"{g.server}/info/whoi_406-20160902T1700/index.html",
+    ]
+
+    g.query(min_lat=30, max_lat=41)
+    searches.append(len(urls))
+
+    monkeypatch.setattr(fetchers.search_cache, "ttl", 0)
+    g.query(min_lat=30, max_lat=41)
+    searches.append(len(urls))
+    assert searches == [1, 1, 2, 3]
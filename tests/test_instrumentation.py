@@ -0,0 +1,83 @@
+"""Test the fetch instrumentation hooks."""
+
+import pytest
+
+from gliderpy.fetchers import GliderDataFetcher
+from gliderpy.instrumentation import Event, OpenTelemetryExporter
+
+
+@pytest.fixture
+def glider_server(erddap_server, erddap_response):
+    """Serve glider_0 and glider_1 from the local ERDDAP stand-in."""
+    erddap_server.serve_datasets(["glider_0", "glider_1"], erddap_response)
+    return erddap_server
+
+
+def test_instrument(glider_server):
+    """Check the phases, retries and cache lookups of a run are reported."""
+    glider_server.errors["/erddap/tabledap/glider_1.csvp"] = [
+        (503, {"Retry-After": "0"}),
+    ]
+    g = GliderDataFetcher(glider_server.url)
+    g.dataset_ids = ["glider_0", "glider_1"]
+
+    with g.instrument() as report:
+        g.to_pandas()
+        g.to_pandas()
+    assert not g.hooks
+
+    phases = report.to_pandas()
+    assert phases.loc[("glider_0", "download"), "count"] == 1
+    assert phases.loc[("glider_0", "download"), "nbytes"] > 0
+    assert phases.loc[("glider_1", "download"), "count"] == 1
+    assert phases.loc[("glider_1", "retry"), "count"] == 1
+    assert phases.loc[("glider_1", "standardise"), "seconds"] > 0
+
+    summary = report.summary()
+    assert summary["datasets"] == 2  # noqa: PLR2004
+    assert summary["retries"] == 1
+    assert summary["hit_rate.memory_cache"] == 0.5  # noqa: PLR2004
+    assert summary["elapsed"] >= summary["seconds.download"]
+
+
+class _Instrument:
+    def __init__(self) -> None:
+        self.measurements = []
+
+    def add(self, value: float, attributes: dict) -> None:
+        self.measurements.append((value, attributes))
+
+    record = add
+
+
+class _Meter:
+    def __init__(self) -> None:
+        self.instruments = {}
+
+    def create_instrument(self, name: str, **_kwargs: dict) -> _Instrument:
+        return self.instruments.setdefault(name, _Instrument())
+
+    create_counter = create_histogram = create_instrument
+
+
+def test_opentelemetry_exporter():
+    """Check the events are recorded with their attributes."""
+    meter = _Meter()
+    exporter = OpenTelemetryExporter(meter, attributes={"job": "nightly"})
+    exporter(Event("download", "server", "glider_0", 0.5, 100))
+    exporter(Event("search_cache_hit", "server"))
+
+    attributes = {
+        "job": "nightly",
+        "gliderpy.event": "download",
+        "gliderpy.server": "server",
+        "gliderpy.dataset_id": "glider_0",
+    }
+    instruments = meter.instruments
+    assert instruments["gliderpy.fetch.duration"].measurements == [
+        (0.5, attributes),
+    ]
+    assert instruments["gliderpy.fetch.bytes"].measurements == [
+        (100, attributes),
+    ]
+    assert len(instruments["gliderpy.fetch.events"].measurements) == 2  # noqa: PLR2004
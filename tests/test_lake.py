@@ -0,0 +1,96 @@
+"""Test the partitioned Parquet datasets."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gliderpy import fetchers
+from gliderpy.fetchers import GliderDataFetcher
+from gliderpy.lake import _filter, _partitioning, read_lake, write_lake
+
+pytest.importorskip("pyarrow")
+
+
+def _fake_erddap_response(dataset_id: str) -> pd.DataFrame:
+    """Return two months of hourly samples heading north."""
+    time = pd.date_range("2016-09-20", "2016-10-10", freq="h")
+    offset = int(dataset_id.removeprefix("glider_"))
+    return pd.DataFrame(
+        {
+            "latitude (degrees_north)": np.linspace(40, 42, len(time)),
+            "longitude (degrees_east)": -70.0 - offset,
+            "pressure (dbar)": np.arange(len(time)) % 100.0,
+            "profile_id (1)": np.arange(len(time)) // 10 + offset,
+            "time (UTC)": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+    )
+
+
+@pytest.fixture
+def lake(tmp_path, monkeypatch):
+    """Export two datasets with small row groups."""
+    monkeypatch.setattr(
+        fetchers,
+        "_call_erddapy",
+        lambda glider_grab: _fake_erddap_response(
+            glider_grab.fetcher.dataset_id,
+        ),
+    )
+    g = GliderDataFetcher()
+    g.dataset_ids = ["glider_0", "glider_1"]
+    g.to_parquet(tmp_path, row_group_size=24)
+    return g.to_pandas(), tmp_path
+
+
+def test_read_lake(lake):
+    """Check queries return the same rows as filtering the dataframes."""
+    glider_dfs, path = lake
+    assert sorted(path.glob("dataset_id=glider_0/year=2016/month=*")) == [
+        path / "dataset_id=glider_0/year=2016/month=10",
+        path / "dataset_id=glider_0/year=2016/month=9",
+    ]
+
+    read = read_lake(path)
+    for dataset_id, glider_df in glider_dfs.items():
+        pd.testing.assert_frame_equal(read[dataset_id], glider_df)
+
+    min_lat = 41.0
+    read = read_lake(
+        path,
+        variables=["latitude"],
+        min_time="2016-09-29T12:00:00Z",
+        max_time="2016-10-02",
+        min_lat=min_lat,
+        max_lon=-70.5,
+    )
+    assert list(read) == ["glider_1"]
+    glider_df = glider_dfs["glider_1"]
+    glider_df = glider_df.loc["2016-09-29T12:00":"2016-10-02T00:00"]
+    expected = glider_df.loc[glider_df["latitude"] >= min_lat, ["latitude"]]
+    pd.testing.assert_frame_equal(read["glider_1"], expected)
+
+
+def test_read_lake_row_groups(lake):
+    """Check only the overlapping partitions and row groups are scanned."""
+    ds = pytest.importorskip("pyarrow.dataset")
+    _, path = lake
+    dataset = ds.dataset(path, format="parquet", partitioning=_partitioning())
+    expression = _filter(dataset_ids=["glider_0"], min_time="2016-10-09")
+
+    fragments = list(dataset.get_fragments(filter=expression))
+    assert len(fragments) == 1
+    row_groups = fragments[0].split_by_row_group(
+        expression,
+        schema=dataset.schema,
+    )
+    # Row groups of one day, only the 9th and 10th of October are read.
+    assert len(row_groups) == 2  # noqa: PLR2004
+
+
+def test_write_lake_replaces(lake):
+    """Check datasets written again replace their old partitions."""
+    glider_dfs, path = lake
+    glider_df = glider_dfs["glider_0"].loc["2016-10"]
+    write_lake(iter([("glider_0", glider_df)]), path)
+    read = read_lake(path, dataset_ids=["glider_0"])
+    pd.testing.assert_frame_equal(read["glider_0"], glider_df)
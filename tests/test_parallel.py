@@ -0,0 +1,114 @@
+"""Test the parallel processing of deployments."""
+
+import functools
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from gliderpy import parallel
+from gliderpy.derived import with_ts_variables
+from gliderpy.parallel import Pipeline, map_deployments
+from gliderpy.profiles import to_grid
+
+pytest.importorskip("pyarrow")
+
+
+def _deployment(num: int) -> pd.DataFrame:
+    """Return yos of 50 m, with a NaN temperature."""
+    time = pd.date_range("2016-09-02", periods=100, freq="1min", tz="UTC")
+    pressure = np.abs(np.arange(100) % 20 - 10) * 5.0
+    temperature = 20 - pressure / 10 + num
+    temperature[3] = np.nan
+    return pd.DataFrame(
+        {
+            "latitude": 40.0 + num,
+            "longitude": -70.0,
+            "pressure": pressure,
+            "salinity": 35.0,
+            "temperature": temperature,
+        },
+        index=pd.Index(time, name="time (utc)"),
+    )
+
+
+def _calibrate(df: pd.DataFrame) -> pd.DataFrame:
+    """Edit a column in place."""
+    df.loc[:, "temperature"] += 0.5
+    return df
+
+
+@pytest.fixture
+def glider_dfs():
+    """Two deployments."""
+    return {f"glider_{num}": _deployment(num) for num in range(2)}
+
+
+def test_map_deployments(glider_dfs):
+    """Check the workers return the same results as a serial loop."""
+    pipeline = Pipeline(_calibrate, with_ts_variables)
+    results = map_deployments(pipeline, glider_dfs, max_workers=2)
+
+    assert list(results) == list(glider_dfs)
+    for dataset_id, glider_df in glider_dfs.items():
+        pd.testing.assert_frame_equal(
+            results[dataset_id],
+            pipeline(glider_df.copy()),
+            check_freq=False,
+        )
+        # The inputs are left alone and the outputs are writable.
+        pd.testing.assert_frame_equal(
+            glider_df,
+            _deployment(int(dataset_id[-1])),
+        )
+        results[dataset_id].loc[:, "sa"] = 0.0
+
+    pipeline = Pipeline(
+        with_ts_variables,
+        functools.partial(to_grid, pressure_bins=10),
+    )
+    grids = map_deployments(pipeline, glider_dfs, max_workers=2)
+    for dataset_id, glider_df in glider_dfs.items():
+        assert isinstance(grids[dataset_id], xr.Dataset)
+        xr.testing.assert_identical(grids[dataset_id], pipeline(glider_df))
+
+
+def test_map_deployments_in_flight(monkeypatch, glider_dfs):
+    """Check the files are removed once read and /dev/shm is optional."""
+    glider_dfs = {f"glider_{num}": _deployment(num) for num in range(4)}
+    written = []
+
+    def write_arrow(df, fname):
+        tmp = Path(fname).parent
+        written.append((tmp, len(list(tmp.iterdir()))))
+        arrow_writer(df, fname)
+
+    arrow_writer = parallel.write_arrow
+    monkeypatch.setattr(parallel, "write_arrow", write_arrow)
+    with ThreadPoolExecutor(1) as executor:
+        results = map_deployments(
+            _calibrate,
+            glider_dfs,
+            max_workers=1,
+            executor=executor,
+        )
+    assert list(results) == list(glider_dfs)
+    # An input and its output at most, the previous ones are removed.
+    assert len(written) == 2 * len(glider_dfs)
+    assert max(count for _, count in written) <= 1
+
+    usage = shutil.disk_usage("/")
+    monkeypatch.setattr(
+        parallel.shutil,
+        "disk_usage",
+        lambda _: usage._replace(free=0),
+    )
+    written.clear()
+    with ThreadPoolExecutor(1) as executor:
+        map_deployments(_calibrate, glider_dfs, executor=executor)
+    assert all(tmp.parent == Path(tempfile.gettempdir()) for tmp, _ in written)
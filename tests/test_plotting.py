@@ -8,10 +8,17 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import pytest
 
 from gliderpy.fetchers import GliderDataFetcher
-from gliderpy.plotting import plot_cast, plot_track, plot_transect, plot_ts
+from gliderpy.plotting import (
+    bin_transect,
+    plot_cast,
+    plot_track,
+    plot_transect,
+    plot_ts,
+)
 
 root = Path(__file__).parent
 
@@ -100,3 +107,95 @@ def test_plot_ts(glider_data):
     """Test plot_ts accessor."""
     fig, _ = plot_ts(glider_data)
     return fig
+
+
+@pytest.fixture
+def synthetic_transect():
+    """Fixture with a few saw-tooth profiles of a linear temperature."""
+    pressure = np.tile(np.r_[np.arange(0, 100), np.arange(100, 0, -1)], 5)
+    return pd.DataFrame(
+        {"pressure": pressure, "temperature": 20 - pressure / 10},
+        index=pd.date_range("2016-09-02", periods=len(pressure), freq="10s"),
+    )
+
+
+def test_bin_transect(synthetic_transect):
+    """Test the time by pressure binning of a transect."""
+    time_edges, pressure_edges, grid = bin_transect(
+        synthetic_transect,
+        "temperature",
+        resolution=(10, 4),
+    )
+    assert grid.shape == (4, 10)
+    assert time_edges[0] == synthetic_transect.index[0]
+    assert time_edges[-1] == synthetic_transect.index[-1]
+    np.testing.assert_array_equal(pressure_edges, [0, 25, 50, 75, 100])
+    # Temperature only depends on pressure, all time bins are close.
+    expected = np.broadcast_to([[18.75], [16.25], [13.75], [11.25]], (4, 10))
+    np.testing.assert_allclose(grid, expected, atol=0.1)
+    assert np.all(np.diff(grid[:, 0]) < 0)
+
+    _, _, median = bin_transect(
+        synthetic_transect,
+        "temperature",
+        resolution=(10, 4),
+        statistic="median",
+    )
+    np.testing.assert_allclose(median, grid, atol=0.1)
+
+
+def test_plot_transect_binned(synthetic_transect):
+    """Test that the transect is binned above the points budget."""
+    _, ax = plot_transect(synthetic_transect, "temperature", max_points=100)
+    assert ax.collections[0].__class__.__name__ == "QuadMesh"
+    plt.close("all")
+
+    _, ax = plot_transect(synthetic_transect, "temperature")
+    assert ax.collections[0].__class__.__name__ == "PathCollection"
+    plt.close("all")
+
+
+def test_plot_ts_single_artist():
+    """Test that the TS diagram has one artist and leaves the input alone."""
+    num = 1000
+    df = pd.DataFrame(
+        {
+            "salinity": np.linspace(34, 36, num),
+            "temperature": np.linspace(25, 5, num),
+            "pressure": np.linspace(0, 500, num),
+            "longitude": np.linspace(-70, -69, num),
+            "latitude": np.linspace(40, 41, num),
+        },
+    )
+    columns = list(df.columns)
+
+    _, ax = plot_ts(df)
+    (points,) = ax.collections[:1]
+    assert points.get_array().max() == df["pressure"].max()
+    assert list(df.columns) == columns
+    plt.close("all")
+
+    _, ax = plot_ts(df, max_points=100)
+    assert ax.collections[0].__class__.__name__ == "PolyCollection"
+    plt.close("all")
+
+
+def test_cast_order():
+    """Test the position and time numbering of the casts."""
+    df = pd.DataFrame(
+        {
+            "longitude": [-69.0, -69.0, -70.0, -70.0],
+            "latitude": 41.0,
+            "pressure": [1.0, 5.0, 1.0, 5.0],
+            "profile_id": [1, 1, 2, 2],
+            "temperature": [20.0, 19.0, 18.0, 17.0],
+        },
+        index=pd.date_range("2016-09-02", periods=4, freq="1min"),
+    )
+    _, ax = plot_cast(df, 0, var="temperature")
+    np.testing.assert_array_equal(ax.lines[0].get_xdata(), [18.0, 17.0])
+    _, ax = plot_cast(df, 0, var="temperature", order="time")
+    np.testing.assert_array_equal(ax.lines[0].get_xdata(), [20.0, 19.0])
+    plt.close("all")
+    with pytest.raises(ValueError, match="order must be"):
+        plot_cast(df, 0, var="temperature", order="depth")
@@ -0,0 +1,90 @@
+"""Test profile segmentation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from gliderpy.profiles import grid_chunks, profile_index
+
+
+@pytest.fixture
+def casts():
+    """Three yos, the last two share the same position."""
+    pressure = [1.0, 5.0, 10.0, 8.0, 3.0, 0.5, 4.0, 9.0]
+    return pd.DataFrame(
+        {
+            "latitude": [41.0, 41.0, 41.0, 41.1, 41.1, 41.1, 41.1, 41.1],
+            "longitude": [-70.0] * 3 + [-70.1] * 5,
+            "pressure": pressure,
+            "profile_id": [1, 1, 1, 2, 2, 2, 3, 3],
+        },
+        index=pd.date_range("2016-09-02", periods=8, freq="1min"),
+    )
+
+
+def test_profile_index(casts):
+    """Check the offsets from profile_id and from pressure reversals."""
+    index = casts.profile_index()
+    np.testing.assert_array_equal(index.offsets, [0, 3, 6, 8])
+    assert len(index) == 3  # noqa: PLR2004
+    assert casts.iloc[index[1]]["profile_id"].eq(2).all()
+
+    by_pressure = profile_index(casts.drop(columns="profile_id"))
+    np.testing.assert_array_equal(by_pressure.offsets, index.offsets)
+
+
+def test_profile_index_cached(casts):
+    """Check the index is computed once per frame."""
+    assert profile_index(casts) is profile_index(casts)
+    assert profile_index(casts) is not profile_index(casts.iloc[::-1])
+
+
+def test_profile_reductions(casts):
+    """Check per-profile segment reductions."""
+    index = profile_index(casts)
+    pressure = casts["pressure"].to_numpy(copy=True)
+    np.testing.assert_array_equal(
+        index.reduce(pressure, np.maximum),
+        [10.0, 8.0, 9.0],
+    )
+    pressure[1] = np.nan
+    np.testing.assert_allclose(index.mean(pressure), [5.5, 3.8333333, 6.5])
+    np.testing.assert_array_equal(index.labels, casts["profile_id"] - 1)
+
+
+def test_to_grid(casts):
+    """Check the binning of all profiles onto common pressure levels."""
+    casts = casts.assign(temperature=20 - casts["pressure"])
+    ds = casts.to_grid(pressure_bins=[0, 5, 10], variables=["temperature"])
+
+    assert ds["temperature"].dims == ("profile", "pressure")
+    np.testing.assert_array_equal(ds["pressure"], [2.5, 7.5])
+    np.testing.assert_allclose(
+        ds["temperature"],
+        [[19.0, 12.5], [18.25, 12.0], [16.0, 11.0]],
+    )
+    np.testing.assert_allclose(ds["latitude"], [41.0, 41.1, 41.1])
+    assert ds["time"][0] == casts.index[1]
+
+    # Profiles spanning chunk boundaries are gridded once.
+    chunks = [casts.iloc[:2], casts.iloc[2:5], casts.iloc[5:]]
+    xr.testing.assert_identical(
+        grid_chunks(chunks, [0, 5, 10]),
+        casts.to_grid(pressure_bins=5),
+    )
+
+
+def test_to_grid_long_profiles():
+    """Check the mean time of profiles with many samples."""
+    time = pd.date_range("2016-09-02", periods=40, freq="1min")
+    casts = pd.DataFrame(
+        {
+            "pressure": np.tile(np.linspace(0, 95, 20), 2),
+            "profile_id": np.repeat([1, 2], 20),
+        },
+        index=time,
+    )
+    ds = casts.to_grid(pressure_bins=10)
+    expected = [time[:20].mean(), time[20:].mean()]
+    np.testing.assert_array_equal(ds["time"], np.array(expected, "M8[ns]"))
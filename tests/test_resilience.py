@@ -0,0 +1,90 @@
+"""Test retries, rate limiting and circuit breaking."""
+
+import time
+
+import pytest
+import requests
+
+from gliderpy.fetchers import GliderDataFetcher, retry_only_on_real_errors
+from gliderpy.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DownloadError,
+    RateLimiter,
+)
+
+_overloaded = (503, {"Retry-After": "0"})
+
+
+@pytest.fixture
+def glider_server(erddap_server, erddap_response):
+    """Serve glider_0 and glider_1 from the local ERDDAP stand-in."""
+    erddap_server.serve_datasets(["glider_0", "glider_1"], erddap_response)
+    return erddap_server
+
+
+def test_retry_after(glider_server):
+    """Check overloaded responses are retried and then reported."""
+    glider_server.errors["/erddap/tabledap/glider_0.csvp"] = [_overloaded] * 2
+    glider_server.errors["/erddap/tabledap/glider_1.csvp"] = [_overloaded] * 3
+    g = GliderDataFetcher(glider_server.url)
+    g.dataset_ids = ["glider_0", "glider_1"]
+
+    glider_dfs = g.to_pandas()
+    assert list(glider_dfs) == ["glider_0"]
+    assert list(g.failures) == ["glider_1"]
+    assert "503" in str(g.failures["glider_1"])
+
+    glider_server.errors["/erddap/tabledap/glider_1.csvp"] = [_overloaded] * 3
+    with pytest.raises(DownloadError, match="glider_1"):
+        g.to_pandas(errors="raise")
+
+
+def test_circuit_breaker(glider_server):
+    """Check a failing server is not called until the reset timeout."""
+    glider_server.errors["/erddap/tabledap/glider_0.csvp"] = [_overloaded] * 3
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    g = GliderDataFetcher(glider_server.url, circuit_breaker=breaker)
+    g.dataset_ids = ["glider_0", "glider_1"]
+
+    assert not g.to_pandas()
+    assert isinstance(g.failures["glider_1"], CircuitOpenError)
+    assert breaker.state.state == "open"
+    assert len(glider_server.requests) == 3  # noqa: PLR2004
+
+    breaker.reset_timeout = 0
+    assert list(g.to_pandas()) == ["glider_0", "glider_1"]
+    assert breaker.state.state == "closed"
+
+
+def test_rate_limiter():
+    """Check the token bucket spaces out the requests."""
+    limiter = RateLimiter(rate=100, burst=2)
+    start = time.perf_counter()
+    waits = [limiter.acquire() for _ in range(6)]
+    assert waits[:2] == [0, 0]
+    assert time.perf_counter() - start >= 0.035  # noqa: PLR2004
+
+
+def _http_error(status_code: int, headers: dict) -> requests.HTTPError:
+    """Return an HTTP error with a response."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_http_error(*_overloaded), True),
+        (_http_error(500, {}), True),
+        (_http_error(429, {"Retry-After": "1"}), False),
+        (_http_error(404, {}), False),
+        (requests.Timeout(), False),
+    ],
+)
+def test_retry_only_on_real_errors(exc, expected):
+    """Check the deprecated predicate keeps retrying only 5xx errors."""
+    with pytest.deprecated_call(match="429"):
+        assert retry_only_on_real_errors(exc) is expected
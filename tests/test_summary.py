@@ -0,0 +1,56 @@
+"""Test deployment summaries."""
+
+import numpy as np
+import pandas as pd
+
+from gliderpy import summary_table
+from gliderpy.fetchers import consolidate
+
+
+def _deployment(lat0, num_profiles):
+    """Build a deployment moving north with `num_profiles` casts."""
+    num = num_profiles * 4
+    df = pd.DataFrame(
+        {
+            "latitude": lat0 + np.repeat(np.arange(num_profiles), 4) / 10,
+            "longitude": np.full(num, -70.0),
+            "pressure": np.tile([1.0, 20.0, 10.0, 2.0], num_profiles),
+            "profile_id": np.repeat(np.arange(num_profiles), 4),
+            "dataset_url": pd.Categorical(["https://example.org"] * num),
+        },
+        index=pd.date_range(
+            "2016-09-02",
+            periods=num,
+            freq="1h",
+            name="time (utc)",
+        ),
+    )
+    df.iloc[0, 0] = np.nan
+    return df
+
+
+def test_summary_table():
+    """Check the batched summary for dictionaries and consolidated frames."""
+    dfs = {"glider_0": _deployment(40, 3), "glider_1": _deployment(30, 8)}
+    table = summary_table(dfs)
+
+    assert list(table.index) == ["glider_0", "glider_1"]
+    assert list(table["num_profiles"]) == [3, 8]
+    assert list(table["num_samples"]) == [12, 32]
+    assert list(table["days"]) == [pd.Timedelta("1D"), pd.Timedelta("2D")]
+    assert table.loc["glider_1", "deployment_lat"] == 30  # noqa: PLR2004
+    np.testing.assert_allclose(table["end_lat"], [40.2, 30.7])
+    np.testing.assert_array_equal(table["max_pressure"], [20.0, 20.0])
+    pd.testing.assert_series_equal(
+        dfs["glider_0"].summary(),
+        table.loc["glider_0"],
+        check_names=False,
+    )
+
+    consolidated = summary_table(consolidate(dfs))
+    pd.testing.assert_frame_equal(
+        consolidated.drop(columns=["deployment_lat", "end_lat"]),
+        table.drop(columns=["deployment_lat", "end_lat"]),
+        check_dtype=False,
+        check_index_type=False,
+    )